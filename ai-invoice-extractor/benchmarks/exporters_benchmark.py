@@ -0,0 +1,209 @@
+"""Throughput and memory benchmark for every registered exporter.
+
+Usage (from ai-invoice-extractor/):
+
+    python -m benchmarks.exporters_benchmark --rows 1000 100000 1000000 --line-items 0 5
+    python -m benchmarks.exporters_benchmark --rows 100000 --update-baseline
+
+Each (format, rows, line items) case reports rows/s, bytes written, peak
+traced memory and per-stage seconds (validate, serialize, write). When a
+baseline file exists, cases slower or hungrier than the baseline by more
+than ``--tolerance`` are reported and the run exits with status 1.
+"""
+import argparse
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Dict, Iterator, List, Optional
+
+from exporters.exporter_factory import ExporterFactory
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), 'exporters_baseline.json')
+CUSTOMERS = ['Acme Corp', 'Globex', 'Initech', 'Umbrella', 'Hooli', 'Stark Industries']
+
+
+def synthetic_invoices(rows: int, line_items: int = 0, seed: int = 0, pool_size: int = 1024) -> Iterator[Dict[str, Any]]:
+    """Yield ``rows`` valid invoices lazily, so the input itself costs no memory.
+
+    Field values are drawn once into a pool of ``pool_size`` templates and
+    only ``invoice_number`` is formatted per row, keeping generation cheap
+    next to the exporters being measured.
+    """
+    rng = random.Random(seed)
+    pool = []
+    for i in range(min(rows, pool_size)):
+        invoice = {
+            'date': f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            'due_date': f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            'amount': round(rng.uniform(1, 10000), 2),
+            'customer': CUSTOMERS[i % len(CUSTOMERS)],
+        }
+        if line_items:
+            invoice['line_items'] = [
+                {'description': f"Item {n}", 'quantity': rng.randint(1, 10), 'unit_price': round(rng.uniform(1, 500), 2)}
+                for n in range(line_items)
+            ]
+        pool.append(invoice)
+
+    for i in range(rows):
+        yield {'invoice_number': f"INV-{i:08d}", **pool[i % pool_size]}
+
+
+class _NullSink(io.RawIOBase):
+    """Discards output but counts it, to time serialization without disk I/O."""
+
+    def __init__(self):
+        super().__init__()
+        self.bytes = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.bytes += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.bytes
+
+
+def _timed(fn, repeat: int) -> float:
+    """Best of ``repeat`` runs, to keep scheduler noise out of the baseline."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_case(format_name: str, rows: int, line_items: int, directory: str, repeat: int = 3) -> Dict[str, Any]:
+    exporter = ExporterFactory.get_exporter(format_name)
+    path = os.path.join(directory, f"bench.{format_name}")
+
+    def invoices():
+        return synthetic_invoices(rows, line_items)
+
+    def generate():
+        for _ in invoices():
+            pass
+
+    def validate():
+        for data in invoices():
+            exporter.validate(data)
+
+    # Generating the input is timed separately and subtracted from each stage.
+    generate_seconds = _timed(generate, repeat)
+    validate_seconds = max(_timed(validate, repeat) - generate_seconds, 0.0)
+    serialize_seconds = max(_timed(lambda: exporter._write_many(invoices(), _NullSink()), repeat) - generate_seconds, 0.0)
+    export_seconds = max(_timed(lambda: exporter._write_many(invoices(), path), repeat) - generate_seconds, 0.0)
+
+    tracemalloc.start()
+    exporter.export_many(invoices(), _NullSink())
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    total_seconds = validate_seconds + export_seconds
+    return {
+        'format': format_name,
+        'rows': rows,
+        'line_items': line_items,
+        'rows_per_second': rows / total_seconds if total_seconds else 0.0,
+        'bytes_written': os.path.getsize(path),
+        'peak_memory': peak_memory,
+        'stages': {
+            'validate': validate_seconds,
+            'serialize': serialize_seconds,
+            'write': max(export_seconds - serialize_seconds, 0.0),
+        },
+    }
+
+
+def run(formats: List[str], sizes: List[int], line_items: List[int], repeat: int = 3) -> List[Dict[str, Any]]:
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for format_name in formats:
+            for rows in sizes:
+                for items in line_items:
+                    results.append(run_case(format_name, rows, items, directory, repeat))
+    return results
+
+
+def _key(result: Dict[str, Any]) -> str:
+    return f"{result['format']}/{result['rows']}/{result['line_items']}"
+
+
+def regressions(results: List[Dict[str, Any]], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Describe every case that is slower or uses more memory than ``baseline`` allows."""
+    problems = []
+    for result in results:
+        expected = baseline.get(_key(result))
+        if expected is None:
+            continue
+        if result['rows_per_second'] < expected['rows_per_second'] * (1 - tolerance):
+            problems.append(f"{_key(result)}: {result['rows_per_second']:.0f} rows/s "
+                            f"< baseline {expected['rows_per_second']:.0f}")
+        if result['peak_memory'] > expected['peak_memory'] * (1 + tolerance):
+            problems.append(f"{_key(result)}: peak memory {result['peak_memory']} B "
+                            f"> baseline {expected['peak_memory']} B")
+    return problems
+
+
+def _print_table(results: List[Dict[str, Any]]) -> None:
+    print(f"{'case':<28}{'rows/s':>12}{'bytes':>14}{'peak mem':>12}{'validate':>10}{'serialize':>11}{'write':>9}")
+    for result in results:
+        stages = result['stages']
+        print(f"{_key(result):<28}{result['rows_per_second']:>12.0f}{result['bytes_written']:>14}"
+              f"{result['peak_memory']:>12}{stages['validate']:>10.3f}{stages['serialize']:>11.3f}{stages['write']:>9.3f}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--formats', nargs='+', default=None, help="formats to run (default: all available)")
+    parser.add_argument('--rows', nargs='+', type=int, default=[1000, 100000, 1000000])
+    parser.add_argument('--line-items', nargs='+', type=int, default=[0, 5])
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per stage; the best is kept")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--update-baseline', action='store_true', help="store these results as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="allowed relative regression")
+    parser.add_argument('--output', help="also write the results as JSON to this path")
+    args = parser.parse_args(argv)
+
+    formats = args.formats or ExporterFactory.available_formats()
+    results = run(formats, args.rows, args.line_items, args.repeat)
+    _print_table(results)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding='utf-8') as f:
+                baseline = json.load(f)
+        baseline.update({
+            _key(result): {'rows_per_second': result['rows_per_second'], 'peak_memory': result['peak_memory']}
+            for result in results
+        })
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one.")
+        return 0
+    with open(args.baseline, encoding='utf-8') as f:
+        problems = regressions(results, json.load(f), args.tolerance)
+    for problem in problems:
+        print(f"REGRESSION {problem}", file=sys.stderr)
+    return 1 if problems else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,18 +1,57 @@
-from .exporter_factory import get_exporter
-from .json_exporter import JSONExporter
-from .csv_exporter import CSVExporter
-from .xml_exporter import XMLExporter
-from .ubl_exporter import UBLExporter
-from .quickbooks_exporter import QuickBooksExporter
-from .xero_exporter import XeroExporter
+import importlib
+
+from .exporter_factory import ExporterFactory, get_exporter, iter_export, iter_import
+from .base_exporter import BaseExporter
+from .sinks import AtomicSink, CompressedSink, GroupCommit
+
+# Exporter classes are imported on first attribute access so that importing
+# the package does not load every format (and its dependencies).
+_lazy_classes = {
+    'JSONExporter': '.json_exporter',
+    'CSVExporter': '.csv_exporter',
+    'XMLExporter': '.xml_exporter',
+    'UBLExporter': '.ubl_exporter',
+    'SchemaValidationError': '.ubl_exporter',
+    'QuickBooksExporter': '.quickbooks_exporter',
+    'XeroExporter': '.xero_exporter',
+    'ColumnarExporter': '.columnar_exporter',
+    'FanoutExporter': '.fanout_exporter',
+    'PartitionedExporter': '.partitioned_exporter',
+    'IncrementalExporter': '.incremental_exporter',
+    'InvoiceRecord': '.records',
+    'InvoiceBatch': '.records',
+    'ExportMetrics': '.metrics',
+}
+
+
+def __getattr__(name):
+    module = _lazy_classes.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module, __name__), name)
+
 
 __all__ = [
     'get_exporter',
+    'iter_export',
+    'iter_import',
+    'ExporterFactory',
     'BaseExporter',
+    'CompressedSink',
+    'AtomicSink',
+    'GroupCommit',
     'JSONExporter',
     'CSVExporter',
     'XMLExporter',
     'UBLExporter',
+    'SchemaValidationError',
     'QuickBooksExporter',
-    'XeroExporter'
-]
\ No newline at end of file
+    'XeroExporter',
+    'ColumnarExporter',
+    'FanoutExporter',
+    'PartitionedExporter',
+    'IncrementalExporter',
+    'InvoiceRecord',
+    'InvoiceBatch',
+    'ExportMetrics',
+]
@@ -0,0 +1,321 @@
+"""Export invoices from the command line.
+
+Usage (from ai-invoice-extractor/):
+
+    python -m exporters invoices.jsonl --formats ubl xero --workers 4 --output-dir out/
+
+Invoices are read from a JSON Lines or CSV file (memory-mapped unless it is
+compressed), validated and exported in batches of ``--batch-size``: each
+batch becomes one part file per format, ``<output-dir>/<format>/part-NNNNNN``,
+written atomically. Invalid invoices, and input lines or rows that cannot
+be parsed (with their byte offset), go to ``<output-dir>/rejects.jsonl``
+with their error. Progress is checkpointed after every batch, so running the
+same command again after an interruption resumes where it stopped.
+"""
+import argparse
+import csv
+import io
+import itertools
+import json
+import mmap
+import os
+import sys
+import time
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from .csv_exporter import csv_record
+from .exporter_factory import ExporterFactory
+from .sinks import COMPRESSION_SUFFIXES, AtomicSink, open_decompressor, open_sink
+
+CHECKPOINT_NAME = '.checkpoint.json'
+REJECTS_NAME = 'rejects.jsonl'
+SUFFIXES = {
+    'json': '.jsonl',
+    'csv': '.csv',
+    'xml': '.xml',
+    'ubl': '.ubl.xml',
+    'quickbooks': '.iif',
+    'xero': '.xero.csv',
+}
+
+
+def _compression(path: str) -> Optional[str]:
+    return COMPRESSION_SUFFIXES.get(os.path.splitext(path)[1].lower())
+
+
+def input_kind(path: str) -> str:
+    """``"csv"`` or ``"jsonl"``, from the suffix under any compression suffix."""
+    if _compression(path) is not None:
+        path = os.path.splitext(path)[0]
+    return 'csv' if path.lower().endswith('.csv') else 'jsonl'
+
+
+@contextmanager
+def open_input(path: str) -> Iterator[Any]:
+    """Open ``path`` for binary ``readline``/``tell``/``seek``: memory-mapped, or decompressed by suffix."""
+    method = _compression(path)
+    if method is not None:
+        with open_decompressor(path, method) as f:
+            yield f
+        return
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield f
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+def _seek(f, offset: int) -> None:
+    try:
+        f.seek(offset)
+    except (OSError, ValueError, io.UnsupportedOperation):
+        while f.tell() < offset and f.read(min(1 << 20, offset - f.tell())):
+            pass
+
+
+class RejectedInput(NamedTuple):
+    """An input line or CSV row that could not be parsed, starting at byte ``offset``."""
+    offset: int
+    input: Any
+    error: str
+
+
+def iter_input(f, kind: str, offset: int = 0) -> Iterator[Tuple[Union[Dict[str, Any], RejectedInput], int]]:
+    """Yield ``(invoice, end_offset)`` from byte ``offset`` on; unparsable input yields a ``RejectedInput``."""
+    if kind == 'csv':
+        header = f.readline()
+        if offset > f.tell():
+            _seek(f, offset)
+        lines = itertools.chain([header], iter(f.readline, b''))
+        # Undecodable bytes survive as surrogates so one bad row does not end the reader.
+        rows = csv.reader(line.decode('utf-8', 'surrogateescape') for line in lines)
+        header = next(rows, None)
+        if header is None:
+            return
+        start = f.tell()
+        while True:
+            # csv.reader pulls only the lines of the current row, so tell() is exact.
+            try:
+                row = next(rows)
+            except StopIteration:
+                return
+            except csv.Error as error:
+                yield RejectedInput(start, None, f"Malformed CSV row: {error}"), f.tell()
+            else:
+                try:
+                    '\x1f'.join(row).encode('utf-8')
+                    data = csv_record(header, row)
+                except ValueError as error:
+                    yield RejectedInput(start, dict(zip(header, row)), str(error)), f.tell()
+                else:
+                    yield data, f.tell()
+            start = f.tell()
+
+    _seek(f, offset)
+    start = f.tell()
+    for line in iter(f.readline, b''):
+        end = f.tell()
+        if line.strip():
+            try:
+                data = json.loads(line)
+                if not isinstance(data, dict):
+                    raise ValueError("Expected a JSON object")
+            except ValueError as error:
+                yield RejectedInput(start, line.decode('utf-8', 'replace').rstrip('\r\n'), str(error)), end
+            else:
+                yield data, end
+        start = end
+
+
+def iter_batches(invoices, batch_size: int, index: int, offset: int):
+    """Yield ``(index, start_offset, end_offset, invoices)`` batches."""
+    while True:
+        batch, end = [], offset
+        for data, end in itertools.islice(invoices, batch_size):
+            batch.append(data)
+        if not batch:
+            return
+        yield index, offset, end, batch
+        index, offset = index + 1, end
+
+
+def part_path(output_dir: str, format_name: str, index: int) -> str:
+    return os.path.join(output_dir, format_name, f"part-{index:06d}{SUFFIXES.get(format_name, '.' + format_name)}")
+
+
+def export_batch(formats: List[str], paths: List[str], batch: List[Dict[str, Any]]) -> Tuple[int, List[Dict[str, Any]]]:
+    """Validate ``batch``, export the valid invoices to ``paths`` and return ``(exported, rejects)``.
+
+    Also the process-pool entry point.
+    """
+    exporters = [ExporterFactory.get_exporter(format_name) for format_name in formats]
+    valid, rejects = [], []
+    for data in batch:
+        if isinstance(data, RejectedInput):
+            rejects.append(data._asdict())
+            continue
+        try:
+            for exporter in exporters:
+                exporter.validate(data)
+        except ValueError as error:
+            rejects.append(dict(data, error=str(error)))
+        else:
+            valid.append(data)
+    for exporter, path in zip(exporters, paths):
+        exporter._write_many(valid, AtomicSink(path))
+    return len(valid), rejects
+
+
+class Progress:
+    """Single-line throughput/ETA display, redrawn at most every ``interval`` seconds."""
+
+    def __init__(self, stream, total_bytes: Optional[int], done_bytes: int, interval: float = 0.5):
+        self.stream = stream
+        self.total_bytes = total_bytes
+        self.done_bytes = self.start_bytes = done_bytes
+        self.records = 0
+        self.interval = interval
+        self.started = self.drawn = time.monotonic()
+
+    def update(self, nbytes: int, records: int) -> None:
+        self.done_bytes += nbytes
+        self.records += records
+        if time.monotonic() - self.drawn >= self.interval:
+            self.draw()
+
+    def draw(self, end: str = '') -> None:
+        self.drawn = time.monotonic()
+        elapsed = max(self.drawn - self.started, 1e-9)
+        line = f"{self.records:,} invoices  {self.records / elapsed:,.0f}/s"
+        if self.total_bytes:
+            line += f"  {100 * self.done_bytes / self.total_bytes:5.1f}%"
+            rate = (self.done_bytes - self.start_bytes) / elapsed
+            if rate > 0:
+                line += f"  ETA {_duration((self.total_bytes - self.done_bytes) / rate)}"
+        self.stream.write(f"\r{line:<60}{end}")
+        self.stream.flush()
+
+
+def _duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}"
+
+
+def load_checkpoint(path: str, identity: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Return the saved state if it belongs to the same input, formats and batch size."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if any(state.get(key) != value for key, value in identity.items()):
+        return None
+    return state
+
+
+def save_checkpoint(path: str, state: Dict[str, Any]) -> None:
+    with open_sink(AtomicSink(path)) as f:
+        json.dump(state, f)
+
+
+def run(args: argparse.Namespace) -> int:
+    formats = [name.lower() for name in args.formats]
+    for format_name in formats:
+        ExporterFactory.get_exporter_class(format_name)
+        os.makedirs(os.path.join(args.output_dir, format_name), exist_ok=True)
+
+    stat = os.stat(args.input)
+    identity = {
+        'input': os.path.abspath(args.input),
+        'size': stat.st_size,
+        'mtime': stat.st_mtime_ns,
+        'formats': formats,
+        'batch_size': args.batch_size,
+    }
+    checkpoint = args.checkpoint or os.path.join(args.output_dir, CHECKPOINT_NAME)
+    state = None if args.restart else load_checkpoint(checkpoint, identity)
+    resumed = state is not None
+    if state is None:
+        state = dict(identity, next_batch=0, offset=0, done={}, records=0, rejected=0, complete=False)
+    if state['complete']:
+        print(f"Already exported {state['records']:,} invoices ({checkpoint}); use --restart to run again.")
+        return 0
+
+    total_bytes = None if _compression(args.input) else stat.st_size
+    progress = Progress(sys.stderr, total_bytes, state['offset']) if not args.quiet else None
+    rejects = open(os.path.join(args.output_dir, REJECTS_NAME), 'a' if resumed else 'w', encoding='utf-8')
+    pool = ProcessPoolExecutor(args.workers) if args.workers > 1 else None
+    pending = {}
+
+    def finish(index, start, end, result):
+        exported, rejected = result
+        for data in rejected:
+            rejects.write(json.dumps(data, default=str))
+            rejects.write("\n")
+        rejects.flush()
+        state['records'] += exported
+        state['rejected'] += len(rejected)
+        state['done'][str(index)] = end
+        while str(state['next_batch']) in state['done']:
+            state['offset'] = state['done'].pop(str(state['next_batch']))
+            state['next_batch'] += 1
+        save_checkpoint(checkpoint, state)
+        if progress is not None:
+            progress.update(end - start, exported + len(rejected))
+
+    def collect(return_when):
+        completed, _ = wait(pending, return_when=return_when)
+        for future in completed:
+            finish(*pending.pop(future), future.result())
+
+    try:
+        with open_input(args.input) as f:
+            invoices = iter_input(f, input_kind(args.input), state['offset'])
+            for index, start, end, batch in iter_batches(invoices, args.batch_size, state['next_batch'], state['offset']):
+                if str(index) in state['done']:
+                    continue
+                paths = [part_path(args.output_dir, format_name, index) for format_name in formats]
+                if pool is None:
+                    finish(index, start, end, export_batch(formats, paths, batch))
+                    continue
+                pending[pool.submit(export_batch, formats, paths, batch)] = (index, start, end)
+                if len(pending) >= 2 * args.workers:
+                    collect(FIRST_COMPLETED)
+            if pending:
+                collect(ALL_COMPLETED)
+    except KeyboardInterrupt:
+        print(f"\nInterrupted; run the same command again to resume from {checkpoint}.", file=sys.stderr)
+        return 130
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        rejects.close()
+
+    state['complete'] = True
+    save_checkpoint(checkpoint, state)
+    if progress is not None:
+        progress.draw(end="\n")
+    print(f"Exported {state['records']:,} invoices as {', '.join(formats)} to {args.output_dir}"
+          f" ({state['rejected']:,} rejected)")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m exporters', description=__doc__.splitlines()[0])
+    parser.add_argument('input', help="JSON Lines or CSV file of invoices, optionally compressed")
+    parser.add_argument('--formats', nargs='+', default=['json'], help="export formats (default: json)")
+    parser.add_argument('--output-dir', default='.', help="directory for the part files (default: .)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument('--batch-size', type=int, default=10000, help="invoices per part file")
+    parser.add_argument('--checkpoint', help=f"checkpoint path (default: <output-dir>/{CHECKPOINT_NAME})")
+    parser.add_argument('--restart', action='store_true', help="ignore an existing checkpoint")
+    parser.add_argument('--quiet', action='store_true', help="do not show progress")
+    return run(parser.parse_args(argv))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,21 +1,396 @@
+import ast
+import io
+import itertools
+import json
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from functools import lru_cache
+from operator import itemgetter
+from typing import Dict, Any, Callable, Iterable, Iterator, IO, List, Optional, Sequence, Tuple
+
+from .metrics import ExportMetrics, MeteredFile, current_meter
+from .records import attach_lines
+from .sinks import ChunkedSink, CompressedSink, Sink, Source, open_sink, open_source
+
+# Error codes returned by BaseExporter.validate_batch, one bit per failed check.
+# Bit MISSING_FIELD_SHIFT + i is set when REQUIRED_FIELDS[i] is missing.
+AMOUNT_NOT_NUMBER = 1
+AMOUNT_NEGATIVE = 2
+MISSING_FIELD_SHIFT = 2
+
+# With metrics on, export_many times one record in METRICS_SAMPLE (a power of two).
+METRICS_SAMPLE = 16
+
+
+class RecordWriter(ABC):
+    """Push-style writer for one open output stream.
+
+    The header (if any) is written on construction, each ``write`` call emits
+    one record, and ``close`` writes the footer without closing the stream.
+    """
+
+    def __init__(self, f: IO):
+        self.f = f
+
+    @abstractmethod
+    def write(self, data: Dict[str, Any]) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
 
 class BaseExporter(ABC):
     REQUIRED_FIELDS = ['invoice_number', 'date', 'amount', 'customer']
-    
+    NEWLINE = None
+    BINARY = False
+    # Whether ``read`` can parse this format's exports back (formats that set it implement ``_reader``).
+    READABLE = False
+    # Registry name, set by ExporterFactory.register; labels this exporter's metrics.
+    FORMAT: Optional[str] = None
+    # An ExportMetrics to record per-stage timings in (see metrics.install); off when None.
+    metrics: Optional[ExportMetrics] = None
+
     def validate(self, data: Dict[str, Any]) -> None:
         missing = [field for field in self.REQUIRED_FIELDS if field not in data]
         if missing:
             raise ValueError(f"Missing required fields: {', '.join(missing)}")
-        
+
         if not isinstance(data.get('amount'), (int, float)) or data['amount'] < 0:
             raise ValueError("Amount must be a positive number")
 
-    def export(self, data: Dict[str, Any], output_path: str) -> None:
+    def export(self, data: Dict[str, Any], output_path: Sink) -> None:
+        if self.metrics is not None:
+            return self._export_metered(data, output_path)
         self.validate(data)
         self._export(data, output_path)
-    
+
+    def export_many(self, records: Iterable[Dict[str, Any]], sink: Sink,
+                    lines: Optional[Iterable[Dict[str, Any]]] = None) -> int:
+        """Stream every record into a single output and return the record count.
+
+        Records are validated and written one at a time, so ``records`` may be
+        a generator of any length. ``sink`` is a path or a file-like object.
+        ``lines`` is an optional flattened line-item table, grouped in invoice
+        order, that is joined onto ``records`` as they stream (see
+        ``attach_lines``).
+        """
+        if lines is not None:
+            records = attach_lines(records, lines)
+        return self._write_many(records, sink, self.validate)
+
+    def iter_export(self, records: Iterable[Dict[str, Any]], chunk_size: int = 64 * 1024,
+                    compression: Optional[str] = None, level: Optional[int] = None) -> Iterator[bytes]:
+        """Yield the encoded export of ``records`` as byte chunks.
+
+        Nothing touches the disk and only about ``chunk_size`` bytes (plus the
+        text encoder's and compressor's internal buffers) are held, so the
+        chunks can be streamed straight to an HTTP response, optionally
+        compressed with ``compression`` (e.g. ``"gzip"``).
+        """
+        buffer = ChunkedSink()
+        sink = CompressedSink(buffer, compression, level) if compression else buffer
+        with self._open(sink) as f:
+            writer = self._writer(f)
+            for data in records:
+                self.validate(data)
+                writer.write(data)
+                if buffer.pending >= chunk_size:
+                    yield buffer.drain()
+            writer.close()
+        if buffer.pending:
+            yield buffer.drain()
+
+    def validate_batch(self, columns: Dict[str, Sequence[Any]]) -> Tuple[Any, Any]:
+        """Validate a column-oriented batch without raising.
+
+        ``columns`` maps field names to equal-length lists or NumPy arrays;
+        ``None`` (or NaN in a float column) counts as a missing value. Returns
+        ``(error_mask, error_codes)`` as NumPy arrays, where ``error_mask`` is
+        True for rejected rows and ``error_codes`` combines the bit flags above.
+        """
+        import numpy as np
+
+        arrays = {field: _column(np, column) for field, column in columns.items()}
+        sizes = {len(array) for array in arrays.values()}
+        if len(sizes) > 1:
+            raise ValueError("All columns in a batch must have the same length")
+        codes = np.zeros(sizes.pop() if sizes else 0, dtype=np.uint32)
+
+        present = {}
+        for i, field in enumerate(self.REQUIRED_FIELDS):
+            array = arrays.get(field)
+            present[field] = _present(np, array, len(codes))
+            codes[~present[field]] |= 1 << (MISSING_FIELD_SHIFT + i)
+
+        amount = arrays.get('amount')
+        if amount is not None:
+            is_number, values = _numbers(np, amount)
+            codes[present['amount'] & ~is_number] |= AMOUNT_NOT_NUMBER
+            codes[is_number & (values < 0)] |= AMOUNT_NEGATIVE
+
+        return codes != 0, codes
+
+    def describe_errors(self, code: int) -> List[str]:
+        """Turn one ``validate_batch`` error code into readable messages."""
+        errors = [
+            f"Missing required field: {field}"
+            for i, field in enumerate(self.REQUIRED_FIELDS)
+            if code & (1 << (MISSING_FIELD_SHIFT + i))
+        ]
+        if code & (AMOUNT_NOT_NUMBER | AMOUNT_NEGATIVE):
+            errors.append("Amount must be a positive number")
+        return errors
+
+    def export_batch(self, columns: Dict[str, Sequence[Any]], sink: Sink, rejects: Optional[Sink] = None) -> Tuple[int, int]:
+        """Export the valid rows of a column-oriented batch, skipping bad ones.
+
+        Rejected rows are written as JSON Lines with their ``errors`` to
+        ``rejects`` when given. Returns ``(exported, rejected)`` counts.
+        """
+        error_mask, codes = self.validate_batch(columns)
+        exported = self._write_many(iter_rows(columns, ~error_mask), sink)
+
+        if rejects is not None:
+            with open_sink(rejects) as f:
+                for row, code in zip(iter_rows(columns, error_mask), codes[error_mask].tolist()):
+                    f.write(json.dumps(dict(row, errors=self.describe_errors(code)), default=str))
+                    f.write("\n")
+        return exported, int(error_mask.sum())
+
+    def _write_many(self, records: Iterable[Dict[str, Any]], sink: Sink,
+                    validate: Optional[Callable[[Dict[str, Any]], None]] = None) -> int:
+        if self.metrics is not None:
+            return self._write_many_metered(records, sink, validate)
+        count = 0
+        with self._open(sink) as f:
+            writer = self._writer(f)
+            for data in records:
+                if validate is not None:
+                    validate(data)
+                writer.write(data)
+                count += 1
+            writer.close()
+        return count
+
+    def _write_many_metered(self, records, sink, validate) -> int:
+        # Same loop as _write_many, timing every METRICS_SAMPLE-th record's
+        # stages and scaling up, so the clock is not read twice per record.
+        # Time spent producing ``records`` is left out.
+        clock = time.perf_counter
+        mask = METRICS_SAMPLE - 1
+        meter = MeteredFile()
+        token = current_meter.set(meter)
+        validating = writing = fixed = 0.0
+        count = 0
+        error = True
+        try:
+            with self._open(sink) as f:
+                start = clock()
+                writer = self._writer(f)
+                fixed += clock() - start
+                for data in records:
+                    if count & mask:
+                        if validate is not None:
+                            validate(data)
+                        writer.write(data)
+                    else:
+                        start = clock()
+                        if validate is not None:
+                            validate(data)
+                        validated = clock()
+                        writer.write(data)
+                        writing += clock() - validated
+                        validating += validated - start
+                    count += 1
+                start = clock()
+                writer.close()
+            fixed += clock() - start
+            error = False
+        finally:
+            current_meter.reset(token)
+            scale = count / ((count + mask) // METRICS_SAMPLE) if count else 0.0
+            self._record(count, meter, validating * scale, writing * scale + fixed, error)
+        return count
+
+    def _export_metered(self, data: Dict[str, Any], output_path: Sink) -> None:
+        clock = time.perf_counter
+        meter = MeteredFile()
+        token = current_meter.set(meter)
+        start = clock()
+        validated = None
+        error = True
+        try:
+            self.validate(data)
+            validated = clock()
+            self._export(data, output_path)
+            error = False
+        finally:
+            current_meter.reset(token)
+            end = clock()
+            if validated is None:
+                validated = end
+            self._record(0 if error else 1, meter, validated - start, end - validated, error)
+
+    def _record(self, records: int, meter: MeteredFile, validating: float, writing: float,
+                error: bool = False) -> None:
+        # ``writing`` covers the writer and closing the output; the part spent
+        # inside the file's own writes is the write stage, the rest serialization.
+        self.metrics.record(self.FORMAT or type(self).__name__, records, meter.bytes, {
+            'validate': validating,
+            'serialize': max(writing - meter.seconds, 0.0),
+            'write': meter.seconds,
+        }, error)
+
+    def _open(self, sink: Sink):
+        return open_sink(sink, self.BINARY, self.NEWLINE, current_meter.get())
+
+    def _export(self, data: Dict[str, Any], output_path: Sink) -> None:
+        with self._open(output_path) as f:
+            writer = self._writer(f)
+            writer.write(data)
+            writer.close()
+
     @abstractmethod
-    def _export(self, data: Dict[str, Any], output_path: str) -> None:
-        pass
\ No newline at end of file
+    def _writer(self, f: IO) -> RecordWriter:
+        pass
+
+    def read(self, source: Source) -> Iterator[Dict[str, Any]]:
+        """Stream the invoices back out of a file this exporter wrote.
+
+        Records are parsed one at a time in the shape ``export_many`` accepts
+        (only the fields the format stores), so memory stays bounded however
+        large ``source`` is. Compressed paths are decompressed by suffix.
+        Formats that are not ``READABLE`` raise ``io.UnsupportedOperation``.
+        """
+        if not self.READABLE:
+            raise io.UnsupportedOperation(f"{type(self).__name__} cannot read its exports back")
+        return self._read(source)
+
+    def _read(self, source: Source) -> Iterator[Dict[str, Any]]:
+        with self._open_source(source) as f:
+            yield from self._reader(f)
+
+    def read_batches(self, source: Source, batch_size: int = 1024) -> Iterator[List[Dict[str, Any]]]:
+        """Like ``read``, grouped into lists of up to ``batch_size`` records."""
+        records = self.read(source)
+        while True:
+            batch = list(itertools.islice(records, batch_size))
+            if not batch:
+                return
+            yield batch
+
+    def _open_source(self, source: Source):
+        return open_source(source, self.BINARY, self.NEWLINE)
+
+
+class RowLayout:
+    """A field mapping compiled once into fast row getters.
+
+    ``get`` is a C-level ``itemgetter`` returning the row tuple and raises
+    ``KeyError`` when a field is absent; ``fill`` is the slower fallback that
+    substitutes each field's default. Writers try ``get`` first. Neither
+    looks at keys outside the layout; writers that must not drop fields
+    (CSV) call ``row(data, strict=True)``, which raises on extra keys.
+    """
+
+    def __init__(self, fields: Tuple[Tuple[str, Any], ...]):
+        self.fields = fields
+        self.keys = tuple(key for key, _ in fields)
+        self.columns = frozenset(self.keys)
+        if len(self.keys) == 1:
+            key = self.keys[0]
+            self.get = lambda data: (data[key],)
+        else:
+            self.get = itemgetter(*self.keys)
+
+    def fill(self, data: Dict[str, Any]) -> Tuple[Any, ...]:
+        return tuple(data.get(key, default) for key, default in self.fields)
+
+    def row(self, data: Dict[str, Any], strict: bool = False) -> Tuple[Any, ...]:
+        """The row tuple, with defaults for missing fields; ``strict`` raises ``ValueError`` on extra keys."""
+        try:
+            row = self.get(data)
+            extra = strict and len(data) > len(self.columns)
+        except KeyError:
+            row = self.fill(data)
+            extra = strict and not self.columns.issuperset(data)
+        if extra:
+            raise ValueError(f"Invoice {data.get('invoice_number')!r} has fields outside the layout: "
+                             f"{', '.join(sorted(set(data) - self.columns))}")
+        return row
+
+
+@lru_cache(maxsize=128)
+def compile_row(fields: Tuple[Tuple[str, Any], ...]) -> RowLayout:
+    """Compile ``(key, default)`` pairs into a cached ``RowLayout``, reused across streams."""
+    return RowLayout(fields)
+
+
+def parse_number(text: str):
+    """Inverse of ``str()`` for exported numbers: ``"5"`` -> 5, ``"199.99"`` -> 199.99."""
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def parse_text_fields(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Restore the typed fields of a record read back from a text-only format."""
+    amount = data.get('amount')
+    if isinstance(amount, str):
+        data['amount'] = parse_number(amount)
+    line_items = data.get('line_items')
+    if isinstance(line_items, str):
+        data['line_items'] = ast.literal_eval(line_items)
+    return data
+
+
+def iter_rows(columns: Dict[str, Sequence[Any]], select=None) -> Iterable[Dict[str, Any]]:
+    """Yield the rows of a column-oriented batch as dicts of plain Python values.
+
+    ``select`` is an optional boolean mask; ``None`` values are left out of the
+    row so it looks like a dict exported without that field.
+    """
+    import numpy as np
+
+    selected = {
+        field: (_column(np, column)[select] if select is not None else _column(np, column)).tolist()
+        for field, column in columns.items()
+    }
+    for values in zip(*selected.values()):
+        yield {field: value for field, value in zip(selected, values) if value is not None}
+
+
+def _column(np, column):
+    if isinstance(column, np.ndarray):
+        return column
+    array = np.asarray(column)
+    # Lists mixing strings and numbers would be coerced to strings; keep the
+    # original Python objects so type checks see what the caller passed.
+    if array.dtype.kind in 'US':
+        array = np.asarray(column, dtype=object)
+    return array
+
+
+def _present(np, array, size):
+    if array is None:
+        return np.zeros(size, dtype=bool)
+    if array.dtype == object:
+        return array != None  # noqa: E711 - elementwise comparison
+    if array.dtype.kind == 'f':
+        return ~np.isnan(array)
+    return np.ones(size, dtype=bool)
+
+
+def _numbers(np, array):
+    """Return (is_number mask, float64 values) for an amount column."""
+    if array.dtype.kind in 'biuf':
+        values = array.astype(np.float64)
+        return ~np.isnan(values), values
+    if array.dtype == object:
+        is_number = np.fromiter((isinstance(value, (int, float)) for value in array), dtype=bool, count=len(array))
+        values = np.zeros(len(array), dtype=np.float64)
+        values[is_number] = array[is_number].astype(np.float64)
+        return is_number, values
+    return np.zeros(len(array), dtype=bool), np.zeros(len(array), dtype=np.float64)
@@ -1,11 +1,64 @@
 import csv
-from .base_exporter import BaseExporter
+from typing import Optional, Sequence
+
+from .base_exporter import BaseExporter, RecordWriter, compile_row, parse_text_fields
 from .exporter_factory import ExporterFactory
 
+
+class CSVWriter(RecordWriter):
+    """Writes ``fields`` (default: the first record's keys) as the header; later rows follow that order.
+
+    Missing fields are written empty. A field outside the header raises
+    ``ValueError`` rather than being dropped.
+    """
+
+    def __init__(self, f, fields: Optional[Sequence[str]] = None):
+        super().__init__(f)
+        self.writerow = csv.writer(f).writerow
+        self.layout = None
+        if fields is not None:
+            self._start(fields)
+
+    def _start(self, fields):
+        self.layout = compile_row(tuple((field, '') for field in fields))
+        self.row = self.layout.row
+        self.writerow(self.layout.keys)
+
+    def write(self, data: dict):
+        if self.layout is None:
+            self._start(data)
+        try:
+            row = self.row(data, True)
+        except ValueError as error:
+            raise ValueError(f"{error}; declare the CSV columns with CSVExporter(fields=...)") from None
+        self.writerow(row)
+
+
+def csv_record(header: Sequence[str], row: Sequence[str]) -> dict:
+    """One row keyed by the header; empty cells are treated as missing fields."""
+    return parse_text_fields({key: value for key, value in zip(header, row) if value != ''})
+
+
+def read_csv(f):
+    """Parse rows keyed by the header."""
+    rows = csv.reader(f)
+    header = next(rows, None)
+    if header is None:
+        return
+    for row in rows:
+        yield csv_record(header, row)
+
+
 @ExporterFactory.register("csv")
 class CSVExporter(BaseExporter):
-    def _export(self, data: dict, output_path: str):
-        with open(output_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(data.keys())
-            writer.writerow(data.values())
+    NEWLINE = ''
+    READABLE = True
+
+    def __init__(self, fields: Optional[Sequence[str]] = None):
+        self.fields = tuple(fields) if fields is not None else None
+
+    def _writer(self, f):
+        return CSVWriter(f, self.fields)
+
+    def _reader(self, f):
+        return read_csv(f)
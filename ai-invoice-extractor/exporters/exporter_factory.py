@@ -1,24 +1,108 @@
 # exporter_factory.py
-from typing import Dict, Type
+import importlib
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Type
+
 
 class ExporterFactory:
     _exporters: Dict[str, Type['BaseExporter']] = {}
-    
+    _instances: Dict[str, 'BaseExporter'] = {}
+
+    # Built-in formats and the module registering each one. Modules are only
+    # imported the first time their format is requested.
+    _modules: Dict[str, str] = {
+        'json': '.json_exporter',
+        'csv': '.csv_exporter',
+        'xml': '.xml_exporter',
+        'ubl': '.ubl_exporter',
+        'quickbooks': '.quickbooks_exporter',
+        'xero': '.xero_exporter',
+        'columnar': '.columnar_exporter',
+    }
+
+    # Third-party packages can ship formats as separate distributions by
+    # declaring an entry point in this group: ``myformat = "pkg.module:MyExporter"``.
+    ENTRY_POINT_GROUP = 'well.exporters'
+
     @classmethod
     def register(cls, name: str) -> callable:
         """Decorator to register exporter classes."""
         def wrapper(exporter_cls: Type['BaseExporter']) -> Type['BaseExporter']:
             cls._exporters[name.lower()] = exporter_cls
+            if 'FORMAT' not in vars(exporter_cls):
+                exporter_cls.FORMAT = name.lower()
+            cls._instances.pop(name.lower(), None)
             return exporter_cls
         return wrapper
-    
+
     @classmethod
     def get_exporter(cls, format_name: str) -> 'BaseExporter':
-        """Get an exporter instance by format name."""
-        exporter_cls = cls._exporters.get(format_name.lower())
+        """Get the shared exporter instance for a format, importing it on first use."""
+        name = format_name.lower()
+        exporter = cls._instances.get(name)
+        if exporter is None:
+            exporter = cls._instances[name] = cls.get_exporter_class(name)()
+        return exporter
+
+    @classmethod
+    def get_exporter_class(cls, format_name: str) -> Type['BaseExporter']:
+        """Resolve a format to its exporter class without instantiating it."""
+        name = format_name.lower()
+        if name not in cls._exporters:
+            cls._load(name)
+        exporter_cls = cls._exporters.get(name)
         if not exporter_cls:
             raise ValueError(f"Unsupported export format: {format_name}")
-        return exporter_cls()
+        return exporter_cls
+
+    @classmethod
+    def available_formats(cls) -> List[str]:
+        """Every format that can be requested, whether or not it is imported yet."""
+        names = dict.fromkeys(cls._exporters)
+        names.update(dict.fromkeys(cls._modules))
+        names.update(dict.fromkeys(entry_point.name.lower() for entry_point in _entry_points(cls.ENTRY_POINT_GROUP)))
+        return list(names)
+
+    @classmethod
+    def _load(cls, name: str) -> None:
+        module = cls._modules.get(name)
+        if module is not None:
+            importlib.import_module(module, __package__)
+            return
+
+        for entry_point in _entry_points(cls.ENTRY_POINT_GROUP):
+            if entry_point.name.lower() == name:
+                exporter_cls = entry_point.load()
+                # Entry points may name the class directly or a module that
+                # registers itself with the decorator on import.
+                if isinstance(exporter_cls, type):
+                    cls._exporters.setdefault(name, exporter_cls)
+                return
+
+
+def _entry_points(group: str):
+    # importlib.metadata is comparatively slow to import; only pay for it
+    # when a format is not built in.
+    from importlib import metadata
+
+    entry_points = metadata.entry_points()
+    if hasattr(entry_points, 'select'):
+        return entry_points.select(group=group)
+    return entry_points.get(group, [])
+
 
 # For backward compatibility
-get_exporter = ExporterFactory.get_exporter
\ No newline at end of file
+get_exporter = ExporterFactory.get_exporter
+
+
+def iter_export(records: Iterable[Dict[str, Any]], format_name: str, chunk_size: int = 64 * 1024,
+                compression: Optional[str] = None, level: Optional[int] = None) -> Iterator[bytes]:
+    """Stream ``records`` in ``format_name`` as encoded byte chunks (see ``BaseExporter.iter_export``)."""
+    return get_exporter(format_name).iter_export(records, chunk_size, compression, level)
+
+
+def iter_import(source, format_name: str, batch_size: Optional[int] = None) -> Iterator[Any]:
+    """Stream invoices back out of ``source`` (see ``BaseExporter.read``), in lists when ``batch_size`` is set."""
+    exporter = get_exporter(format_name)
+    if batch_size is None:
+        return exporter.read(source)
+    return exporter.read_batches(source, batch_size)
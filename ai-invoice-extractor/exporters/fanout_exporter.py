@@ -0,0 +1,181 @@
+import itertools
+import multiprocessing
+import pickle
+import queue
+import time
+from contextlib import ExitStack
+from typing import Dict, Any, Iterable, Optional
+
+from .exporter_factory import ExporterFactory
+
+
+def _stats(records: int, seconds: float) -> Dict[str, float]:
+    return {
+        "records": records,
+        "seconds": seconds,
+        "records_per_second": records / seconds if seconds else 0.0,
+    }
+
+
+def _write_formats(exporters: Dict[str, Any], sinks: Dict[str, str], chunks) -> Dict[str, Dict[str, float]]:
+    """Write every chunk of already validated records to each exporter's sink."""
+    elapsed = dict.fromkeys(exporters, 0.0)
+    count = 0
+    with ExitStack() as stack:
+        writers = {}
+        for name, exporter in exporters.items():
+            f = stack.enter_context(exporter._open(sinks[name]))
+            writers[name] = exporter._writer(f)
+
+        for chunk in chunks:
+            for name, writer in writers.items():
+                start = time.perf_counter()
+                for data in chunk:
+                    writer.write(data)
+                elapsed[name] += time.perf_counter() - start
+            count += len(chunk)
+
+        for name, writer in writers.items():
+            start = time.perf_counter()
+            writer.close()
+            elapsed[name] += time.perf_counter() - start
+    return {name: _stats(count, seconds) for name, seconds in elapsed.items()}
+
+
+def _format_worker(exporters, sinks, chunks, results) -> None:
+    """Process entry point: write chunks from the ``chunks`` queue until ``None``, then report."""
+    try:
+        results.put((True, _write_formats(exporters, sinks, iter(chunks.get, None))))
+    except BaseException as error:
+        try:
+            pickle.dumps(error)
+        except Exception:
+            error = RuntimeError(f"{type(error).__name__}: {error}")
+        results.put((False, error))
+
+
+class FanoutExporter:
+    """Exports one stream of invoices to several formats in a single pass.
+
+    Formats are looked up in the ``ExporterFactory`` registry, so any
+    registered exporter (including custom ones) can take part; with no
+    ``formats`` every available format is used. Each record is validated
+    once, then handed to every format's writer.
+
+    With ``workers > 1`` the formats are split over that many processes.
+    The parent validates the input and streams it to them in chunks of
+    ``chunk_size`` records through queues holding at most ``queue_size``
+    chunks, so memory stays bounded for inputs of any length. The workers
+    receive the exporter instances resolved here, so their classes must be
+    importable by module path (not defined in ``__main__``) when processes
+    are started with ``spawn``.
+    """
+
+    def __init__(self, formats: Optional[Iterable[str]] = None, workers: int = 1,
+                 chunk_size: int = 1000, queue_size: int = 4):
+        names = formats if formats is not None else ExporterFactory.available_formats()
+        self.exporters = {name.lower(): ExporterFactory.get_exporter(name) for name in names}
+        if not self.exporters:
+            raise ValueError("No export formats selected")
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.queue_size = queue_size
+
+        # Exporters sharing the same validation rules only need one check.
+        validators = {}
+        for exporter in self.exporters.values():
+            key = (type(exporter).validate, tuple(exporter.REQUIRED_FIELDS))
+            validators.setdefault(key, exporter.validate)
+        self._validators = list(validators.values())
+
+    def validate(self, data: Dict[str, Any]) -> None:
+        for validate in self._validators:
+            validate(data)
+
+    def export_many(self, records: Iterable[Dict[str, Any]], sinks: Dict[str, str]) -> Dict[str, Dict[str, float]]:
+        """Write ``records`` to every format and return per-format throughput.
+
+        ``sinks`` maps each format name to its output path.
+        """
+        sinks = {name.lower(): sink for name, sink in sinks.items()}
+        missing = [name for name in self.exporters if name not in sinks]
+        if missing:
+            raise ValueError(f"Missing sinks for formats: {', '.join(missing)}")
+
+        if self.workers > 1:
+            return self._export_parallel(records, sinks)
+        return self._export_single_pass(records, sinks)
+
+    def _export_single_pass(self, records, sinks):
+        return _write_formats(self.exporters, sinks, ([data] for data in self._validated(records)))
+
+    def _validated(self, records):
+        for data in records:
+            self.validate(data)
+            yield data
+
+    def _export_parallel(self, records, sinks):
+        names = list(self.exporters)
+        groups = [names[i::self.workers] for i in range(min(self.workers, len(names)))]
+        context = multiprocessing.get_context()
+        results = context.Queue()
+        workers = []
+        try:
+            for group in groups:
+                chunks = context.Queue(maxsize=self.queue_size)
+                process = context.Process(
+                    target=_format_worker,
+                    args=({name: self.exporters[name] for name in group}, {name: sinks[name] for name in group},
+                          chunks, results),
+                    daemon=True,
+                )
+                process.start()
+                workers.append((process, chunks))
+
+            validated = self._validated(records)
+            while True:
+                chunk = list(itertools.islice(validated, self.chunk_size))
+                for process, chunks in workers:
+                    self._put(chunks, chunk or None, process, results)
+                if not chunk:
+                    break
+
+            report = {}
+            for _ in workers:
+                report.update(self._result(results, workers))
+            for process, _ in workers:
+                process.join()
+            return {name: report[name] for name in names}
+        finally:
+            # Workers still running here were abandoned by an error.
+            for process, _ in workers:
+                if process.is_alive():
+                    process.terminate()
+                process.join()
+
+    @staticmethod
+    def _result(results, workers) -> Dict[str, Dict[str, float]]:
+        """Next worker report, re-raising its error; fails if a worker died without reporting."""
+        while True:
+            try:
+                ok, value = results.get(timeout=0.1)
+            except queue.Empty:
+                dead = [process for process, _ in workers if process.exitcode not in (None, 0)]
+                if dead:
+                    raise RuntimeError(f"Export worker exited with code {dead[0].exitcode}") from None
+                continue
+            if not ok:
+                raise value
+            return value
+
+    @classmethod
+    def _put(cls, chunks, chunk, process, results) -> None:
+        """Queue ``chunk`` for ``process``, failing instead of blocking forever if it stopped."""
+        while True:
+            try:
+                chunks.put(chunk, timeout=0.1)
+                return
+            except queue.Full:
+                if not process.is_alive():
+                    cls._result(results, [(process, chunks)])
+                    raise RuntimeError("Export worker exited before the end of the input")
@@ -1,9 +1,93 @@
 import json
-from .base_exporter import BaseExporter
+from .base_exporter import BaseExporter, RecordWriter
 from .exporter_factory import ExporterFactory
+from .records import json_default
+
+# One shared encoder: json.dumps(default=...) would build a new one per record.
+_encode = json.JSONEncoder(default=json_default).encode
+
+
+class JSONLinesWriter(RecordWriter):
+    def write(self, data: dict):
+        self.f.write(_encode(data))
+        self.f.write("\n")
+
+
+class JSONArrayWriter(RecordWriter):
+    """Streams a JSON array without holding the records in memory."""
+
+    def __init__(self, f):
+        super().__init__(f)
+        self.first = True
+        f.write("[")
+
+    def write(self, data: dict):
+        self.f.write("\n  " if self.first else ",\n  ")
+        self.f.write(_encode(data))
+        self.first = False
+
+    def close(self):
+        self.f.write("]\n" if self.first else "\n]\n")
+
+
+_decode = json.JSONDecoder().raw_decode
+
+
+# Longest text read_json buffers while waiting for one value to decode.
+MAX_VALUE_SIZE = 64 * 1024 * 1024
+
+
+def read_json(f, chunk_size: int = 64 * 1024, max_value_size: int = MAX_VALUE_SIZE):
+    """Stream the objects of a JSON Lines file, a JSON array or a single JSON document.
+
+    The text is decoded value by value from a rolling buffer, so a large
+    array is never loaded whole. A value that still does not decode once
+    ``max_value_size`` characters are buffered raises ``JSONDecodeError``,
+    so corrupt input fails without reading the rest of the file.
+    """
+    buffer, position, eof = "", 0, False
+    in_array = None
+    while True:
+        # Skip whitespace and, inside a top-level array, the separators.
+        while position < len(buffer) and (buffer[position].isspace() or (in_array and buffer[position] in ",]")):
+            position += 1
+        if position < len(buffer) and in_array is None:
+            in_array = buffer[position] == "["
+            position += in_array
+            continue
+        if position < len(buffer):
+            try:
+                value, end = _decode(buffer, position)
+            except json.JSONDecodeError:
+                if eof or len(buffer) - position > max_value_size:
+                    raise
+            else:
+                # A value ending exactly at the buffer's edge may be a truncated number.
+                if end < len(buffer) or eof:
+                    yield value
+                    position = end
+                    continue
+        if eof:
+            return
+        chunk = f.read(chunk_size)
+        eof = not chunk
+        buffer = buffer[position:] + chunk
+        position = 0
+
 
 @ExporterFactory.register("json")
 class JSONExporter(BaseExporter):
+    READABLE = True
+
+    def __init__(self, lines: bool = True):
+        self.lines = lines
+
     def _export(self, data: dict, output_path: str):
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2)
+        with self._open(output_path) as f:
+            json.dump(data, f, indent=2, default=json_default)
+
+    def _writer(self, f):
+        return JSONLinesWriter(f) if self.lines else JSONArrayWriter(f)
+
+    def _reader(self, f):
+        return read_json(f)
@@ -0,0 +1,179 @@
+import io
+import json
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional
+
+STAGES = ('validate', 'serialize', 'write')
+
+# Histogram upper bounds in seconds: 1us doubling up to ~134s, then +Inf.
+DEFAULT_BUCKETS = tuple(1e-6 * 2 ** i for i in range(28))
+
+# The meter of the export running in this thread/task, picked up by BaseExporter._open.
+current_meter: ContextVar[Optional['MeteredFile']] = ContextVar('current_meter', default=None)
+
+
+class MeteredFile(io.RawIOBase):
+    """Pass-through binary file that counts the bytes and seconds spent in its writes."""
+
+    def __init__(self):
+        super().__init__()
+        self.raw = None
+        self.bytes = 0
+        self.seconds = 0.0
+
+    def attach(self, raw) -> 'MeteredFile':
+        self.raw = raw
+        return self
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        start = time.perf_counter()
+        self.raw.write(data)
+        self.seconds += time.perf_counter() - start
+        self.bytes += len(data)
+        return len(data)
+
+    def flush(self) -> None:
+        if self.raw is not None and not self.raw.closed:
+            start = time.perf_counter()
+            self.raw.flush()
+            self.seconds += time.perf_counter() - start
+
+    def tell(self) -> int:
+        return self.raw.tell()
+
+
+class Histogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def percentile(self, q: float) -> float:
+        """Estimate the ``q`` quantile (0-1), interpolating within its bucket."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.buckets[i - 1] if i else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else lower
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+
+class FormatStats:
+    def __init__(self, buckets):
+        self.calls = 0
+        self.errors = 0
+        self.records = 0
+        self.bytes = 0
+        self.stages = {stage: Histogram(buckets) for stage in STAGES}
+
+
+class ExportMetrics:
+    """Per-format export counters and per-stage timing histograms.
+
+    Every ``export``/``export_many`` call of an exporter whose ``metrics`` is
+    set adds one observation per stage: ``validate`` (time in ``validate``),
+    ``serialize`` (formatting and compression) and ``write`` (time inside
+    the output file's writes), plus its record and byte counts. Percentiles
+    are estimated from fixed exponential buckets, so recording is constant
+    time and memory. Listeners are called with
+    ``(format_name, records, nbytes, timings)`` after each call.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.formats: Dict[str, FormatStats] = {}
+        self.listeners: List[Callable[[str, int, int, Dict[str, float]], None]] = []
+        self.lock = threading.Lock()
+
+    def add_listener(self, listener: Callable[[str, int, int, Dict[str, float]], None]) -> None:
+        self.listeners.append(listener)
+
+    def record(self, format_name: str, records: int, nbytes: int, timings: Dict[str, float],
+               error: bool = False) -> None:
+        with self.lock:
+            stats = self.formats.get(format_name)
+            if stats is None:
+                stats = self.formats[format_name] = FormatStats(self.buckets)
+            stats.calls += 1
+            stats.errors += error
+            stats.records += records
+            stats.bytes += nbytes
+            for stage, seconds in timings.items():
+                stats.stages[stage].observe(seconds)
+        for listener in self.listeners:
+            listener(format_name, records, nbytes, timings)
+
+    def reset(self) -> None:
+        with self.lock:
+            self.formats.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                name: {
+                    'calls': stats.calls,
+                    'errors': stats.errors,
+                    'records': stats.records,
+                    'bytes': stats.bytes,
+                    'stages': {
+                        stage: {
+                            'count': histogram.count,
+                            'seconds': histogram.sum,
+                            'p50': histogram.percentile(0.5),
+                            'p90': histogram.percentile(0.9),
+                            'p99': histogram.percentile(0.99),
+                        }
+                        for stage, histogram in stats.stages.items()
+                    },
+                }
+                for name, stats in self.formats.items()
+            }
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self, prefix: str = 'well_export') -> str:
+        """Render the counters and histograms in the Prometheus text exposition format."""
+        lines = []
+        with self.lock:
+            for metric, attribute in (('calls', 'calls'), ('errors', 'errors'), ('records', 'records'), ('bytes', 'bytes')):
+                lines.append(f"# TYPE {prefix}_{metric}_total counter")
+                for name, stats in self.formats.items():
+                    lines.append(f'{prefix}_{metric}_total{{format="{name}"}} {getattr(stats, attribute)}')
+            lines.append(f"# TYPE {prefix}_stage_seconds histogram")
+            for name, stats in self.formats.items():
+                for stage, histogram in stats.stages.items():
+                    labels = f'format="{name}",stage="{stage}"'
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count
+                        lines.append(f'{prefix}_stage_seconds_bucket{{{labels},le="{bound:g}"}} {cumulative}')
+                    lines.append(f'{prefix}_stage_seconds_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                    lines.append(f'{prefix}_stage_seconds_sum{{{labels}}} {histogram.sum}')
+                    lines.append(f'{prefix}_stage_seconds_count{{{labels}}} {histogram.count}')
+        return "\n".join(lines) + "\n"
+
+
+def install(metrics: Optional[ExportMetrics] = None) -> ExportMetrics:
+    """Turn on metrics for every exporter (``None`` creates a new ``ExportMetrics``)."""
+    from .base_exporter import BaseExporter
+
+    BaseExporter.metrics = metrics = metrics or ExportMetrics()
+    return metrics
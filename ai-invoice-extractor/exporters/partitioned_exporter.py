@@ -0,0 +1,238 @@
+import hashlib
+import io
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+from .exporter_factory import ExporterFactory
+from .sinks import AtomicSink, GroupCommit, compression_for, open_compressor, open_sink
+
+MANIFEST_NAME = 'manifest.json'
+
+# Built-in partition keys; any callable taking a record and returning a str also works.
+PARTITIONS: Dict[str, Callable[[Dict[str, Any]], str]] = {
+    'month': lambda data: str(data.get('date', ''))[:7],
+    'customer': lambda data: str(data.get('customer', '')),
+}
+
+
+class _CountingFile(io.RawIOBase):
+    """Pass-through binary file that counts (and optionally hashes) the bytes written."""
+
+    def __init__(self, raw, hashed: bool = False):
+        super().__init__()
+        self.raw = raw
+        self.sha256 = hashlib.sha256() if hashed else None
+        self.bytes = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.raw.write(data)
+        if self.sha256 is not None:
+            self.sha256.update(data)
+        self.bytes += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.bytes
+
+
+class _Shard:
+    def __init__(self, exporter, path: str, partition: Optional[str], group: Optional[GroupCommit] = None):
+        self.path = path
+        self.partition = partition
+        self.records = 0
+        self.min_date = self.max_date = None
+        self.future = None
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.staged = group is not None
+        self.stack = ExitStack()
+        # ``file`` sees the bytes stored on disk (hashed for the manifest);
+        # ``serialized`` sees them before compression and drives rotation.
+        with self.stack:
+            target = self.stack.enter_context(AtomicSink(path, group).staged()) if self.staged else path
+            self.file = self.serialized = _CountingFile(self.stack.enter_context(open(target, 'wb')), hashed=True)
+            method, level = compression_for(path)
+            if method is not None:
+                compressor = self.stack.enter_context(open_compressor(self.file, method, level))
+                self.serialized = _CountingFile(compressor)
+            self.stream = self.stack.enter_context(exporter._open(self.serialized))
+            self.writer = exporter._writer(self.stream)
+            self.stack = self.stack.pop_all()
+
+    def write_batch(self, batch: List[Dict[str, Any]]) -> None:
+        for data in batch:
+            self.writer.write(data)
+        self.stream.flush()
+
+    def track(self, data: Dict[str, Any]) -> None:
+        self.records += 1
+        date = data.get('date')
+        if date is not None:
+            date = str(date)
+            if self.min_date is None or date < self.min_date:
+                self.min_date = date
+            if self.max_date is None or date > self.max_date:
+                self.max_date = date
+
+    def wait(self) -> None:
+        if self.future is not None:
+            self.future.result()
+            self.future = None
+
+    def close(self) -> Dict[str, Any]:
+        self.wait()
+        self.writer.close()
+        self.stack.close()
+        return {
+            'path': self.path,
+            'partition': self.partition,
+            'records': self.records,
+            'bytes': self.file.bytes,
+            'sha256': self.file.sha256.hexdigest(),
+            'min_date': self.min_date,
+            'max_date': self.max_date,
+        }
+
+    def abort(self, error: BaseException) -> None:
+        """Close the shard's files after ``error`` and remove the unfinished shard."""
+        self.stack.__exit__(type(error), error, error.__traceback__)
+        if not self.staged:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+
+class PartitionedExporter:
+    """Splits one export into shards by key and/or size, and writes a manifest.
+
+    Records are routed by ``partition_by`` (``"month"``, ``"customer"`` or a
+    callable) to ``<directory>/<key>/part-NNNNN<suffix>``, and a shard is
+    rotated once it holds ``max_records`` records or about ``max_bytes``
+    serialized (pre-compression) bytes; the size is checked as each batch is
+    flushed, so a shard can exceed ``max_bytes`` by up to one batch. Shards of
+    different partitions stay open side by side; with ``workers > 1`` their
+    batches are serialized and written concurrently on a thread pool. If the
+    export fails, open shards are closed and removed (or their staged temp
+    files discarded); shards already completed stay on disk. A compression suffix such as
+    ``".csv.gz"`` compresses every shard. ``manifest.json`` lists each shard's
+    path, record count, size, SHA-256 and min/max ``date``. With a
+    ``GroupCommit`` as ``group``, shards are staged and renamed into place
+    in durable batches, and the manifest is committed after every shard.
+    """
+
+    def __init__(self, format_name: str, directory: str,
+                 partition_by: Union[None, str, Callable[[Dict[str, Any]], str]] = None,
+                 max_records: Optional[int] = None, max_bytes: Optional[int] = None,
+                 suffix: Optional[str] = None, workers: int = 1, batch_size: int = 1024,
+                 group: Optional[GroupCommit] = None):
+        self.format_name = format_name.lower()
+        self.exporter = ExporterFactory.get_exporter(format_name)
+        self.directory = directory
+        if isinstance(partition_by, str):
+            if partition_by not in PARTITIONS:
+                raise ValueError(f"Unsupported partition key: {partition_by}")
+            partition_by = PARTITIONS[partition_by]
+        self.partition_by = partition_by
+        self.max_records = max_records
+        self.max_bytes = max_bytes
+        self.suffix = suffix or f".{self.format_name}"
+        self.workers = workers
+        self.batch_size = batch_size
+        self.group = group
+
+    def export_many(self, records: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Write ``records`` into shards and return the manifest entries."""
+        manifest = []
+        shards: Dict[Optional[str], _Shard] = {}
+        batches: Dict[Optional[str], List[Dict[str, Any]]] = {}
+        counters: Dict[Optional[str], int] = {}
+        pool = ThreadPoolExecutor(self.workers) if self.workers > 1 else None
+
+        def open_shard(key):
+            index = counters.get(key, 0)
+            counters[key] = index + 1
+            shard = shards[key] = _Shard(self.exporter, self._path(key, index), key, self.group)
+            return shard
+
+        def flush(key):
+            batch = batches.pop(key, None)
+            if not batch:
+                return
+            shard = shards[key]
+            shard.wait()
+            # Byte counts are current once the shard's previous batch is written.
+            if self.max_bytes is not None and shard.serialized.bytes >= self.max_bytes:
+                manifest.append(shard.close())
+                shard = open_shard(key)
+            for data in batch:
+                shard.track(data)
+            if pool is None:
+                shard.write_batch(batch)
+            else:
+                shard.future = pool.submit(shard.write_batch, batch)
+
+        try:
+            for data in records:
+                self.exporter.validate(data)
+                key = _safe_name(self.partition_by(data)) if self.partition_by else None
+
+                if key in shards and self._full(shards[key], len(batches.get(key, ()))):
+                    flush(key)
+                    manifest.append(shards[key].close())
+                    del shards[key]
+                if key not in shards:
+                    open_shard(key)
+
+                batch = batches.setdefault(key, [])
+                batch.append(data)
+                if len(batch) >= self.batch_size:
+                    flush(key)
+
+            for key in list(shards):
+                flush(key)
+            for key in list(shards):
+                manifest.append(shards[key].close())
+                del shards[key]
+        except BaseException as error:
+            if pool is not None:
+                pool.shutdown()
+            for shard in shards.values():
+                shard.abort(error)
+            raise
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        manifest.sort(key=lambda entry: entry['path'])
+        for entry in manifest:
+            entry['path'] = os.path.relpath(entry['path'], self.directory)
+        manifest_path = os.path.join(self.directory, MANIFEST_NAME)
+        if self.group is not None:
+            self.group.commit()
+            manifest_path = AtomicSink(manifest_path, self.group)
+        with open_sink(manifest_path) as f:
+            json.dump({'format': self.format_name, 'shards': manifest}, f, indent=2)
+        if self.group is not None:
+            self.group.commit()
+        return manifest
+
+    def _full(self, shard: _Shard, queued: int) -> bool:
+        return self.max_records is not None and shard.records + queued >= self.max_records
+
+    def _path(self, key: Optional[str], index: int) -> str:
+        name = f"part-{index:05d}{self.suffix}"
+        if key is None:
+            return os.path.join(self.directory, name)
+        return os.path.join(self.directory, key, name)
+
+
+def _safe_name(key: str) -> str:
+    return re.sub(r'[^A-Za-z0-9._-]+', '_', key).strip('.') or '_'
@@ -1,10 +1,96 @@
-from .base_exporter import BaseExporter
-from .exporter_factory import ExporterFactory   
+from .base_exporter import BaseExporter, RecordWriter, compile_row, parse_number
+from .exporter_factory import ExporterFactory
+from .records import as_number, line_total
+
+# Tabs and line breaks would split an IIF row, so they become spaces in text fields.
+_IIF_SEPARATORS = str.maketrans("\t\r\n", "   ")
+
+
+def iif_text(value) -> str:
+    return str(value).translate(_IIF_SEPARATORS)
+
+
+class IIFWriter(RecordWriter):
+    """QuickBooks IIF: one header block, then a TRNS/ENDTRNS group per invoice.
+
+    Each line item becomes an SPL row crediting the income account; as in
+    QuickBooks' own invoice exports, SPL amounts and quantities are negated.
+    """
+    LAYOUT = compile_row((
+        ("date", None),
+        ("amount", None),
+        ("customer", "Client"),
+    ))
+
+    def __init__(self, f):
+        super().__init__(f)
+        self.get = self.LAYOUT.get
+        self.write_text = f.write
+        f.write("!TRNS\tTRNSTYPE\tDATE\tACCNT\tAMOUNT\tNAME\n"
+                "!SPL\tTRNSTYPE\tDATE\tACCNT\tAMOUNT\tNAME\tMEMO\tQNTY\tPRICE\n"
+                "!ENDTRNS\n")
+
+    def write(self, data: dict):
+        try:
+            row = self.get(data)
+        except KeyError:
+            row = self.LAYOUT.fill(data)
+        date, amount, customer = row
+        customer = iif_text(customer)
+        items = data.get("line_items")
+        if not items:
+            self.write_text(f"TRNS\tINVOICE\t{date}\tAccounts Receivable\t{amount}\t{customer}\nENDTRNS\n")
+            return
+        self.write_text("".join([
+            f"TRNS\tINVOICE\t{date}\tAccounts Receivable\t{amount}\t{customer}\n",
+            *(f"SPL\tINVOICE\t{date}\tSales\t{-line_total(item)}\t{customer}"
+              f"\t{iif_text(item.get('description', ''))}\t{-as_number(item.get('quantity', 0))}"
+              f"\t{item.get('unit_price', 0)}\n" for item in items),
+            "ENDTRNS\n",
+        ]))
+
+
+def read_iif(f):
+    """Scan IIF lines, yielding one invoice per TRNS ... ENDTRNS group.
+
+    Columns are located through the ``!TRNS``/``!SPL`` header rows, and SPL
+    rows become ``line_items`` with their sign flipped back.
+    """
+    columns = {}
+    data = None
+    for line in f:
+        fields = line.rstrip("\r\n").split("\t")
+        kind = fields[0]
+        if kind.startswith("!"):
+            columns[kind[1:]] = {name: i for i, name in enumerate(fields)}
+        elif kind == "TRNS":
+            trns = columns["TRNS"]
+            data = {}
+            for key, column in (("date", "DATE"), ("amount", "AMOUNT"), ("customer", "NAME")):
+                value = fields[trns[column]]
+                # Missing fields are exported as "None" (see IIFWriter.LAYOUT).
+                if value not in ("", "None"):
+                    data[key] = value
+            if "amount" in data:
+                data["amount"] = parse_number(data["amount"])
+        elif kind == "SPL" and data is not None:
+            spl = columns["SPL"]
+            data.setdefault("line_items", []).append({
+                "description": fields[spl["MEMO"]],
+                "quantity": -parse_number(fields[spl["QNTY"]]),
+                "unit_price": parse_number(fields[spl["PRICE"]]),
+            })
+        elif kind == "ENDTRNS" and data is not None:
+            yield data
+            data = None
+
 
 @ExporterFactory.register("quickbooks")
 class QuickBooksExporter(BaseExporter):
-    def _export(self, data: dict, output_path: str):
-        with open(output_path, 'w') as f:
-            f.write("!TRNS\tTRNSTYPE\tDATE\tACCNT\tAMOUNT\tNAME\n")
-            f.write(f"TRNS\tINVOICE\t{data.get('date')}\tAccounts Receivable\t{data.get('amount')}\t{data.get('customer', 'Client')}\n")
-            f.write("ENDTRNS\n")
+    READABLE = True
+
+    def _writer(self, f):
+        return IIFWriter(f)
+
+    def _reader(self, f):
+        return read_iif(f)
@@ -0,0 +1,192 @@
+from array import array
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+INVOICE_FIELDS = ('invoice_number', 'date', 'due_date', 'amount', 'customer', 'line_items')
+LINE_ITEM_FIELDS = ('description', 'quantity', 'unit_price')
+
+
+class InvoiceRecord:
+    """Compact invoice with one slot per field instead of a per-row dict.
+
+    It reads like the invoice dicts exporters already take (``in``, ``[]``,
+    ``get``, ``keys``, ``items``), so every exporter accepts either. A field
+    that was never set is treated as absent, just like a missing dict key.
+    """
+    __slots__ = INVOICE_FIELDS
+
+    def __init__(self, **fields: Any):
+        for key, value in fields.items():
+            setattr(self, key, value)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'InvoiceRecord':
+        return cls(**{key: value for key, value in data.items() if key in INVOICE_FIELDS})
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in INVOICE_FIELDS:
+            raise KeyError(key)
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and key in INVOICE_FIELDS and hasattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return (key for key in INVOICE_FIELDS if hasattr(self, key))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (InvoiceRecord, dict)):
+            return self.to_dict() == dict(other.items())
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"InvoiceRecord({self.to_dict()!r})"
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default) if key in INVOICE_FIELDS else default
+
+    def keys(self) -> List[str]:
+        return list(self)
+
+    def values(self) -> List[Any]:
+        return [getattr(self, key) for key in self]
+
+    def items(self) -> List[tuple]:
+        return [(key, getattr(self, key)) for key in self]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.items())
+
+
+Mapping.register(InvoiceRecord)
+
+
+def json_default(value: Any) -> Any:
+    """``json.dumps`` hook that serializes ``InvoiceRecord`` as its dict."""
+    if isinstance(value, InvoiceRecord):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def as_number(value: Any):
+    """``value`` as an int or float; numeric strings (e.g. from CSV input) are parsed."""
+    if isinstance(value, (int, float)):
+        return value
+    text = str(value).strip()
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def line_total(item: Dict[str, Any]) -> float:
+    """Extended amount of one line item, rounded to cents."""
+    return round(as_number(item.get('quantity', 0)) * as_number(item.get('unit_price', 0)), 2)
+
+
+def attach_lines(records: Iterable[Dict[str, Any]], lines: Iterable[Dict[str, Any]],
+                 key: str = 'invoice_number') -> Iterator[Dict[str, Any]]:
+    """Join a flattened line-item table onto its invoices in one streaming pass.
+
+    ``lines`` holds one row per line item carrying the invoice's ``key``
+    plus ``LINE_ITEM_FIELDS``, grouped in the same order as ``records`` (the
+    order a header/line query sorted by invoice produces). Each invoice is
+    yielded as a dict whose ``line_items`` are its rows; invoices without
+    rows are yielded unchanged. Rows left over once ``records`` is exhausted
+    were out of order and raise ``ValueError``.
+    """
+    lines = iter(lines)
+    row = next(lines, None)
+    for data in records:
+        if row is None or row.get(key) != data.get(key):
+            yield data
+            continue
+        items = []
+        while row is not None and row.get(key) == data.get(key):
+            items.append({field: value for field, value in row.items() if field != key})
+            row = next(lines, None)
+        data = dict(data.items())
+        data['line_items'] = items
+        yield data
+    if row is not None:
+        raise ValueError(f"Line item for {key} {row.get(key)!r} does not follow its invoice")
+
+
+class InvoiceBatch:
+    """Column-oriented invoices: one list per field, no per-row objects.
+
+    Values are kept as given (``None`` marks a missing field), so ints stay
+    ints and invalid values reach ``validate_batch`` to be rejected. Line
+    items are flattened into ``line_*`` columns, with invoice ``i`` owning
+    lines ``line_offsets[i]:line_offsets[i + 1]``. Iterating yields
+    ``InvoiceRecord`` views built one at a time, so a batch can be passed
+    directly to ``export_many``; ``columns()`` feeds ``validate_batch`` and
+    ``export_batch``.
+    """
+
+    def __init__(self):
+        self.invoice_number: List[Optional[str]] = []
+        self.date: List[Optional[str]] = []
+        self.due_date: List[Optional[str]] = []
+        self.amount: List[Any] = []
+        self.customer: List[Optional[str]] = []
+        self.line_offsets = array('q', [0])
+        self.line_description: List[str] = []
+        self.line_quantity: List[Any] = []
+        self.line_unit_price: List[Any] = []
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> 'InvoiceBatch':
+        batch = cls()
+        for data in records:
+            batch.append(data)
+        return batch
+
+    def __len__(self) -> int:
+        return len(self.invoice_number)
+
+    def append(self, data: Dict[str, Any]) -> None:
+        self.invoice_number.append(data.get('invoice_number'))
+        self.date.append(data.get('date'))
+        self.due_date.append(data.get('due_date'))
+        self.amount.append(data.get('amount'))
+        self.customer.append(data.get('customer'))
+        for item in data.get('line_items') or ():
+            self.line_description.append(item.get('description', ''))
+            self.line_quantity.append(item.get('quantity', 0))
+            self.line_unit_price.append(item.get('unit_price', 0))
+        self.line_offsets.append(len(self.line_description))
+
+    def record(self, i: int) -> InvoiceRecord:
+        record = InvoiceRecord()
+        for key in ('invoice_number', 'date', 'due_date', 'amount', 'customer'):
+            value = getattr(self, key)[i]
+            if value is not None:
+                setattr(record, key, value)
+        start, end = self.line_offsets[i], self.line_offsets[i + 1]
+        if end > start:
+            record.line_items = [
+                {'description': description, 'quantity': quantity, 'unit_price': unit_price}
+                for description, quantity, unit_price in zip(
+                    self.line_description[start:end], self.line_quantity[start:end], self.line_unit_price[start:end])
+            ]
+        return record
+
+    def __iter__(self) -> Iterator[InvoiceRecord]:
+        return (self.record(i) for i in range(len(self)))
+
+    def columns(self) -> Dict[str, Any]:
+        """Header columns in the shape ``BaseExporter.validate_batch`` expects."""
+        return {
+            'invoice_number': self.invoice_number,
+            'date': self.date,
+            'due_date': self.due_date,
+            'amount': self.amount,
+            'customer': self.customer,
+        }
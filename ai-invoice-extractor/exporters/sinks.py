@@ -0,0 +1,425 @@
+import bz2
+import gzip
+import hashlib
+import io
+import lzma
+import math
+import os
+import secrets
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from typing import IO, Iterator, List, Optional, Tuple, Union
+
+# Compression methods picked from the sink's file suffix.
+COMPRESSION_SUFFIXES = {
+    '.gz': 'gzip',
+    '.bz2': 'bz2',
+    '.xz': 'xz',
+    '.zst': 'zstd',
+}
+
+# Default levels favour throughput over ratio for bulk exports.
+DEFAULT_LEVELS = {
+    'gzip': 6,
+    'bz2': 9,
+    'xz': 6,
+    'zstd': 3,
+}
+
+
+class CompressedSink:
+    """Explicitly compress ``sink`` (a path or binary file-like object) with ``method``."""
+
+    def __init__(self, sink: 'Sink', method: str = 'gzip', level: Optional[int] = None):
+        if method not in DEFAULT_LEVELS:
+            raise ValueError(f"Unsupported compression: {method}")
+        self.sink = sink
+        self.method = method
+        self.level = level
+
+
+class GroupCommit:
+    """Batches the durability of ``AtomicSink`` writes.
+
+    Completed files stay staged under their temp names until the group
+    commits: once ``max_files`` are pending, once the oldest has waited
+    ``max_seconds`` (a background timer commits an idle group), or when the
+    group is closed or leaves its ``with`` block. A commit fsyncs each
+    staged file, renames every file into place and fsyncs each directory
+    once. After a crash, final paths hold either the previous or the
+    complete new content. ``fsync=False`` keeps the atomic renames but
+    skips the syncs. If a commit fails, the files it had not yet renamed
+    are removed and their targets left untouched; an error in a timed
+    commit is raised by the next ``commit()`` or ``close()``.
+    """
+
+    def __init__(self, max_files: int = 64, max_seconds: float = 1.0, fsync: bool = True):
+        self.max_files = max_files
+        self.max_seconds = max_seconds
+        self.fsync = fsync
+        self.pending: List[Tuple[str, str]] = []
+        self.started = 0.0
+        self.lock = threading.Lock()
+        self.timer: Optional[threading.Timer] = None
+        self.error: Optional[BaseException] = None
+
+    def add(self, temp: str, path: str) -> None:
+        with self.lock:
+            if not self.pending:
+                self.started = time.monotonic()
+                if 0 < self.max_seconds < math.inf:
+                    self.timer = threading.Timer(self.max_seconds, self._expire)
+                    self.timer.daemon = True
+                    self.timer.start()
+            self.pending.append((temp, path))
+            due = len(self.pending) >= self.max_files or time.monotonic() - self.started >= self.max_seconds
+        if due:
+            self.commit()
+
+    def _expire(self) -> None:
+        try:
+            self.commit()
+        except BaseException as error:
+            self.error = error
+
+    def commit(self) -> int:
+        """Make every staged file durable and visible; return how many were committed."""
+        with self.lock:
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+            error, self.error = self.error, None
+            if error is not None:
+                raise error
+            pending, self.pending = self.pending, []
+            if not pending:
+                return 0
+            renamed = 0
+            try:
+                if self.fsync:
+                    _sync_files([temp for temp, _ in pending])
+                for temp, path in pending:
+                    os.replace(temp, path)
+                    renamed += 1
+            except BaseException:
+                # Files not yet in place are discarded, as a failed AtomicSink write would be.
+                for temp, _ in pending[renamed:]:
+                    try:
+                        os.remove(temp)
+                    except OSError:
+                        pass
+                raise
+            if self.fsync:
+                for directory in {os.path.dirname(path) for _, path in pending}:
+                    _fsync_directory(directory)
+        return len(pending)
+
+    def close(self) -> None:
+        self.commit()
+
+    def __enter__(self) -> 'GroupCommit':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class AtomicSink:
+    """Write ``path`` through a temp file in its directory, renamed into place when complete.
+
+    A failed export removes the temp file and leaves ``path`` untouched.
+    Without a ``group`` the file is fsynced and renamed as soon as it is
+    written; with a ``GroupCommit`` the sync and rename are batched.
+
+    With ``skip_unchanged`` a SHA-256 of the serialized (pre-compression)
+    output is computed as it is written and stored with the file. When the
+    target already holds the same content, the temp file is discarded, the
+    target is not touched, and ``unchanged`` is set to True.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike], group: Optional[GroupCommit] = None,
+                 skip_unchanged: bool = False):
+        self.path = os.fspath(path)
+        self.group = group
+        self.skip_unchanged = skip_unchanged
+        self.sha256 = None
+        self.unchanged = False
+
+    def __fspath__(self) -> str:
+        return self.path
+
+    @contextmanager
+    def staged(self) -> Iterator[str]:
+        directory, name = os.path.split(os.path.abspath(self.path))
+        temp = os.path.join(directory, f".{name}.{secrets.token_hex(4)}.tmp")
+        # Created like a plain open() would, so the renamed file keeps umask permissions.
+        os.close(os.open(temp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666))
+        self.sha256 = hashlib.sha256() if self.skip_unchanged else None
+        self.unchanged = False
+        try:
+            yield temp
+        except BaseException:
+            os.remove(temp)
+            raise
+        if self.sha256 is not None:
+            digest = self.sha256.hexdigest()
+            if stored_hash(self.path) == digest:
+                os.remove(temp)
+                self.unchanged = True
+                return
+            store_hash(temp, self.path, digest)
+        if self.group is not None:
+            self.group.add(temp, self.path)
+        else:
+            _sync_files([temp])
+            os.replace(temp, self.path)
+            _fsync_directory(directory)
+
+
+# Extended attribute holding "<sha256> <size> <mtime_ns>" of an exported file.
+HASH_XATTR = 'user.well.sha256'
+
+
+def _sidecar(path: str) -> str:
+    directory, name = os.path.split(path)
+    return os.path.join(directory, f".{name}.sha256")
+
+
+def stored_hash(path: str) -> Optional[str]:
+    """The content hash recorded for ``path``, if it still describes the file on disk."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    value = None
+    if hasattr(os, 'getxattr'):
+        try:
+            value = os.getxattr(path, HASH_XATTR).decode('ascii')
+        except OSError:
+            pass
+    if value is None:
+        try:
+            with open(_sidecar(path), encoding='ascii') as f:
+                value = f.read()
+        except OSError:
+            return None
+    # The size and mtime guard against the file having been edited in place.
+    digest, _, signature = value.strip().partition(' ')
+    return digest if signature == f"{stat.st_size} {stat.st_mtime_ns}" else None
+
+
+def store_hash(temp: str, path: str, digest: str) -> None:
+    """Record ``digest`` for ``temp``, about to be renamed to ``path``: as an xattr, else in a sidecar."""
+    stat = os.stat(temp)
+    value = f"{digest} {stat.st_size} {stat.st_mtime_ns}"
+    if hasattr(os, 'setxattr'):
+        try:
+            os.setxattr(temp, HASH_XATTR, value.encode('ascii'))
+            return
+        except OSError:
+            pass
+    with open(_sidecar(path), 'w', encoding='ascii') as f:
+        f.write(value)
+
+
+class _HashingFile(io.RawIOBase):
+    """Pass-through binary file feeding everything written into ``sha256``."""
+
+    def __init__(self, raw, sha256):
+        super().__init__()
+        self.raw = raw
+        self.sha256 = sha256
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.sha256.update(data)
+        self.raw.write(data)
+        return len(data)
+
+    def flush(self) -> None:
+        if not self.raw.closed:
+            self.raw.flush()
+
+    def tell(self) -> int:
+        return self.raw.tell()
+
+
+def _sync_files(paths: List[str]) -> None:
+    for path in paths:
+        with open(path, 'ab') as f:
+            os.fsync(f.fileno())
+
+
+def _fsync_directory(directory: str) -> None:
+    if os.name == 'nt':
+        return
+    fd = os.open(directory or '.', os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+# An export destination: a filesystem path or an already open file-like object.
+Sink = Union[str, os.PathLike, IO, CompressedSink, AtomicSink]
+
+# An import source: a filesystem path or an already open readable file-like object.
+Source = Union[str, os.PathLike, IO]
+
+
+def is_file_like(sink: Sink) -> bool:
+    return hasattr(sink, 'write')
+
+
+def compression_for(sink: Sink) -> Tuple[Optional[str], Optional[int]]:
+    """Return the ``(method, level)`` a sink asks for, ``(None, None)`` for plain output."""
+    if isinstance(sink, CompressedSink):
+        return sink.method, sink.level
+    if is_file_like(sink):
+        return None, None
+    return COMPRESSION_SUFFIXES.get(os.path.splitext(os.fspath(sink))[1].lower()), None
+
+
+def open_compressor(raw: IO[bytes], method: str, level: Optional[int] = None) -> IO[bytes]:
+    """Wrap a binary stream in a streaming compressor; closing it does not close ``raw``."""
+    if level is None:
+        level = DEFAULT_LEVELS[method]
+    if method == 'gzip':
+        return gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=level)
+    if method == 'bz2':
+        return bz2.BZ2File(raw, 'wb', compresslevel=level)
+    if method == 'xz':
+        return lzma.LZMAFile(raw, 'wb', preset=level)
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError("zstd compression requires the 'zstandard' package") from None
+    return zstandard.ZstdCompressor(level=level).stream_writer(raw, closefd=False)
+
+
+@contextmanager
+def open_sink(sink: Sink, binary: bool = False, newline: Optional[str] = None, meter=None) -> Iterator[IO]:
+    """Open ``sink`` for writing in text (utf-8) or binary mode.
+
+    Paths are opened and closed here. File-like objects are written to but
+    never closed; a binary object given to a text exporter is wrapped in a
+    ``TextIOWrapper`` that is detached again on exit. Paths ending in a
+    ``COMPRESSION_SUFFIXES`` suffix and ``CompressedSink`` destinations are
+    compressed on the fly as the exporter writes, and ``AtomicSink``
+    destinations are staged and renamed into place once complete. A
+    ``meter`` (``metrics.MeteredFile``) is layered over binary outputs, under
+    any compressor, to count the bytes written and the time spent writing.
+    """
+    method, level = compression_for(sink)
+    if isinstance(sink, CompressedSink):
+        sink = sink.sink
+
+    with ExitStack() as stack:
+        atomic = sink if isinstance(sink, AtomicSink) else None
+        if atomic is not None:
+            sink = stack.enter_context(atomic.staged())
+        if is_file_like(sink):
+            f = sink
+        elif binary or method is not None or meter is not None or atomic is not None:
+            f = stack.enter_context(open(sink, 'wb'))
+        else:
+            f = stack.enter_context(open(sink, 'w', newline=newline, encoding='utf-8'))
+        if meter is not None and not isinstance(f, io.TextIOBase):
+            f = meter.attach(f)
+        if method is not None:
+            f = stack.enter_context(open_compressor(f, method, level))
+        if atomic is not None and atomic.sha256 is not None:
+            f = _HashingFile(f, atomic.sha256)
+
+        if binary or isinstance(f, io.TextIOBase):
+            yield f
+            return
+
+        text = io.TextIOWrapper(f, encoding='utf-8', newline=newline)
+        try:
+            yield text
+        finally:
+            text.flush()
+            text.detach()
+
+
+def open_decompressor(path: Union[str, os.PathLike], method: str) -> IO[bytes]:
+    """Open a compressed file for streaming binary reads."""
+    if method == 'gzip':
+        return gzip.open(path, 'rb')
+    if method == 'bz2':
+        return bz2.open(path, 'rb')
+    if method == 'xz':
+        return lzma.open(path, 'rb')
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError("zstd compression requires the 'zstandard' package") from None
+    return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True))
+
+
+@contextmanager
+def open_source(source: Source, binary: bool = False, newline: Optional[str] = None) -> Iterator[IO]:
+    """Open ``source`` for reading in text (utf-8) or binary mode.
+
+    The counterpart of ``open_sink``: paths are opened and closed here and
+    decompressed by ``COMPRESSION_SUFFIXES`` suffix; file-like objects are
+    read but never closed, and binary ones are wrapped for text readers.
+    """
+    with ExitStack() as stack:
+        if hasattr(source, 'read'):
+            f = source
+        else:
+            method = COMPRESSION_SUFFIXES.get(os.path.splitext(os.fspath(source))[1].lower())
+            if method is not None:
+                f = stack.enter_context(open_decompressor(source, method))
+            elif binary:
+                f = stack.enter_context(open(source, 'rb'))
+            else:
+                f = stack.enter_context(open(source, newline=newline, encoding='utf-8'))
+
+        if binary or isinstance(f, io.TextIOBase):
+            yield f
+            return
+
+        text = io.TextIOWrapper(f, encoding='utf-8', newline=newline)
+        try:
+            yield text
+        finally:
+            text.detach()
+
+
+class ChunkedSink(io.RawIOBase):
+    """Write-only in-memory sink whose contents are drained in chunks.
+
+    ``tell`` keeps counting across drains so writers that record file offsets
+    (such as Parquet) still see a consistent position.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.buffer = bytearray()
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.buffer += data
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    @property
+    def pending(self) -> int:
+        return len(self.buffer)
+
+    def drain(self) -> bytes:
+        chunk = bytes(self.buffer)
+        self.buffer.clear()
+        return chunk
@@ -1,13 +1,241 @@
-import xml.etree.ElementTree as ET
-from .base_exporter import BaseExporter
+import io
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from xml.sax.xmlreader import AttributesImpl
+
 from .exporter_factory import ExporterFactory
+from .records import attach_lines, line_total
+from .sinks import Sink
+from .base_exporter import parse_number
+from .xml_exporter import NO_ATTRIBUTES, XMLExporter, XMLWriter, local_name
+
+UBL_NAMESPACE = "urn:oasis:names:specification:ubl:schema:xsd:Invoice-2"
+CAC_NAMESPACE = "urn:oasis:names:specification:ubl:schema:xsd:CommonAggregateComponents-2"
+CBC_NAMESPACE = "urn:oasis:names:specification:ubl:schema:xsd:CommonBasicComponents-2"
+
+
+class UBLWriter(XMLWriter):
+    """Batch UBL 2.1: invoices inherit the namespaces declared once on the <Invoices> root.
+
+    Elements are written in the order of the UBL Invoice schema. Amounts
+    carry ``currencyID`` from the invoice's ``currency`` field, or
+    ``DEFAULT_CURRENCY``. The supplier party is left empty, as invoices
+    carry no supplier fields.
+    """
+    NAMESPACES = AttributesImpl({"xmlns": UBL_NAMESPACE, "xmlns:cac": CAC_NAMESPACE, "xmlns:cbc": CBC_NAMESPACE})
+    DEFAULT_CURRENCY = "EUR"
+
+    def amount(self, name: str, value, currency: str) -> None:
+        self.xml.startElement(name, AttributesImpl({"currencyID": currency}))
+        self.xml.characters(str(value))
+        self.xml.endElement(name)
+
+    def write_fields(self, data: dict) -> None:
+        xml = self.xml
+        currency = data.get("currency") or self.DEFAULT_CURRENCY
+        self.element("cbc:ID", data.get("invoice_number", "INV-001"))
+        self.element("cbc:IssueDate", data.get("date", "2025-01-01"))
+        due_date = data.get("due_date")
+        if due_date:
+            self.element("cbc:DueDate", due_date)
+        self.element("cbc:DocumentCurrencyCode", currency)
+        xml.startElement("cac:AccountingSupplierParty", NO_ATTRIBUTES)
+        xml.endElement("cac:AccountingSupplierParty")
+        xml.startElement("cac:AccountingCustomerParty", NO_ATTRIBUTES)
+        customer = data.get("customer")
+        if customer:
+            xml.startElement("cac:Party", NO_ATTRIBUTES)
+            xml.startElement("cac:PartyName", NO_ATTRIBUTES)
+            self.element("cbc:Name", customer)
+            xml.endElement("cac:PartyName")
+            xml.endElement("cac:Party")
+        xml.endElement("cac:AccountingCustomerParty")
+        xml.startElement("cac:LegalMonetaryTotal", NO_ATTRIBUTES)
+        self.amount("cbc:PayableAmount", data.get("amount", 0), currency)
+        xml.endElement("cac:LegalMonetaryTotal")
+        for number, item in enumerate(data.get("line_items") or (), 1):
+            self.write_line(number, item, currency)
+
+    def write_line(self, number: int, item: dict, currency: str) -> None:
+        xml = self.xml
+        xml.startElement("cac:InvoiceLine", NO_ATTRIBUTES)
+        self.element("cbc:ID", number)
+        self.element("cbc:InvoicedQuantity", item.get("quantity", 0))
+        self.amount("cbc:LineExtensionAmount", line_total(item), currency)
+        xml.startElement("cac:Item", NO_ATTRIBUTES)
+        self.element("cbc:Name", item.get("description", ""))
+        xml.endElement("cac:Item")
+        xml.startElement("cac:Price", NO_ATTRIBUTES)
+        self.amount("cbc:PriceAmount", item.get("unit_price", 0), currency)
+        xml.endElement("cac:Price")
+        xml.endElement("cac:InvoiceLine")
+
+
+UBL_FIELDS = {"ID": "invoice_number", "IssueDate": "date", "DueDate": "due_date"}
+UBL_LINE_FIELDS = {"Name": "description", "InvoicedQuantity": "quantity", "PriceAmount": "unit_price"}
+
+
+def _descendant_text(element, name: str) -> Optional[str]:
+    for node in element.iter():
+        if local_name(node.tag) == name:
+            return node.text or ""
+    return None
+
+
+def parse_ubl_invoice(element) -> dict:
+    data = {}
+    for child in element:
+        tag = local_name(child.tag)
+        if tag in UBL_FIELDS:
+            data[UBL_FIELDS[tag]] = child.text or ""
+        elif tag == "AccountingCustomerParty":
+            customer = _descendant_text(child, "Name")
+            if customer is not None:
+                data["customer"] = customer
+        elif tag == "LegalMonetaryTotal":
+            data["amount"] = parse_number(_descendant_text(child, "PayableAmount"))
+        elif tag == "InvoiceLine":
+            item = {}
+            for node in child.iter():
+                key = UBL_LINE_FIELDS.get(local_name(node.tag))
+                if key == "description":
+                    item[key] = node.text or ""
+                elif key is not None:
+                    item[key] = parse_number(node.text)
+            data.setdefault("line_items", []).append(item)
+    return data
+
+
+class SchemaValidationError(ValueError):
+    """Raised with ``violations``: invoice number -> schema error messages."""
+
+    def __init__(self, violations: Dict[str, List[str]]):
+        self.violations = violations
+        invoice, messages = next(iter(violations.items()))
+        super().__init__(f"{len(violations)} invoice(s) failed schema validation; {invoice}: {messages[0]}")
+
+
+@lru_cache(maxsize=None)
+def compile_schema(path: str):
+    """Parse and compile an XSD once per process."""
+    try:
+        from lxml import etree
+    except ImportError:
+        raise ImportError("UBL schema validation requires the 'lxml' package") from None
+    return etree.XMLSchema(etree.parse(path))
+
+
+def schema_violations(schema_path: str, records: Iterable[Dict[str, Any]]) -> Dict[str, List[str]]:
+    """Render each invoice as a standalone UBL document in memory and validate it.
+
+    Returns the messages of every invoice that does not conform, keyed by
+    invoice number. Also the process-pool entry point for batch validation.
+    """
+    from lxml import etree
+
+    schema = compile_schema(schema_path)
+    violations = {}
+    for data in records:
+        buffer = io.StringIO()
+        writer = UBLWriter(buffer, batch=False)
+        writer.write(data)
+        writer.close()
+        if not schema.validate(etree.fromstring(buffer.getvalue().encode("utf-8"))):
+            violations[str(data.get("invoice_number"))] = [
+                f"{error.path}: {error.message}" for error in schema.error_log
+            ]
+    return violations
+
 
 @ExporterFactory.register("ubl")
-class UBLExporter(BaseExporter):
-    def _export(self, data: dict, output_path: str):
-        invoice = ET.Element("Invoice", xmlns="urn:oasis:names:specification:ubl:schema:xsd:Invoice-2")
-        ET.SubElement(invoice, "ID").text = data.get("invoice_number", "INV-001")
-        ET.SubElement(invoice, "IssueDate").text = data.get("date", "2025-01-01")
-        ET.SubElement(invoice, "LegalMonetaryTotal").text = str(data.get("amount", 0))
-        tree = ET.ElementTree(invoice)
-        tree.write(output_path, encoding="utf-8", xml_declaration=True)
+class UBLExporter(XMLExporter):
+    """UBL exporter with optional XSD validation of every invoice before it is written.
+
+    With ``schema`` (a path to the UBL 2.1 Invoice XSD, e.g.
+    ``maindoc/UBL-Invoice-2.1.xsd``) each invoice is rendered as a standalone
+    document and validated in memory against the schema, compiled once per
+    process. ``export_many`` validates ``batch_size`` invoices at a time,
+    spread over ``workers`` processes that are started once and kept until
+    ``close()``, and writes a batch only once all of it conforms; otherwise
+    ``SchemaValidationError`` reports the violations per invoice.
+
+    The full UBL schema requires at least one ``cac:InvoiceLine``, so
+    invoices without ``line_items`` do not validate against it.
+    """
+    WRITER = UBLWriter
+    PARSER = staticmethod(parse_ubl_invoice)
+
+    def __init__(self, schema: Optional[str] = None, workers: int = 1, batch_size: int = 256):
+        self.schema = os.path.abspath(os.fspath(schema)) if schema is not None else None
+        self.workers = workers
+        self.batch_size = batch_size
+        self._pool = None
+
+    def __getstate__(self):
+        # The pool stays with the process that started it.
+        return dict(self.__dict__, _pool=None)
+
+    def close(self) -> None:
+        """Shut down the validation worker processes, if any were started."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def validate_documents(self, records: Iterable[Dict[str, Any]]) -> Dict[str, List[str]]:
+        """Return the schema violations of ``records`` per invoice number (empty if all conform)."""
+        violations = {}
+        for _, batch_violations in self._check_batches(records):
+            violations.update(batch_violations)
+        return violations
+
+    def export_many(self, records: Iterable[Dict[str, Any]], sink: Sink,
+                    lines: Optional[Iterable[Dict[str, Any]]] = None) -> int:
+        if self.schema is None:
+            return super().export_many(records, sink, lines)
+        if lines is not None:
+            records = attach_lines(records, lines)
+        return self._write_many(self._conforming(records), sink)
+
+    def _export(self, data: dict, output_path: Sink):
+        if self.schema is not None:
+            violations = schema_violations(self.schema, [data])
+            if violations:
+                raise SchemaValidationError(violations)
+        super()._export(data, output_path)
+
+    def _conforming(self, records: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        for batch, violations in self._check_batches(records, self.validate):
+            if violations:
+                raise SchemaValidationError(violations)
+            yield from batch
+
+    def _check_batches(self, records, validate=None):
+        """Yield ``(batch, violations)`` for consecutive batches of ``records``."""
+        if self.schema is None:
+            raise ValueError("No schema configured for UBL validation")
+        check = partial(schema_violations, self.schema)
+        if self.workers > 1 and self._pool is None:
+            self._pool = ProcessPoolExecutor(self.workers)
+        map_chunks = self._pool.map if self.workers > 1 else map
+        records = iter(records)
+        while True:
+            batch = list(itertools.islice(records, self.batch_size * max(self.workers, 1)))
+            if not batch:
+                return
+            if validate is not None:
+                for data in batch:
+                    validate(data)
+            chunks = [batch[i:i + self.batch_size] for i in range(0, len(batch), self.batch_size)]
+            violations = {}
+            for result in map_chunks(check, chunks):
+                violations.update(result)
+            yield batch, violations
@@ -1,18 +1,53 @@
 import csv
-from .base_exporter import BaseExporter
+from .base_exporter import BaseExporter, RecordWriter, compile_row, parse_number
 from .exporter_factory import ExporterFactory
 
+
+class XeroWriter(RecordWriter):
+    FIELDS = ["InvoiceNumber", "Date", "DueDate", "Amount"]
+    LAYOUT = compile_row((
+        ("invoice_number", "INV-001"),
+        ("date", "2025-01-01"),
+        ("due_date", "2025-01-31"),
+        ("amount", 0),
+    ))
+
+    def __init__(self, f):
+        super().__init__(f)
+        self.get = self.LAYOUT.get
+        self.writerow = csv.writer(f).writerow
+        self.writerow(self.FIELDS)
+
+    def write(self, data: dict):
+        try:
+            row = self.get(data)
+        except KeyError:
+            row = self.LAYOUT.fill(data)
+        self.writerow(row)
+
+
+def read_xero(f):
+    """Parse Xero rows back into invoice fields, matching columns by header name."""
+    rows = csv.reader(f)
+    header = next(rows, None)
+    if header is None:
+        return
+    names = dict(zip(XeroWriter.FIELDS, XeroWriter.LAYOUT.keys))
+    keys = [names.get(column, column) for column in header]
+    for row in rows:
+        data = {key: value for key, value in zip(keys, row) if value != ''}
+        if 'amount' in data:
+            data['amount'] = parse_number(data['amount'])
+        yield data
+
+
 @ExporterFactory.register("xero")
 class XeroExporter(BaseExporter):
-    def _export(self, data: dict, output_path: str):
-        fields = ["InvoiceNumber", "Date", "DueDate", "Amount"]
-        row = [
-            data.get("invoice_number", "INV-001"),
-            data.get("date", "2025-01-01"),
-            data.get("due_date", "2025-01-31"),
-            data.get("amount", 0)
-        ]
-        with open(output_path, 'w', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow(fields)
-            writer.writerow(row)
+    NEWLINE = ''
+    READABLE = True
+
+    def _writer(self, f):
+        return XeroWriter(f)
+
+    def _reader(self, f):
+        return read_xero(f)
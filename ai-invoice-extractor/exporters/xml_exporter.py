@@ -1,12 +1,87 @@
-import xml.etree.ElementTree as ET
-from .base_exporter import BaseExporter
+from xml.etree.ElementTree import iterparse
+from xml.sax.saxutils import XMLGenerator
+from xml.sax.xmlreader import AttributesImpl
+from .base_exporter import BaseExporter, RecordWriter, parse_text_fields
 from .exporter_factory import ExporterFactory
+from .sinks import open_source
+
+NO_ATTRIBUTES = AttributesImpl({})
+
+
+class XMLWriter(RecordWriter):
+    """Incremental SAX writer: elements go straight to the stream, no tree is built.
+
+    In batch mode the invoices are wrapped in a single root element carrying
+    the namespace declarations; otherwise the invoice itself is the root.
+    """
+    ROOT = "Invoices"
+    NAMESPACES = NO_ATTRIBUTES
+
+    def __init__(self, f, batch: bool = True):
+        super().__init__(f)
+        self.batch = batch
+        self.xml = XMLGenerator(f, encoding="utf-8")
+        self.xml.startDocument()
+        if batch:
+            self.xml.startElement(self.ROOT, self.NAMESPACES)
+        self.invoice_attributes = NO_ATTRIBUTES if batch else self.NAMESPACES
+
+    def element(self, name: str, text) -> None:
+        self.xml.startElement(name, NO_ATTRIBUTES)
+        self.xml.characters(str(text))
+        self.xml.endElement(name)
+
+    def write(self, data: dict):
+        self.xml.startElement("Invoice", self.invoice_attributes)
+        self.write_fields(data)
+        self.xml.endElement("Invoice")
+
+    def write_fields(self, data: dict) -> None:
+        for key, value in data.items():
+            self.element(key, value)
+
+    def close(self):
+        if self.batch:
+            self.xml.endElement(self.ROOT)
+        self.xml.endDocument()
+        self.f.write("\n")
+
+
+def local_name(tag: str) -> str:
+    return tag.rpartition("}")[2]
+
+
+def read_invoices(f, parse_invoice):
+    """Yield ``parse_invoice(element)`` for every <Invoice>, clearing parsed elements as it goes."""
+    events = iterparse(f, events=("start", "end"))
+    _, root = next(events)
+    for event, element in events:
+        if event == "end" and local_name(element.tag) == "Invoice":
+            yield parse_invoice(element)
+            root.clear()
+
+
+def parse_invoice(element) -> dict:
+    return parse_text_fields({local_name(child.tag): child.text or "" for child in element})
+
 
 @ExporterFactory.register("xml")
 class XMLExporter(BaseExporter):
+    READABLE = True
+    WRITER = XMLWriter
+    PARSER = staticmethod(parse_invoice)
+
     def _export(self, data: dict, output_path: str):
-        root = ET.Element("Invoice")
-        for key, value in data.items():
-            ET.SubElement(root, key).text = str(value)
-        tree = ET.ElementTree(root)
-        tree.write(output_path, encoding="utf-8", xml_declaration=True)
+        with self._open(output_path) as f:
+            writer = self.WRITER(f, batch=False)
+            writer.write(data)
+            writer.close()
+
+    def _writer(self, f):
+        return self.WRITER(f)
+
+    def _open_source(self, source):
+        return open_source(source, binary=True)
+
+    def _reader(self, f):
+        return read_invoices(f, self.PARSER)
@@ -21,3 +21,164 @@ def test_exporter_output(tmp_path, fmt):
 
     assert output_file.exists(), f"{fmt} exporter did not create output"
     assert output_file.stat().st_size > 0, f"{fmt} output file is empty"
+
+
+def _invoices(n):
+    for i in range(n):
+        yield dict(sample_invoice, invoice_number=f"INV-{i:04d}", amount=float(i))
+
+
+@pytest.mark.parametrize("fmt", export_formats)
+def test_export_many_single_file(tmp_path, fmt):
+    exporter = get_exporter(fmt)
+    output_file = tmp_path / f"invoices.{fmt}"
+
+    count = exporter.export_many(_invoices(50), str(output_file))
+
+    assert count == 50
+    assert output_file.stat().st_size > 0, f"{fmt} output file is empty"
+
+
+def test_export_many_csv_writes_one_header(tmp_path):
+    output_file = tmp_path / "invoices.csv"
+    get_exporter("csv").export_many(_invoices(3), str(output_file))
+
+    lines = output_file.read_text(encoding="utf-8").splitlines()
+    assert lines[0] == ",".join(sample_invoice.keys())
+    assert len(lines) == 4
+
+
+def test_export_many_json_lines(tmp_path):
+    import json
+    output_file = tmp_path / "invoices.jsonl"
+    get_exporter("json").export_many(_invoices(3), str(output_file))
+
+    rows = [json.loads(line) for line in output_file.read_text(encoding="utf-8").splitlines()]
+    assert [row["invoice_number"] for row in rows] == ["INV-0000", "INV-0001", "INV-0002"]
+
+
+def test_export_many_rejects_invalid_record(tmp_path):
+    records = [sample_invoice, {"invoice_number": "INV-9"}]
+    with pytest.raises(ValueError):
+        get_exporter("csv").export_many(records, str(tmp_path / "bad.csv"))
+
+
+@pytest.mark.parametrize("fmt", ["xml", "ubl"])
+def test_export_many_xml_is_one_document(tmp_path, fmt):
+    import xml.etree.ElementTree as ET
+    output_file = tmp_path / f"invoices.{fmt}.xml"
+    get_exporter(fmt).export_many(_invoices(20), str(output_file))
+
+    root = ET.parse(output_file).getroot()
+    assert root.tag.endswith("Invoices")
+    assert len(root) == 20
+
+
+@pytest.mark.parametrize("fmt", export_formats)
+def test_iter_export_matches_file_export(tmp_path, fmt):
+    from exporters import iter_export
+    output_file = tmp_path / f"invoices.{fmt}"
+    get_exporter(fmt).export_many(_invoices(500), str(output_file))
+
+    chunks = list(iter_export(_invoices(500), fmt, chunk_size=4096))
+
+    assert len(chunks) > 1
+    assert max(len(chunk) for chunk in chunks) < 4096 + 16 * 1024
+    assert b"".join(chunks) == output_file.read_bytes()
+
+
+def test_export_many_to_file_like_objects():
+    import io
+    binary, text = io.BytesIO(), io.StringIO()
+
+    get_exporter("xero").export_many(_invoices(2), binary)
+    get_exporter("xero").export_many(_invoices(2), text)
+
+    assert not binary.closed and not text.closed
+    assert binary.getvalue().decode("utf-8") == text.getvalue()
+    assert text.getvalue().startswith("InvoiceNumber,Date,DueDate,Amount\r\n")
+
+
+@pytest.mark.parametrize("suffix, opener", [(".gz", "gzip"), (".bz2", "bz2"), (".xz", "lzma")])
+@pytest.mark.parametrize("fmt", ["csv", "ubl", "quickbooks"])
+def test_export_many_compresses_by_suffix(tmp_path, fmt, suffix, opener):
+    import importlib
+    plain_file = tmp_path / f"invoices.{fmt}"
+    compressed_file = tmp_path / f"invoices.{fmt}{suffix}"
+    get_exporter(fmt).export_many(_invoices(200), str(plain_file))
+    get_exporter(fmt).export_many(_invoices(200), str(compressed_file))
+
+    with importlib.import_module(opener).open(compressed_file, "rb") as f:
+        assert f.read() == plain_file.read_bytes()
+    assert compressed_file.stat().st_size < plain_file.stat().st_size
+
+
+def test_compressed_sink_option_and_iter_export(tmp_path):
+    import gzip
+    from exporters import CompressedSink
+    output_file = tmp_path / "invoices.out"
+    get_exporter("xml").export_many(_invoices(50), CompressedSink(str(output_file), "gzip", level=1))
+
+    streamed = b"".join(get_exporter("xml").iter_export(_invoices(50), compression="gzip", level=1))
+
+    assert gzip.decompress(output_file.read_bytes()) == gzip.decompress(streamed)
+    assert gzip.decompress(streamed).startswith(b'<?xml version="1.0" encoding="utf-8"?>')
+
+
+def test_zstd_compression(tmp_path):
+    zstandard = pytest.importorskip("zstandard")
+    output_file = tmp_path / "invoices.csv.zst"
+    get_exporter("csv").export_many(_invoices(50), str(output_file))
+
+    with zstandard.ZstdDecompressor().stream_reader(output_file.open("rb")) as f:
+        assert f.read().decode("utf-8").count("INV-") == 50
+
+
+def test_row_serializers_fill_defaults_for_missing_fields(tmp_path):
+    records = [sample_invoice, {"invoice_number": "INV-2", "date": "2025-07-28", "amount": 5, "customer": "Globex"}]
+    xero_file, iif_file, csv_file = tmp_path / "x.csv", tmp_path / "q.iif", tmp_path / "c.csv"
+
+    get_exporter("xero").export_many(records, str(xero_file))
+    get_exporter("quickbooks").export_many(records, str(iif_file))
+    get_exporter("csv").export_many(records, str(csv_file))
+
+    assert xero_file.read_text(encoding="utf-8").splitlines()[2] == "INV-2,2025-07-28,2025-01-31,5"
+    assert iif_file.read_text(encoding="utf-8").splitlines()[5] == "TRNS\tINVOICE\t2025-07-28\tAccounts Receivable\t5\tGlobex"
+    assert csv_file.read_text(encoding="utf-8").splitlines()[2] == "INV-2,5,2025-07-28,,Globex"
+
+
+def test_csv_rejects_fields_outside_the_header(tmp_path):
+    short = {"invoice_number": "INV-1", "amount": 5, "date": "2025-07-27", "customer": "Globex"}
+    with pytest.raises(ValueError, match="due_date"):
+        get_exporter("csv").export_many([short, sample_invoice], str(tmp_path / "bad.csv"))
+    # A record missing one header field but adding another is still caught.
+    with pytest.raises(ValueError, match="note"):
+        get_exporter("csv").export_many([sample_invoice, dict(short, note="x")], str(tmp_path / "bad.csv"))
+
+
+def test_csv_declared_fields(tmp_path):
+    from exporters import CSVExporter
+    fields = ["invoice_number", "date", "due_date", "amount", "customer"]
+    records = [{"invoice_number": "INV-1", "amount": 5, "date": "2025-07-27", "customer": "Globex"}, sample_invoice]
+    output_file = tmp_path / "c.csv"
+    CSVExporter(fields=fields).export_many(records, str(output_file))
+
+    assert output_file.read_text(encoding="utf-8").splitlines() == [
+        ",".join(fields),
+        "INV-1,2025-07-27,,5,Globex",
+        "INV-1234,2025-07-27,2025-08-15,199.99,Acme Corp",
+    ]
+
+
+def test_cached_row_layout_checks_extra_keys_on_every_stream(tmp_path):
+    from exporters.base_exporter import compile_row
+    layout = compile_row((("invoice_number", ""), ("amount", "")))
+    assert compile_row((("invoice_number", ""), ("amount", ""))) is layout
+    assert layout.row({"invoice_number": "INV-1", "amount": 5, "customer": "Globex"}) == ("INV-1", 5)
+    with pytest.raises(ValueError, match="customer"):
+        layout.row({"invoice_number": "INV-1", "customer": "Globex"}, strict=True)
+
+    # The second stream reuses the first one's cached layout and still rejects the extra field.
+    get_exporter("csv").export_many([sample_invoice], str(tmp_path / "a.csv"))
+    with pytest.raises(ValueError, match="note"):
+        get_exporter("csv").export_many([sample_invoice, dict(sample_invoice, note="x")], str(tmp_path / "b.csv"))
@@ -0,0 +1,127 @@
+import json
+import os
+
+import pytest
+
+from exporters import AtomicSink, GroupCommit, PartitionedExporter, get_exporter
+
+invoice = {"invoice_number": "INV-1", "date": "2025-07-27", "amount": 10, "customer": "Acme Corp"}
+
+
+def _leftovers(directory):
+    return [name for name in os.listdir(directory) if name.endswith(".tmp")]
+
+
+def test_atomic_sink_replaces_file_only_on_success(tmp_path):
+    output_file = tmp_path / "invoices.csv"
+    output_file.write_text("previous", encoding="utf-8")
+    exporter = get_exporter("csv")
+
+    with pytest.raises(ValueError):
+        exporter.export_many([invoice, {"invoice_number": "INV-2"}], AtomicSink(str(output_file)))
+    assert output_file.read_text(encoding="utf-8") == "previous"
+    assert _leftovers(tmp_path) == []
+
+    exporter.export_many([invoice], AtomicSink(output_file))
+    assert "INV-1" in output_file.read_text(encoding="utf-8")
+    assert _leftovers(tmp_path) == []
+
+
+def test_atomic_sink_keeps_compression_suffix(tmp_path):
+    import gzip
+    output_file = tmp_path / "invoices.jsonl.gz"
+    get_exporter("json").export_many([invoice], AtomicSink(str(output_file)))
+    assert json.loads(gzip.decompress(output_file.read_bytes())) == invoice
+
+
+def test_group_commit_batches_renames(tmp_path):
+    exporter = get_exporter("xml")
+    with GroupCommit(max_files=3, max_seconds=3600) as group:
+        for i in range(4):
+            exporter.export(dict(invoice, invoice_number=f"INV-{i}"), AtomicSink(str(tmp_path / f"{i}.xml"), group))
+        assert sorted(name for name in os.listdir(tmp_path) if name.endswith(".xml")) == ["0.xml", "1.xml", "2.xml"]
+        assert len(_leftovers(tmp_path)) == 1
+    assert (tmp_path / "3.xml").exists() and _leftovers(tmp_path) == []
+
+
+def test_group_commit_time_window(tmp_path):
+    group = GroupCommit(max_files=100, max_seconds=0)
+    get_exporter("json").export(invoice, AtomicSink(str(tmp_path / "a.json"), group))
+    assert (tmp_path / "a.json").exists()
+
+
+def test_group_commit_timer_commits_idle_group(tmp_path):
+    with GroupCommit(max_files=100, max_seconds=0.3) as group:
+        get_exporter("json").export(invoice, AtomicSink(str(tmp_path / "a.json"), group))
+        timer = group.timer
+        assert not (tmp_path / "a.json").exists()
+        timer.join(5)
+        assert (tmp_path / "a.json").exists() and _leftovers(tmp_path) == []
+
+
+def test_failed_group_commit_removes_staged_files(tmp_path, monkeypatch):
+    def fail(paths):
+        raise OSError("disk gone")
+
+    monkeypatch.setattr("exporters.sinks._sync_files", fail)
+    group = GroupCommit(max_files=100, max_seconds=0.3)
+    get_exporter("json").export(invoice, AtomicSink(str(tmp_path / "a.json"), group))
+    timer = group.timer
+    get_exporter("json").export(invoice, AtomicSink(str(tmp_path / "b.json"), group))
+    timer.join(5)
+    assert _leftovers(tmp_path) == [] and not (tmp_path / "a.json").exists()
+    with pytest.raises(OSError, match="disk gone"):
+        group.close()
+
+
+def test_partitioned_export_with_group_commit(tmp_path):
+    group = GroupCommit(max_files=2, fsync=False)
+    records = [dict(invoice, invoice_number=f"INV-{i}", date=f"2025-0{1 + i % 3}-01") for i in range(9)]
+    manifest = PartitionedExporter("csv", str(tmp_path), partition_by="month", group=group).export_many(records)
+
+    assert len(manifest) == 3
+    for entry in manifest:
+        assert (tmp_path / entry["path"]).stat().st_size == entry["bytes"]
+    assert json.loads((tmp_path / "manifest.json").read_text(encoding="utf-8"))["shards"] == manifest
+    assert not any(name.endswith(".tmp") for _, _, names in os.walk(tmp_path) for name in names)
+
+
+@pytest.mark.parametrize("name", ["invoices.xml", "invoices.xml.gz"])
+def test_skip_unchanged_leaves_identical_target_alone(tmp_path, name):
+    output_file = tmp_path / name
+    exporter = get_exporter("xml")
+    records = [dict(invoice, invoice_number=f"INV-{i}") for i in range(20)]
+
+    first = AtomicSink(str(output_file), skip_unchanged=True)
+    exporter.export_many(records, first)
+    stat = output_file.stat()
+    assert not first.unchanged
+
+    again = AtomicSink(str(output_file), skip_unchanged=True)
+    exporter.export_many(records, again)
+    assert again.unchanged
+    assert (output_file.stat().st_ino, output_file.stat().st_mtime_ns) == (stat.st_ino, stat.st_mtime_ns)
+    assert _leftovers(tmp_path) == []
+
+    changed = AtomicSink(str(output_file), skip_unchanged=True)
+    exporter.export_many(records[:-1], changed)
+    assert not changed.unchanged and output_file.stat().st_ino != stat.st_ino
+
+
+def test_skip_unchanged_notices_edits_and_uses_sidecar_without_xattrs(tmp_path, monkeypatch):
+    monkeypatch.delattr(os, "setxattr", raising=False)
+    monkeypatch.delattr(os, "getxattr", raising=False)
+    output_file = tmp_path / "invoice.json"
+    exporter = get_exporter("json")
+
+    exporter.export(invoice, AtomicSink(str(output_file), skip_unchanged=True))
+    assert (tmp_path / ".invoice.json.sha256").exists()
+    sink = AtomicSink(str(output_file), skip_unchanged=True)
+    exporter.export(invoice, sink)
+    assert sink.unchanged
+
+    output_file.write_text(output_file.read_text(encoding="utf-8").replace("Acme", "ACME"), encoding="utf-8")
+    sink = AtomicSink(str(output_file), skip_unchanged=True)
+    exporter.export(invoice, sink)
+    assert not sink.unchanged
+    assert "Acme" in output_file.read_text(encoding="utf-8")
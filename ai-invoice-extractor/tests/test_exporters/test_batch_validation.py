@@ -0,0 +1,47 @@
+import json
+import numpy as np
+from exporters.exporter_factory import get_exporter
+from exporters.base_exporter import AMOUNT_NOT_NUMBER, AMOUNT_NEGATIVE, MISSING_FIELD_SHIFT
+
+batch = {
+    "invoice_number": ["INV-1", "INV-2", None, "INV-4", "INV-5"],
+    "date": ["2025-07-27"] * 5,
+    "amount": [10.0, -1.0, 5.0, "12", 0],
+    "customer": ["Acme Corp"] * 5,
+}
+
+
+def test_validate_batch_flags_each_bad_row():
+    error_mask, codes = get_exporter("csv").validate_batch(batch)
+
+    assert error_mask.tolist() == [False, True, True, True, False]
+    assert codes[1] == AMOUNT_NEGATIVE
+    assert codes[2] == 1 << MISSING_FIELD_SHIFT
+    assert codes[3] == AMOUNT_NOT_NUMBER
+
+
+def test_validate_batch_numpy_columns():
+    columns = {
+        "invoice_number": np.array(["INV-1", "INV-2"]),
+        "date": np.array(["2025-07-27", "2025-07-28"]),
+        "amount": np.array([1.5, np.nan]),
+    }
+    error_mask, codes = get_exporter("json").validate_batch(columns)
+
+    customer_missing = 1 << (MISSING_FIELD_SHIFT + 3)
+    amount_missing = 1 << (MISSING_FIELD_SHIFT + 2)
+    assert codes.tolist() == [customer_missing, customer_missing | amount_missing]
+    assert error_mask.all()
+
+
+def test_export_batch_writes_rejects_side_file(tmp_path):
+    output_file = tmp_path / "invoices.csv"
+    rejects_file = tmp_path / "rejects.jsonl"
+
+    exported, rejected = get_exporter("csv").export_batch(batch, str(output_file), str(rejects_file))
+
+    assert (exported, rejected) == (2, 3)
+    assert len(output_file.read_text(encoding="utf-8").splitlines()) == 3
+    rejects = [json.loads(line) for line in rejects_file.read_text(encoding="utf-8").splitlines()]
+    assert rejects[0]["invoice_number"] == "INV-2"
+    assert rejects[1]["errors"] == ["Missing required field: invoice_number"]
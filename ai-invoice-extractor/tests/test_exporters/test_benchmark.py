@@ -0,0 +1,39 @@
+from benchmarks.exporters_benchmark import main, regressions, run, synthetic_invoices
+from exporters.exporter_factory import get_exporter
+
+
+def test_synthetic_invoices_are_valid():
+    exporter = get_exporter("json")
+    invoices = list(synthetic_invoices(50, line_items=3, pool_size=8))
+
+    assert len({invoice["invoice_number"] for invoice in invoices}) == 50
+    for invoice in invoices:
+        exporter.validate(invoice)
+        assert len(invoice["line_items"]) == 3
+
+
+def test_run_reports_every_case(tmp_path):
+    results = run(["csv", "ubl"], [100], [0, 2], repeat=1)
+
+    assert len(results) == 4
+    for result in results:
+        assert result["rows_per_second"] > 0
+        assert result["bytes_written"] > 0
+        assert result["peak_memory"] > 0
+        assert set(result["stages"]) == {"validate", "serialize", "write"}
+
+
+def test_regressions_against_baseline():
+    result = {"format": "csv", "rows": 100, "line_items": 0, "rows_per_second": 50.0, "peak_memory": 300}
+    baseline = {"csv/100/0": {"rows_per_second": 100.0, "peak_memory": 100}}
+
+    assert len(regressions([result], baseline, tolerance=0.25)) == 2
+    assert regressions([result], baseline, tolerance=2.5) == []
+
+
+def test_main_creates_then_checks_baseline(tmp_path):
+    baseline = str(tmp_path / "baseline.json")
+    args = ["--formats", "xero", "--rows", "100", "--line-items", "0", "--repeat", "1", "--baseline", baseline]
+
+    assert main(args + ["--update-baseline"]) == 0
+    assert main(args + ["--tolerance", "100"]) == 0
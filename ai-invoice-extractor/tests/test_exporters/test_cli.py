@@ -0,0 +1,114 @@
+import csv
+import gzip
+import json
+
+import pytest
+
+import exporters.__main__ as cli
+from exporters import get_exporter
+
+
+def _write_input(path, n, bad=()):
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(n):
+            invoice = {"invoice_number": f"INV-{i}", "date": "2025-07-27", "amount": -1 if i in bad else i,
+                       "customer": "Acme Corp"}
+            f.write(json.dumps(invoice) + "\n")
+
+
+def _exported(directory, fmt="json"):
+    numbers = []
+    for part in sorted((directory / fmt).iterdir()):
+        numbers += [data["invoice_number"] for data in get_exporter(fmt).read(str(part))]
+    return numbers
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_exports_parts_and_rejects(tmp_path, workers):
+    source, out = tmp_path / "invoices.jsonl", tmp_path / "out"
+    _write_input(source, 25, bad={3})
+
+    assert cli.main([str(source), "--formats", "json", "ubl", "--output-dir", str(out),
+                     "--workers", str(workers), "--batch-size", "10", "--quiet"]) == 0
+
+    assert _exported(out) == [f"INV-{i}" for i in range(25) if i != 3]
+    assert len(list((out / "ubl").iterdir())) == 3
+    rejects = [json.loads(line) for line in (out / "rejects.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert [(data["invoice_number"], data["error"]) for data in rejects] == [("INV-3", "Amount must be a positive number")]
+    assert json.loads((out / ".checkpoint.json").read_text(encoding="utf-8"))["complete"]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_unparsable_input_is_rejected(tmp_path, workers):
+    source, out = tmp_path / "invoices.jsonl", tmp_path / "out"
+    _write_input(source, 6)
+    lines = source.read_bytes().splitlines(keepends=True)
+    lines[2:2] = [b'{"invoice_number": "INV-X", \n', b"[1, 2]\n"]
+    source.write_bytes(b"".join(lines))
+
+    assert cli.main([str(source), "--output-dir", str(out), "--workers", str(workers),
+                     "--batch-size", "3", "--quiet"]) == 0
+
+    assert _exported(out) == [f"INV-{i}" for i in range(6)]
+    rejects = [json.loads(line) for line in (out / "rejects.jsonl").read_text(encoding="utf-8").splitlines()]
+    rejects.sort(key=lambda data: data["offset"])  # Batches finish in any order with workers
+    assert [(data["offset"], data["input"]) for data in rejects] == [
+        (len(lines[0]) + len(lines[1]), '{"invoice_number": "INV-X", '),
+        (len(b"".join(lines[:3])), "[1, 2]"),
+    ]
+    assert rejects[1]["error"] == "Expected a JSON object"
+
+
+def test_unparsable_csv_rows_are_rejected(tmp_path):
+    source, out = tmp_path / "invoices.csv", tmp_path / "out"
+    rows = [b"invoice_number,date,amount,customer\n", b"INV-0,2025-07-27,10,Acme\n",
+            b"INV-1,2025-07-27,abc,Acme\n", b"INV-2,2025-07-27,12,Acme \xff\n", b"INV-3,2025-07-27,13,Acme\n"]
+    source.write_bytes(b"".join(rows))
+
+    assert cli.main([str(source), "--output-dir", str(out), "--workers", "1", "--quiet"]) == 0
+
+    assert _exported(out) == ["INV-0", "INV-3"]
+    rejects = [json.loads(line) for line in (out / "rejects.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert [(data["offset"], data["input"]["invoice_number"]) for data in rejects] == [
+        (len(b"".join(rows[:2])), "INV-1"), (len(b"".join(rows[:3])), "INV-2")]
+
+
+def test_resumes_after_interruption(tmp_path, monkeypatch):
+    source, out = tmp_path / "invoices.csv", tmp_path / "out"
+    with open(source, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["invoice_number", "date", "amount", "customer"])
+        for i in range(40):
+            writer.writerow([f"INV-{i}", "2025-07-27", i, "Acme, Corp\nHQ"])
+    args = [str(source), "--output-dir", str(out), "--workers", "1", "--batch-size", "7", "--quiet"]
+
+    export_batch, calls = cli.export_batch, []
+
+    def interrupted(formats, paths, batch):
+        calls.append(batch[0]["invoice_number"])
+        if len(calls) == 3:
+            raise KeyboardInterrupt
+        return export_batch(formats, paths, batch)
+
+    monkeypatch.setattr(cli, "export_batch", interrupted)
+    assert cli.main(args) == 130
+    assert _exported(out) == [f"INV-{i}" for i in range(14)]
+
+    calls.clear()
+    monkeypatch.setattr(cli, "export_batch", lambda *a: calls.append(a[2][0]["invoice_number"]) or export_batch(*a))
+    assert cli.main(args) == 0
+    assert calls[0] == "INV-14"
+    assert _exported(out) == [f"INV-{i}" for i in range(40)]
+    assert get_exporter("json").read(str(out / "json" / "part-000000.jsonl")).__next__()["customer"] == "Acme, Corp\nHQ"
+
+    assert cli.main(args) == 0
+
+
+def test_compressed_input_and_progress(tmp_path, capsys):
+    source, out = tmp_path / "invoices.jsonl.gz", tmp_path / "out"
+    _write_input(tmp_path / "plain.jsonl", 5)
+    source.write_bytes(gzip.compress((tmp_path / "plain.jsonl").read_bytes()))
+
+    assert cli.main([str(source), "--output-dir", str(out), "--workers", "1"]) == 0
+    assert _exported(out) == [f"INV-{i}" for i in range(5)]
+    assert "5 invoices" in capsys.readouterr().err
@@ -0,0 +1,52 @@
+import pytest
+from exporters.columnar_exporter import ColumnarExporter, read_columnar
+
+
+def _invoices(n):
+    for i in range(n):
+        yield {
+            "invoice_number": f"INV-{i:04d}",
+            "amount": float(i),
+            "date": "2025-07-27",
+            "due_date": "2025-08-15",
+            "customer": "Acme Corp" if i % 2 else "Globex",
+        }
+
+
+def test_npz_fallback_round_trip(tmp_path):
+    output_file = tmp_path / "invoices.npz"
+    ColumnarExporter("npz", row_group_size=7).export_many(_invoices(20), str(output_file))
+
+    columns = read_columnar(str(output_file), "npz")
+    assert columns["invoice_number"].tolist()[-1] == "INV-0019"
+    assert str(columns["date"].dtype) == "datetime64[D]"
+    assert columns["amount"].sum() == sum(range(20))
+    assert columns["customer"].tolist()[:2] == ["Globex", "Acme Corp"]
+
+
+@pytest.mark.parametrize("file_format", ["parquet", "arrow"])
+def test_arrow_round_trip(tmp_path, file_format):
+    pa = pytest.importorskip("pyarrow")
+    output_file = tmp_path / f"invoices.{file_format}"
+    ColumnarExporter(file_format, row_group_size=7).export_many(_invoices(20), str(output_file))
+
+    table = read_columnar(str(output_file), file_format)
+    assert table.num_rows == 20
+    assert table.schema.field("date").type == pa.date32()
+    assert pa.types.is_dictionary(table.schema.field("customer").type)
+    assert table.column("amount").to_pylist()[-1] == 19.0
+
+
+@pytest.mark.parametrize("file_format", ["parquet", "arrow"])
+def test_customer_dictionary_per_group(tmp_path, file_format):
+    pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+    output_file = tmp_path / f"invoices.{file_format}"
+    invoices = [dict(invoice, customer=f"Customer {i}") for i, invoice in enumerate(_invoices(20))]
+    ColumnarExporter(file_format, row_group_size=5).export_many(invoices, str(output_file))
+
+    table = read_columnar(str(output_file), file_format)
+    assert table.column("customer").to_pylist() == [f"Customer {i}" for i in range(20)]
+    if file_format == "parquet":
+        groups = pq.ParquetFile(str(output_file))
+        assert [len(groups.read_row_group(i).column("customer").chunk(0).dictionary) for i in range(4)] == [5] * 4
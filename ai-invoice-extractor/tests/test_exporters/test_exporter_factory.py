@@ -0,0 +1,52 @@
+import subprocess
+import sys
+from importlib import metadata
+
+import pytest
+from exporters.base_exporter import BaseExporter, RecordWriter
+from exporters.exporter_factory import ExporterFactory, get_exporter
+
+
+def test_importing_package_does_not_load_formats():
+    code = "import sys, exporters; print(any(m.startswith('exporters.') and m.endswith('_exporter') and m != 'exporters.base_exporter' for m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
+
+
+def test_get_exporter_caches_instances():
+    assert get_exporter("csv") is get_exporter("CSV")
+
+
+def test_unknown_format_raises():
+    with pytest.raises(ValueError):
+        get_exporter("does-not-exist")
+
+
+class PluginWriter(RecordWriter):
+    def write(self, data):
+        self.f.write(f"{data['invoice_number']}\n")
+
+
+class PluginExporter(BaseExporter):
+    def _writer(self, f):
+        return PluginWriter(f)
+
+
+def test_exporter_without_writer_cannot_be_instantiated():
+    class Incomplete(BaseExporter):
+        pass
+
+    with pytest.raises(TypeError, match="_writer"):
+        Incomplete()
+
+
+def test_entry_point_formats_are_discovered(monkeypatch):
+    entry_point = metadata.EntryPoint(
+        name="plugin", value=f"{__name__}:PluginExporter", group=ExporterFactory.ENTRY_POINT_GROUP
+    )
+    monkeypatch.setattr("exporters.exporter_factory._entry_points", lambda group: [entry_point])
+    monkeypatch.setattr(ExporterFactory, "_exporters", dict(ExporterFactory._exporters))
+    monkeypatch.setattr(ExporterFactory, "_instances", {})
+
+    assert "plugin" in ExporterFactory.available_formats()
+    assert isinstance(get_exporter("plugin"), PluginExporter)
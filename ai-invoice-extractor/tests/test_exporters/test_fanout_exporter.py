@@ -0,0 +1,61 @@
+import pytest
+from exporters import FanoutExporter
+from exporters.exporter_factory import ExporterFactory
+
+formats = ["json", "ubl", "xero"]
+
+
+def _invoices(n):
+    for i in range(n):
+        yield {
+            "invoice_number": f"INV-{i:04d}",
+            "amount": float(i),
+            "date": "2025-07-27",
+            "customer": "Acme Corp",
+        }
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_fanout_writes_every_format(tmp_path, workers):
+    sinks = {fmt: str(tmp_path / f"invoices.{fmt}") for fmt in formats}
+
+    report = FanoutExporter(formats, workers=workers).export_many(_invoices(25), sinks)
+
+    assert set(report) == set(formats)
+    for fmt in formats:
+        assert report[fmt]["records"] == 25
+        assert (tmp_path / f"invoices.{fmt}").stat().st_size > 0
+
+
+def test_fanout_defaults_to_all_available_formats():
+    assert set(FanoutExporter().exporters) == set(ExporterFactory.available_formats())
+
+
+def test_fanout_requires_a_sink_per_format(tmp_path):
+    with pytest.raises(ValueError):
+        FanoutExporter(formats).export_many(_invoices(1), {"json": str(tmp_path / "a.json")})
+
+
+def test_parallel_output_matches_single_pass(tmp_path):
+    single = {fmt: str(tmp_path / f"single.{fmt}") for fmt in formats}
+    parallel = {fmt: str(tmp_path / f"parallel.{fmt}") for fmt in formats}
+    FanoutExporter(formats).export_many(_invoices(103), single)
+    report = FanoutExporter(formats, workers=2, chunk_size=10, queue_size=1).export_many(_invoices(103), parallel)
+
+    assert [report[fmt]["records"] for fmt in formats] == [103, 103, 103]
+    for fmt in formats:
+        assert (tmp_path / f"parallel.{fmt}").read_bytes() == (tmp_path / f"single.{fmt}").read_bytes()
+
+
+def test_parallel_worker_errors_are_raised(tmp_path):
+    sinks = {fmt: str(tmp_path / f"invoices.{fmt}") for fmt in formats}
+    sinks["ubl"] = str(tmp_path / "missing" / "invoices.xml")
+    with pytest.raises(OSError):
+        FanoutExporter(formats, workers=3, chunk_size=5, queue_size=1).export_many(_invoices(200), sinks)
+
+
+def test_parallel_validation_errors_stop_the_workers(tmp_path):
+    sinks = {fmt: str(tmp_path / f"invoices.{fmt}") for fmt in formats}
+    records = list(_invoices(30)) + [{"invoice_number": "BAD"}]
+    with pytest.raises(ValueError):
+        FanoutExporter(formats, workers=2, chunk_size=10).export_many(records, sinks)
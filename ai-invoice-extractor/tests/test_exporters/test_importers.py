@@ -0,0 +1,102 @@
+import io
+import json
+
+import pytest
+
+from exporters import get_exporter, iter_import
+from exporters.json_exporter import read_json
+
+
+def _invoices(n, line_items=True):
+    for i in range(n):
+        invoice = {
+            "invoice_number": f"INV-{i}",
+            "date": "2025-07-27",
+            "due_date": "2025-08-15",
+            "amount": 100 + i * 0.25,
+            "customer": f"Customer {i % 3}",
+        }
+        if line_items and not i % 2:
+            invoice["line_items"] = [{"description": "Widget", "quantity": 2, "unit_price": 5.5}]
+        yield invoice
+
+
+def _only(records, fields):
+    return [{key: value for key, value in data.items() if key in fields} for data in records]
+
+
+@pytest.mark.parametrize("fmt,suffix", [("json", "jsonl"), ("csv", "csv"), ("xml", "xml"), ("csv", "csv.gz")])
+def test_round_trip(tmp_path, fmt, suffix):
+    path = tmp_path / f"invoices.{suffix}"
+    get_exporter(fmt).export_many(_invoices(25), str(path))
+    assert list(get_exporter(fmt).read(str(path))) == list(_invoices(25))
+
+
+def test_ubl_and_iif_round_trip_line_items(tmp_path):
+    for fmt, fields in [("ubl", ("invoice_number", "date", "due_date", "amount", "customer", "line_items")),
+                        ("quickbooks", ("date", "amount", "customer", "line_items"))]:
+        path = tmp_path / f"invoices.{fmt}"
+        get_exporter(fmt).export_many(_invoices(10), str(path))
+        assert list(iter_import(str(path), fmt)) == _only(_invoices(10), fields)
+
+
+def test_xero_round_trip(tmp_path):
+    path = tmp_path / "invoices.csv"
+    get_exporter("xero").export_many(_invoices(10), str(path))
+    assert list(iter_import(str(path), "xero")) == _only(_invoices(10), ("invoice_number", "date", "due_date", "amount"))
+
+
+def test_read_batches(tmp_path):
+    path = tmp_path / "invoices.xml"
+    get_exporter("ubl").export_many(_invoices(10, line_items=False), str(path))
+    assert [len(batch) for batch in iter_import(str(path), "ubl", batch_size=4)] == [4, 4, 2]
+
+
+@pytest.mark.parametrize("text", [
+    '[\n  {"a": 1},\n  {"a": 22}\n]\n',
+    '{"a": 1}\n{"a": 22}\n',
+    '[{"a": 1}, {"a": 22}]',
+])
+def test_read_json_layouts_across_chunk_boundaries(text):
+    for chunk_size in (1, 3, 1024):
+        assert list(read_json(io.StringIO(text), chunk_size)) == [{"a": 1}, {"a": 22}]
+
+
+def test_read_json_array_export_and_single_document(tmp_path):
+    from exporters import JSONExporter
+    array_file, single_file = tmp_path / "a.json", tmp_path / "one.json"
+    JSONExporter(lines=False).export_many(_invoices(5), str(array_file))
+    get_exporter("json").export(next(_invoices(1)), str(single_file))
+
+    assert list(get_exporter("json").read(str(array_file))) == list(_invoices(5))
+    assert list(get_exporter("json").read(str(single_file))) == list(_invoices(1))
+
+
+def test_read_json_rejects_truncated_input():
+    with pytest.raises(json.JSONDecodeError):
+        list(read_json(io.StringIO('{"a": 1}\n{"a": ')))
+
+
+def test_read_json_fails_on_corrupt_line_without_reading_the_rest():
+    class Source(io.StringIO):
+        consumed = 0
+
+        def read(self, size=-1):
+            chunk = super().read(size)
+            self.consumed += len(chunk)
+            return chunk
+
+    lines = [json.dumps(invoice) for invoice in _invoices(2000)]
+    lines[10] = '{"invoice_number": "INV-10", "amount": }'
+    source = Source("\n".join(lines))
+    records = read_json(source, chunk_size=1024, max_value_size=4096)
+
+    assert [next(records)["invoice_number"] for _ in range(10)] == [f"INV-{i}" for i in range(10)]
+    with pytest.raises(json.JSONDecodeError):
+        next(records)
+    assert source.consumed < 8192 < len(source.getvalue())
+
+
+def test_unreadable_format_raises_on_read(tmp_path):
+    with pytest.raises(io.UnsupportedOperation):
+        get_exporter("columnar").read(str(tmp_path / "invoices.parquet"))
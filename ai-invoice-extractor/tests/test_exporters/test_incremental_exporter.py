@@ -0,0 +1,63 @@
+import pytest
+from exporters import IncrementalExporter
+
+
+def _invoices(n, amount=1.0):
+    return [
+        {
+            "invoice_number": f"INV-{i:04d}",
+            "amount": amount * i,
+            "date": "2025-07-27",
+            "customer": "Acme Corp",
+        }
+        for i in range(n)
+    ]
+
+
+def test_only_new_or_changed_invoices_are_written(tmp_path):
+    index = str(tmp_path / "index.sqlite")
+    first, second, third = (tmp_path / f"run{i}.csv" for i in range(3))
+
+    stats = IncrementalExporter("csv", index, batch_size=7).export_many(_invoices(20), str(first), "daily")
+    assert stats == {"written": 20, "skipped": 0}
+
+    records = _invoices(25)
+    records[3]["amount"] = 999.0
+    stats = IncrementalExporter("csv", index, batch_size=7).export_many(records, str(second), "daily")
+    assert stats == {"written": 6, "skipped": 19}
+    assert "INV-0003" in second.read_text(encoding="utf-8")
+
+    stats = IncrementalExporter("csv", index).export_many(records, str(third), "daily")
+    assert stats == {"written": 0, "skipped": 25}
+    assert not third.exists()
+
+
+def test_index_is_scoped_per_format_and_destination(tmp_path):
+    exporter = IncrementalExporter("json", str(tmp_path / "index.sqlite"))
+    exporter.export_many(_invoices(5), str(tmp_path / "a.jsonl"), "a")
+
+    assert exporter.export_many(_invoices(5), str(tmp_path / "b.jsonl"), "b")["written"] == 5
+    assert IncrementalExporter("xero", str(tmp_path / "index.sqlite")).export_many(
+        _invoices(5), str(tmp_path / "a.csv"), "a")["written"] == 5
+
+
+def test_destination_is_required(tmp_path):
+    exporter = IncrementalExporter("csv", str(tmp_path / "index.sqlite"))
+    output_file = tmp_path / "out.csv"
+    exporter.export_many(_invoices(2), str(output_file), "daily")
+    before = output_file.read_text(encoding="utf-8")
+
+    for destination in (None, ""):
+        with pytest.raises(ValueError):
+            exporter.export_many(_invoices(3), str(output_file), destination)
+    assert output_file.read_text(encoding="utf-8") == before
+    assert exporter.index.count("csv:daily") == 2
+
+
+def test_failed_export_does_not_update_index(tmp_path):
+    exporter = IncrementalExporter("csv", str(tmp_path / "index.sqlite"))
+    records = _invoices(3) + [{"invoice_number": "BAD"}]
+
+    with pytest.raises(ValueError):
+        exporter.export_many(records, str(tmp_path / "out.csv"), "daily")
+    assert exporter.index.count("csv:daily") == 0
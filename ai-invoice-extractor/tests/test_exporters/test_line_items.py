@@ -0,0 +1,90 @@
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from exporters import InvoiceBatch, get_exporter
+from exporters.records import attach_lines
+from exporters.ubl_exporter import CAC_NAMESPACE, CBC_NAMESPACE, UBL_NAMESPACE
+
+headers = [
+    {"invoice_number": "INV-1", "date": "2025-07-27", "amount": 25.5, "customer": "Acme Corp"},
+    {"invoice_number": "INV-2", "date": "2025-07-28", "amount": 5, "customer": "Globex"},
+    {"invoice_number": "INV-3", "date": "2025-07-29", "amount": 30, "customer": "Initech"},
+]
+lines = [
+    {"invoice_number": "INV-1", "description": "Widget", "quantity": 3, "unit_price": 7.5},
+    {"invoice_number": "INV-1", "description": "Shipping", "quantity": 1, "unit_price": 3},
+    {"invoice_number": "INV-3", "description": "Support", "quantity": 2, "unit_price": 15},
+]
+
+
+def test_attach_lines_groups_rows_by_invoice():
+    joined = list(attach_lines(headers, lines))
+
+    assert [len(data.get("line_items", [])) for data in joined] == [2, 0, 1]
+    assert joined[0]["line_items"][1] == {"description": "Shipping", "quantity": 1, "unit_price": 3}
+    assert joined[1] is headers[1]
+
+
+def test_attach_lines_rejects_out_of_order_rows():
+    with pytest.raises(ValueError, match="INV-1"):
+        list(attach_lines(headers, lines[2:] + lines[:2]))
+
+
+def test_ubl_writes_invoice_lines(tmp_path):
+    output_file = tmp_path / "invoices.xml"
+    assert get_exporter("ubl").export_many(headers, str(output_file), lines=lines) == 3
+
+    ns = {"ubl": UBL_NAMESPACE, "cac": CAC_NAMESPACE, "cbc": CBC_NAMESPACE}
+    invoices = ET.parse(output_file).getroot().findall("ubl:Invoice", ns)
+    first = invoices[0].findall("cac:InvoiceLine", ns)
+    assert [line.findtext("cbc:ID", namespaces=ns) for line in first] == ["1", "2"]
+    assert first[0].findtext("cbc:LineExtensionAmount", namespaces=ns) == "22.5"
+    assert first[0].find("cbc:LineExtensionAmount", ns).get("currencyID") == "EUR"
+    assert first[0].findtext("cac:Item/cbc:Name", namespaces=ns) == "Widget"
+    assert first[0].findtext("cac:Price/cbc:PriceAmount", namespaces=ns) == "7.5"
+    assert invoices[1].findall("cac:InvoiceLine", ns) == []
+
+
+def test_iif_writes_spl_rows(tmp_path):
+    output_file = tmp_path / "invoices.iif"
+    get_exporter("quickbooks").export_many(headers, str(output_file), lines=lines)
+
+    rows = output_file.read_text(encoding="utf-8").splitlines()
+    assert rows[1].startswith("!SPL\t") and rows[2] == "!ENDTRNS"
+    assert rows[3:7] == [
+        "TRNS\tINVOICE\t2025-07-27\tAccounts Receivable\t25.5\tAcme Corp",
+        "SPL\tINVOICE\t2025-07-27\tSales\t-22.5\tAcme Corp\tWidget\t-3\t7.5",
+        "SPL\tINVOICE\t2025-07-27\tSales\t-3\tAcme Corp\tShipping\t-1\t3",
+        "ENDTRNS",
+    ]
+    assert rows[7:9] == ["TRNS\tINVOICE\t2025-07-28\tAccounts Receivable\t5\tGlobex", "ENDTRNS"]
+
+
+def test_batch_line_columns_match_joined_table(tmp_path):
+    batch_file, joined_file = tmp_path / "batch.iif", tmp_path / "joined.iif"
+    exporter = get_exporter("quickbooks")
+
+    exporter.export_many(InvoiceBatch.from_records(attach_lines(headers, lines)), str(batch_file))
+    exporter.export_many(headers, str(joined_file), lines=lines)
+
+    def spl_rows(path):
+        rows = [row.split("\t") for row in path.read_text(encoding="utf-8").splitlines() if row.startswith("SPL\t")]
+        return [(row[6], float(row[4]), float(row[7])) for row in rows]
+
+    assert spl_rows(batch_file) == spl_rows(joined_file) == [
+        ("Widget", -22.5, -3), ("Shipping", -3, -1), ("Support", -30, -2)]
+
+
+def test_iif_text_fields_cannot_break_rows(tmp_path):
+    output_file = tmp_path / "invoices.iif"
+    header = dict(headers[0], customer="Acme\tCorp")
+    items = [{"invoice_number": "INV-1", "description": "Widget\nblue\tlarge", "quantity": "3", "unit_price": "7.5"}]
+    get_exporter("quickbooks").export_many([header], str(output_file), lines=items)
+
+    rows = output_file.read_text(encoding="utf-8").splitlines()
+    assert rows[3:] == [
+        "TRNS\tINVOICE\t2025-07-27\tAccounts Receivable\t25.5\tAcme Corp",
+        "SPL\tINVOICE\t2025-07-27\tSales\t-22.5\tAcme Corp\tWidget blue large\t-3\t7.5",
+        "ENDTRNS",
+    ]
@@ -0,0 +1,87 @@
+import gzip
+import io
+import json
+
+import pytest
+
+from exporters import get_exporter
+from exporters.base_exporter import BaseExporter
+from exporters.metrics import ExportMetrics, Histogram, install
+
+
+def _invoices(n):
+    return [{"invoice_number": f"INV-{i}", "date": "2025-07-27", "amount": i, "customer": "Acme Corp"} for i in range(n)]
+
+
+@pytest.fixture
+def metrics():
+    yield install()
+    BaseExporter.metrics = None
+
+
+def test_export_many_records_counts_bytes_and_stages(tmp_path, metrics):
+    output_file = tmp_path / "invoices.csv"
+    get_exporter("csv").export_many(_invoices(100), str(output_file))
+    first_size = output_file.stat().st_size
+    get_exporter("csv").export_many(_invoices(10), str(output_file))
+
+    stats = metrics.snapshot()["csv"]
+    assert (stats["calls"], stats["records"], stats["errors"]) == (2, 110, 0)
+    assert stats["bytes"] == first_size + output_file.stat().st_size
+    for stage in ("validate", "serialize", "write"):
+        assert stats["stages"][stage]["count"] == 2
+        assert stats["stages"][stage]["seconds"] >= 0
+    assert stats["stages"]["serialize"]["seconds"] > 0
+
+
+def test_bytes_are_counted_after_compression(tmp_path, metrics):
+    output_file = tmp_path / "invoices.jsonl.gz"
+    get_exporter("json").export_many(_invoices(500), str(output_file))
+    assert metrics.snapshot()["json"]["bytes"] == output_file.stat().st_size
+    assert len(gzip.decompress(output_file.read_bytes()).splitlines()) == 500
+
+
+def test_single_exports_and_errors(tmp_path, metrics):
+    exporter = get_exporter("ubl")
+    for data in _invoices(5):
+        exporter.export(data, str(tmp_path / "invoice.xml"))
+    with pytest.raises(ValueError):
+        exporter.export({"invoice_number": "INV-X"}, str(tmp_path / "bad.xml"))
+    with pytest.raises(ValueError):
+        exporter.export_many(_invoices(3) + [{"amount": 1}], io.StringIO())
+
+    stats = metrics.snapshot()["ubl"]
+    assert (stats["calls"], stats["records"], stats["errors"]) == (7, 8, 2)
+
+
+def test_listeners_and_disabled_metrics(tmp_path, metrics):
+    calls = []
+    metrics.add_listener(lambda name, records, nbytes, timings: calls.append((name, records, sorted(timings))))
+    get_exporter("quickbooks").export_many(_invoices(3), str(tmp_path / "q.iif"))
+    assert calls == [("quickbooks", 3, ["serialize", "validate", "write"])]
+
+    BaseExporter.metrics = None
+    get_exporter("quickbooks").export_many(_invoices(3), str(tmp_path / "q.iif"))
+    assert len(calls) == 1
+
+
+def test_histogram_percentiles():
+    histogram = Histogram(buckets=(1.0, 2.0, 4.0))
+    for value in [0.5] * 50 + [1.5] * 40 + [3.0] * 10:
+        histogram.observe(value)
+    assert histogram.percentile(0.5) == pytest.approx(1.0)
+    assert 1.0 < histogram.percentile(0.9) <= 2.0
+    assert 2.0 < histogram.percentile(0.99) <= 4.0
+
+
+def test_json_and_prometheus_output():
+    metrics = ExportMetrics(buckets=(0.001, 0.01))
+    metrics.record("ubl", 10, 2048, {"validate": 0.0005, "serialize": 0.005, "write": 0.02})
+
+    assert json.loads(metrics.to_json())["ubl"]["stages"]["write"]["count"] == 1
+    text = metrics.to_prometheus()
+    assert 'well_export_records_total{format="ubl"} 10' in text
+    assert 'well_export_bytes_total{format="ubl"} 2048' in text
+    assert 'well_export_stage_seconds_bucket{format="ubl",stage="serialize",le="0.01"} 1' in text
+    assert 'well_export_stage_seconds_bucket{format="ubl",stage="write",le="0.01"} 0' in text
+    assert 'well_export_stage_seconds_count{format="ubl",stage="write"} 1' in text
@@ -0,0 +1,84 @@
+import gzip
+import hashlib
+import json
+import os
+
+import pytest
+from exporters import GroupCommit, PartitionedExporter
+
+
+def _invoices(n):
+    for i in range(n):
+        yield {
+            "invoice_number": f"INV-{i:04d}",
+            "amount": float(i),
+            "date": f"2025-{i % 3 + 1:02d}-{i % 28 + 1:02d}",
+            "customer": "Acme Corp",
+        }
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_partition_by_month_and_rotate(tmp_path, workers):
+    exporter = PartitionedExporter("csv", str(tmp_path), partition_by="month",
+                                   max_records=40, workers=workers, batch_size=16)
+    manifest = exporter.export_many(_invoices(300))
+
+    assert sum(entry["records"] for entry in manifest) == 300
+    assert {entry["partition"] for entry in manifest} == {"2025-01", "2025-02", "2025-03"}
+    assert all(entry["records"] <= 40 for entry in manifest)
+    for entry in manifest:
+        data = (tmp_path / entry["path"]).read_bytes()
+        assert hashlib.sha256(data).hexdigest() == entry["sha256"]
+        assert len(data.splitlines()) == entry["records"] + 1
+        assert entry["min_date"][:7] == entry["max_date"][:7] == entry["partition"]
+
+    on_disk = json.loads((tmp_path / "manifest.json").read_text(encoding="utf-8"))
+    assert on_disk["shards"] == manifest
+
+
+def test_rotate_by_bytes_with_compression(tmp_path):
+    manifest = PartitionedExporter("xml", str(tmp_path), max_bytes=2000, suffix=".xml.gz",
+                                   batch_size=10).export_many(_invoices(500))
+
+    assert len(manifest) > 1
+    assert sum(entry["records"] for entry in manifest) == 500
+    for entry in manifest:
+        content = gzip.decompress((tmp_path / entry["path"]).read_bytes())
+        assert content.count(b"<Invoice>") == entry["records"]
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_rotate_by_bytes_is_deterministic(tmp_path, workers):
+    exporter = PartitionedExporter("csv", str(tmp_path / str(workers)), partition_by="month",
+                                   max_bytes=1500, workers=workers, batch_size=8)
+    manifest = exporter.export_many(_invoices(300))
+
+    assert len(manifest) > 3
+    assert sum(entry["records"] for entry in manifest) == 300
+    assert [entry["records"] for entry in manifest] == [
+        entry["records"] for entry in PartitionedExporter(
+            "csv", str(tmp_path / "serial"), partition_by="month", max_bytes=1500, batch_size=8
+        ).export_many(_invoices(300))
+    ]
+
+
+@pytest.mark.parametrize("group", [None, GroupCommit(fsync=False)])
+@pytest.mark.parametrize("workers", [1, 4])
+def test_failed_export_removes_open_shards(tmp_path, group, workers):
+    def records():
+        yield from _invoices(100)
+        yield {"invoice_number": "INV-BAD"}
+
+    exporter = PartitionedExporter("csv", str(tmp_path), partition_by="month", max_records=20,
+                                   workers=workers, batch_size=8, group=group)
+    with pytest.raises(ValueError):
+        exporter.export_many(records())
+    if group is not None:
+        group.commit()
+
+    files = sorted(os.path.relpath(os.path.join(root, name), tmp_path)
+                   for root, _, names in os.walk(tmp_path) for name in names)
+    # Only the shards completed before the failure (20 records each) remain.
+    assert files == ["2025-01/part-00000.csv", "2025-02/part-00000.csv", "2025-03/part-00000.csv"]
+    for path in files:
+        assert len((tmp_path / path).read_bytes().splitlines()) == 21
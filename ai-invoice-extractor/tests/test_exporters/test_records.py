@@ -0,0 +1,76 @@
+import json
+import sys
+
+import pytest
+from exporters import InvoiceBatch, InvoiceRecord
+from exporters.exporter_factory import get_exporter
+
+# Keys in InvoiceRecord field order, so dict and record exports match byte for byte.
+invoice = {
+    "invoice_number": "INV-1234",
+    "date": "2025-07-27",
+    "due_date": "2025-08-15",
+    "amount": 199.99,
+    "customer": "Acme Corp",
+}
+
+
+def test_record_reads_like_a_dict():
+    record = InvoiceRecord.from_dict(invoice)
+
+    assert record == invoice
+    assert "due_date" in record and "line_items" not in record
+    assert record["amount"] == 199.99 and record.get("line_items", []) == []
+    for key in ("line_items", "keys", "get", "__class__", 0):
+        with pytest.raises(KeyError):
+            record[key]
+    assert sys.getsizeof(record) < sys.getsizeof(dict(invoice))
+
+
+@pytest.mark.parametrize("fmt", ["json", "csv", "xml", "ubl", "quickbooks", "xero", "columnar"])
+def test_exporters_accept_records_and_batches(tmp_path, fmt):
+    exporter = get_exporter(fmt)
+    dict_file, record_file, batch_file = (tmp_path / f"{name}.{fmt}" for name in ("dict", "record", "batch"))
+
+    exporter.export_many([invoice] * 3, str(dict_file))
+    exporter.export_many([InvoiceRecord.from_dict(invoice)] * 3, str(record_file))
+    exporter.export_many(InvoiceBatch.from_records([invoice] * 3), str(batch_file))
+
+    if fmt != "columnar":  # Parquet metadata embeds writer details; compare text formats byte for byte
+        assert record_file.read_bytes() == dict_file.read_bytes() == batch_file.read_bytes()
+
+
+def test_batch_flattens_line_items():
+    records = [dict(invoice, line_items=[{"description": "A", "quantity": 2, "unit_price": 5.0}] * 2),
+               dict(invoice, invoice_number="INV-2"),
+               dict(invoice, invoice_number="INV-3", line_items=[{"description": "B", "quantity": 1, "unit_price": 1.5}])]
+    batch = InvoiceBatch.from_records(records)
+
+    assert list(batch.line_offsets) == [0, 2, 2, 3]
+    assert [record.get("line_items") for record in batch] == [records[0]["line_items"], None, records[2]["line_items"]]
+    assert json.loads(get_exporter("json").iter_export(batch).__next__().splitlines()[2])["line_items"][0]["description"] == "B"
+
+
+def test_batch_columns_feed_batch_validation():
+    batch = InvoiceBatch.from_records([invoice, dict(invoice, amount=None), dict(invoice, customer=None)])
+
+    error_mask, _ = get_exporter("csv").validate_batch(batch.columns())
+
+    assert error_mask.tolist() == [False, True, True]
+
+
+def test_batch_keeps_original_values(tmp_path):
+    records = [dict(invoice, amount=5, line_items=[{"description": "A", "quantity": 3, "unit_price": 2}]),
+               dict(invoice, invoice_number="INV-2", amount="12")]
+    batch = InvoiceBatch.from_records(records)
+
+    assert [record.to_dict() for record in batch] == records
+    assert type(next(iter(batch))["amount"]) is int
+    error_mask, _ = get_exporter("csv").validate_batch(batch.columns())
+    assert error_mask.tolist() == [False, True]
+
+    dict_file, batch_file = tmp_path / "dict.iif", tmp_path / "batch.iif"
+    get_exporter("quickbooks").export_many(records[:1], str(dict_file))
+    get_exporter("quickbooks").export_many(InvoiceBatch.from_records(records[:1]), str(batch_file))
+    assert batch_file.read_bytes() == dict_file.read_bytes()
+    assert "\t5\t" in dict_file.read_text(encoding="utf-8")
@@ -0,0 +1,189 @@
+import pytest
+
+pytest.importorskip("lxml")
+
+from exporters import SchemaValidationError, UBLExporter
+from exporters.ubl_exporter import compile_schema
+
+# A fragment of the UBL 2.1 schemas: the Invoice document imports the cac and
+# cbc component schemas, with the same element order and amount attributes.
+INVOICE_XSD = """<?xml version="1.0" encoding="utf-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"
+           xmlns="urn:oasis:names:specification:ubl:schema:xsd:Invoice-2"
+           xmlns:cac="urn:oasis:names:specification:ubl:schema:xsd:CommonAggregateComponents-2"
+           xmlns:cbc="urn:oasis:names:specification:ubl:schema:xsd:CommonBasicComponents-2"
+           targetNamespace="urn:oasis:names:specification:ubl:schema:xsd:Invoice-2"
+           elementFormDefault="qualified">
+  <xs:import namespace="urn:oasis:names:specification:ubl:schema:xsd:CommonAggregateComponents-2"
+             schemaLocation="UBL-CommonAggregateComponents-2.1.xsd"/>
+  <xs:import namespace="urn:oasis:names:specification:ubl:schema:xsd:CommonBasicComponents-2"
+             schemaLocation="UBL-CommonBasicComponents-2.1.xsd"/>
+  <xs:element name="Invoice" type="InvoiceType"/>
+  <xs:complexType name="InvoiceType">
+    <xs:sequence>
+      <xs:element ref="cbc:ID"/>
+      <xs:element ref="cbc:IssueDate"/>
+      <xs:element ref="cbc:DueDate" minOccurs="0"/>
+      <xs:element ref="cbc:DocumentCurrencyCode" minOccurs="0"/>
+      <xs:element ref="cac:AccountingSupplierParty"/>
+      <xs:element ref="cac:AccountingCustomerParty"/>
+      <xs:element ref="cac:LegalMonetaryTotal"/>
+      <xs:element ref="cac:InvoiceLine" maxOccurs="unbounded"/>
+    </xs:sequence>
+  </xs:complexType>
+</xs:schema>
+"""
+
+CAC_XSD = """<?xml version="1.0" encoding="utf-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"
+           xmlns="urn:oasis:names:specification:ubl:schema:xsd:CommonAggregateComponents-2"
+           xmlns:cbc="urn:oasis:names:specification:ubl:schema:xsd:CommonBasicComponents-2"
+           targetNamespace="urn:oasis:names:specification:ubl:schema:xsd:CommonAggregateComponents-2"
+           elementFormDefault="qualified">
+  <xs:import namespace="urn:oasis:names:specification:ubl:schema:xsd:CommonBasicComponents-2"
+             schemaLocation="UBL-CommonBasicComponents-2.1.xsd"/>
+  <xs:element name="AccountingSupplierParty" type="SupplierPartyType"/>
+  <xs:element name="AccountingCustomerParty" type="CustomerPartyType"/>
+  <xs:element name="Party" type="PartyType"/>
+  <xs:element name="PartyName" type="PartyNameType"/>
+  <xs:element name="LegalMonetaryTotal" type="MonetaryTotalType"/>
+  <xs:element name="InvoiceLine" type="InvoiceLineType"/>
+  <xs:element name="Item" type="ItemType"/>
+  <xs:element name="Price" type="PriceType"/>
+  <xs:complexType name="SupplierPartyType">
+    <xs:sequence><xs:element ref="Party" minOccurs="0"/></xs:sequence>
+  </xs:complexType>
+  <xs:complexType name="CustomerPartyType">
+    <xs:sequence><xs:element ref="Party" minOccurs="0"/></xs:sequence>
+  </xs:complexType>
+  <xs:complexType name="PartyType">
+    <xs:sequence><xs:element ref="PartyName" minOccurs="0" maxOccurs="unbounded"/></xs:sequence>
+  </xs:complexType>
+  <xs:complexType name="PartyNameType">
+    <xs:sequence><xs:element ref="cbc:Name"/></xs:sequence>
+  </xs:complexType>
+  <xs:complexType name="MonetaryTotalType">
+    <xs:sequence><xs:element ref="cbc:PayableAmount"/></xs:sequence>
+  </xs:complexType>
+  <xs:complexType name="InvoiceLineType">
+    <xs:sequence>
+      <xs:element ref="cbc:ID"/>
+      <xs:element ref="cbc:InvoicedQuantity" minOccurs="0"/>
+      <xs:element ref="cbc:LineExtensionAmount"/>
+      <xs:element ref="Item"/>
+      <xs:element ref="Price" minOccurs="0"/>
+    </xs:sequence>
+  </xs:complexType>
+  <xs:complexType name="ItemType">
+    <xs:sequence><xs:element ref="cbc:Name" minOccurs="0"/></xs:sequence>
+  </xs:complexType>
+  <xs:complexType name="PriceType">
+    <xs:sequence><xs:element ref="cbc:PriceAmount"/></xs:sequence>
+  </xs:complexType>
+</xs:schema>
+"""
+
+CBC_XSD = """<?xml version="1.0" encoding="utf-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"
+           xmlns="urn:oasis:names:specification:ubl:schema:xsd:CommonBasicComponents-2"
+           targetNamespace="urn:oasis:names:specification:ubl:schema:xsd:CommonBasicComponents-2"
+           elementFormDefault="qualified">
+  <xs:element name="ID" type="xs:normalizedString"/>
+  <xs:element name="IssueDate" type="xs:date"/>
+  <xs:element name="DueDate" type="xs:date"/>
+  <xs:element name="DocumentCurrencyCode" type="xs:normalizedString"/>
+  <xs:element name="Name" type="xs:string"/>
+  <xs:element name="InvoicedQuantity" type="QuantityType"/>
+  <xs:element name="LineExtensionAmount" type="AmountType"/>
+  <xs:element name="PriceAmount" type="AmountType"/>
+  <xs:element name="PayableAmount" type="AmountType"/>
+  <xs:complexType name="AmountType">
+    <xs:simpleContent>
+      <xs:extension base="xs:decimal">
+        <xs:attribute name="currencyID" type="xs:normalizedString" use="required"/>
+      </xs:extension>
+    </xs:simpleContent>
+  </xs:complexType>
+  <xs:complexType name="QuantityType">
+    <xs:simpleContent>
+      <xs:extension base="xs:decimal">
+        <xs:attribute name="unitCode" type="xs:normalizedString"/>
+      </xs:extension>
+    </xs:simpleContent>
+  </xs:complexType>
+</xs:schema>
+"""
+
+
+@pytest.fixture
+def schema(tmp_path):
+    for name, text in [("UBL-Invoice-2.1.xsd", INVOICE_XSD),
+                       ("UBL-CommonAggregateComponents-2.1.xsd", CAC_XSD),
+                       ("UBL-CommonBasicComponents-2.1.xsd", CBC_XSD)]:
+        (tmp_path / name).write_text(text, encoding="utf-8")
+    return str(tmp_path / "UBL-Invoice-2.1.xsd")
+
+
+def _invoices(n, bad=()):
+    return [
+        {
+            "invoice_number": f"INV-{i}",
+            "date": "2025-13-01" if i in bad else "2025-07-27",
+            "due_date": "2025-08-15",
+            "amount": 10 + i,
+            "customer": "Acme Corp",
+            "line_items": [{"description": "Widget", "quantity": 2, "unit_price": 5}],
+        }
+        for i in range(n)
+    ]
+
+
+def test_schema_is_compiled_once(schema):
+    compile_schema.cache_clear()
+    exporter = UBLExporter(schema=schema)
+    assert exporter.validate_documents(_invoices(20)) == {}
+    assert exporter.validate_documents(_invoices(5)) == {}
+    assert compile_schema.cache_info().misses == 1
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_violations_are_reported_per_invoice(schema, workers):
+    exporter = UBLExporter(schema=schema, workers=workers, batch_size=4)
+    with exporter:
+        violations = exporter.validate_documents(_invoices(20, bad={3, 17}))
+
+    assert sorted(violations) == ["INV-17", "INV-3"]
+    assert "IssueDate" in violations["INV-3"][0]
+
+
+def test_export_many_writes_only_conforming_batches(tmp_path, schema):
+    exporter = UBLExporter(schema=schema, batch_size=4)
+    output_file = tmp_path / "invoices.xml"
+
+    assert exporter.export_many(_invoices(10), str(output_file)) == 10
+
+    with pytest.raises(SchemaValidationError) as excinfo:
+        exporter.export_many(_invoices(10, bad={5}), str(output_file))
+    assert list(excinfo.value.violations) == ["INV-5"]
+    assert "INV-4" not in output_file.read_text(encoding="utf-8")
+
+
+def test_single_export_is_validated_before_writing(tmp_path, schema):
+    output_file = tmp_path / "invoice.xml"
+    with pytest.raises(SchemaValidationError):
+        UBLExporter(schema=schema).export(_invoices(1, bad={0})[0], str(output_file))
+    assert not output_file.exists()
+
+
+def test_validation_workers_are_reused(schema):
+    with UBLExporter(schema=schema, workers=2, batch_size=4) as exporter:
+        assert exporter.validate_documents(_invoices(10)) == {}
+        pool = exporter._pool
+        assert exporter.validate_documents(_invoices(10, bad={1})) != {}
+        assert exporter._pool is pool
+    assert exporter._pool is None
+
+
+def test_invoices_without_lines_do_not_conform(schema):
+    invoice = dict(_invoices(1)[0], line_items=[])
+    assert list(UBLExporter(schema=schema).validate_documents([invoice])) == ["INV-0"]
@@ -4,10 +4,11 @@ import yaml
 import os
 import base64
 import webbrowser
-from openai import OpenAI
+from openai import OpenAI, AuthenticationError, PermissionDeniedError, RateLimitError
 from pathlib import Path
 from .data_generator import generate_receipt_data
 from .prompt_renderer import generate_image_prompt
+from .dataset_builder import CHECKPOINT_NAME, build_dataset, load_styles
 from .config_loader import load_config, validate_config, resolve_api_key
 from .generators.base import BaseGenerator
 from .generators.openai_generator import OpenAIGenerator
@@ -117,5 +118,73 @@ def generate_image_prompt_cli(
         if open_image:
             webbrowser.open(img_path.resolve().as_uri())
 
+
+@app.command("build-dataset")
+def build_dataset_cli(
+    count: int = typer.Option(..., help="Number of receipts to build"),
+    styles: str = typer.Option("table_noire", help="Comma-separated style names from prompts/styles/"),
+    concurrency: int = typer.Option(4, help="Maximum concurrent image generation calls"),
+    out: Path = typer.Option(Path("exports/dataset"), help="Output directory, also holding the checkpoint"),
+    seed: int = typer.Option(0, help="Dataset seed; the same seed always gives the same receipts")
+):
+    """Build COUNT paired receipt JSON, prompt and image files, resuming any previous run in OUT."""
+    try:
+        style_data = load_styles([name.strip() for name in styles.split(",") if name.strip()])
+    except FileNotFoundError as e:
+        typer.echo(f"❌ {e}")
+        raise typer.Exit(1)
+
+    config = load_config()
+    if not validate_config(config):
+        raise typer.Exit(1)
+
+    image_cfg = config.get("openai_image", {})
+    api_key = image_cfg.get("api_key") or os.getenv("OPENAI_API_KEY")
+
+    if not api_key:
+        typer.echo("❌ No API key found. Set it in `.env` or in `config/models.yaml`")
+        raise typer.Exit(1)
+
+    client = OpenAI(api_key=api_key)
+
+    def render_image(prompt: str) -> bytes:
+        response = client.images.generate(
+            model=image_cfg["model"],
+            prompt=prompt,
+            n=1,
+            size=image_cfg["size"],
+            quality=image_cfg["quality"]
+        )
+        return base64.b64decode(response.data[0].b64_json)
+
+    def report(index, error, state):
+        completed = state["next_index"] + len(state["done"])
+        if error is not None:
+            typer.echo(f"⚠️  Receipt {index} failed, will retry on the next run: {error}")
+        else:
+            typer.echo(f"🖼️  Receipt {index} done ({completed}/{count})")
+
+    typer.echo(f"🚀 Building {count} receipts in {out} with {concurrency} concurrent image calls...")
+    try:
+        state = build_dataset(
+            out, count, style_data, render_image,
+            concurrency=concurrency,
+            seed=seed,
+            fatal_errors=(RateLimitError, AuthenticationError, PermissionDeniedError),
+            on_item=report
+        )
+    except ValueError as e:
+        typer.echo(f"❌ {e}")
+        raise typer.Exit(1)
+    except (RateLimitError, AuthenticationError, PermissionDeniedError) as e:
+        typer.echo(f"❌ OpenAI error: {e}")
+        typer.echo(f"💾 Progress saved to {out / CHECKPOINT_NAME}; run the same command again to resume.")
+        raise typer.Exit(1)
+
+    if state["failed"]:
+        typer.echo(f"⚠️  {len(state['failed'])} receipts failed; run the same command again to retry them.")
+        raise typer.Exit(1)
+    typer.echo(f"✅ Dataset complete: {count} receipts in {out}")
+
 if __name__ == "__main__":
     app()
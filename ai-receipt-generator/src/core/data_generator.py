@@ -1,17 +1,23 @@
-from faker import Faker
-from uuid import uuid4
-from datetime import datetime, timezone
+from uuid import UUID
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+import os
 import random
 import json
 
-faker = Faker("fr_FR")
+from .faker_pool import get_faker_pool
+
+faker = get_faker_pool("fr_FR")
 
 def generate_receipt_data(
     overrides: dict = None,
     tax_rate: float = 0.1,
-    num_items: int = 3
+    num_items: int = 3,
+    rng=None
 ) -> dict:
     overrides = overrides or {}
+    rng = rng or random
 
     forced_items = overrides.get("items")
     forced_merchant = overrides.get("merchant_name")
@@ -43,11 +49,11 @@ def generate_receipt_data(
         items = []
         remaining_total = total_ht
         for i in range(num_items - 1):
-            price = round(random.uniform(0.01, remaining_total - (num_items - i - 1) * 0.01), 2)
+            price = round(rng.uniform(0.01, remaining_total - (num_items - i - 1) * 0.01), 2)
             quantity = 1 # Keep it simple
             line_total = price * quantity
             items.append({
-                "description": faker.word().capitalize(),
+                "description": faker.word(rng).capitalize(),
                 "quantity": quantity,
                 "unit_price": price,
                 "line_total": line_total
@@ -56,7 +62,7 @@ def generate_receipt_data(
         
         # Last item takes the remainder
         items.append({
-            "description": faker.word().capitalize(),
+            "description": faker.word(rng).capitalize(),
             "quantity": 1,
             "unit_price": remaining_total,
             "line_total": remaining_total
@@ -72,11 +78,11 @@ def generate_receipt_data(
         # Ensure at least one item is generated
         actual_num_items = max(1, num_items)
         for _ in range(actual_num_items):
-            quantity = random.randint(1, 2)
-            unit_price = round(random.uniform(1, 10), 2)
+            quantity = rng.randint(1, 2)
+            unit_price = round(rng.uniform(1, 10), 2)
             line_total = round(unit_price * quantity, 2)
             items.append({
-                "description": faker.word().capitalize(),
+                "description": faker.word(rng).capitalize(),
                 "quantity": quantity,
                 "unit_price": unit_price,
                 "line_total": line_total,
@@ -88,8 +94,8 @@ def generate_receipt_data(
 
     return {
         # Transaction Details
-        "transaction_id": str(uuid4())[:12],
-        "authorization_code": str(random.randint(100000, 999999)),
+        "transaction_id": str(UUID(int=rng.getrandbits(128), version=4))[:12],
+        "authorization_code": str(rng.randint(100000, 999999)),
         "transaction_date_time": overrides.get(
             "transaction_date_time",
             datetime.now(timezone.utc).isoformat()
@@ -102,44 +108,286 @@ def generate_receipt_data(
             "tax_amount": f"{tax_amount:.2f}",
             "amount_tendered": f"{ttc:.2f}",
         },
-        "receipt_number": f"RCPT-{random.randint(100000,999999)}",
+        "receipt_number": f"RCPT-{rng.randint(100000,999999)}",
         
         # Merchant Details
         "merchant": {
-            "name": forced_merchant or faker.company(),
-            "merchant_id": f"M{random.randint(100000000,999999999)}",
-            "vat_id": "VAT FR" + str(random.randint(100000000,999999999)),
-            "registration_id": "CRN " + str(random.randint(10000000,99999999)),
+            "name": forced_merchant or faker.company(rng),
+            "merchant_id": f"M{rng.randint(100000000,999999999)}",
+            "vat_id": "VAT FR" + str(rng.randint(100000000,999999999)),
+            "registration_id": "CRN " + str(rng.randint(10000000,99999999)),
             "address": {
-                "line1": faker.street_address(),
-                "city": faker.city(),
-                "state": faker.department(),
-                "postal_code": faker.postcode(),
+                "line1": faker.street_address(rng),
+                "city": faker.city(rng),
+                "state": faker.department(rng),
+                "postal_code": faker.postcode(rng),
                 "country": "FR"
             },
-            "phone": faker.phone_number(),
-            "website": faker.url(),
+            "phone": faker.phone_number(rng),
+            "website": faker.url(rng),
             "logo_url": "https://dummyimage.com/400x100",
             "logo_alt_text": "Logo",
             "custom_footer_lines": ["Thank you for your visit!"]
         },
         "terminal": {
-            "terminal_id": "T" + str(random.randint(100000000,999999999)),
+            "terminal_id": "T" + str(rng.randint(100000000,999999999)),
             "entry_mode": "CHIP"
         },
         "card": {
             "card_number_masked": "************1234",
-            "cardholder_name": faker.name(),
+            "cardholder_name": faker.name(rng),
             "payment_network": "VISA",
             "card_type": "DEBIT"
         },
         "items": items,
         "barcode": {
-            "barcode_data": "TXN:" + str(random.randint(1000000000, 9999999999)),
+            "barcode_data": "TXN:" + str(rng.randint(1000000000, 9999999999)),
             "barcode_type": "QR"
         }
     }
 
+# Seeded receipts get a timestamp within the year following this date.
+DATASET_EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def receipt_rng(seed: int, index: int) -> random.Random:
+    """Independent random generator for receipt ``index`` of dataset ``seed``."""
+    return random.Random(f"{seed}:{index}")
+
+
+def generate_seeded_receipt(
+    seed: int,
+    index: int,
+    overrides: dict = None,
+    tax_rate: float = 0.1,
+    num_items: int = 3
+) -> dict:
+    """Receipt ``index`` of dataset ``seed``; the same arguments always give the same receipt."""
+    rng = receipt_rng(seed, index)
+    overrides = dict(overrides or {})
+    if "transaction_date_time" not in overrides:
+        offset = timedelta(seconds=rng.randrange(365 * 24 * 3600))
+        overrides["transaction_date_time"] = (DATASET_EPOCH + offset).isoformat()
+    return generate_receipt_data(overrides, tax_rate, num_items, rng=rng)
+
+
+def _generate_range(seed: int, start: int, stop: int, options: dict) -> list:
+    return [generate_seeded_receipt(seed, index, **options) for index in range(start, stop)]
+
+
+def generate_dataset(
+    count: int,
+    seed: int,
+    start: int = 0,
+    workers: int = None,
+    chunk_size: int = 1000,
+    **options
+):
+    """Yield receipts ``start`` to ``start + count - 1`` of dataset ``seed``, in order.
+
+    Index ranges of ``chunk_size`` receipts are generated by ``workers``
+    processes (default: one per core). Since each receipt only depends on
+    ``(seed, index)``, the output is the same for any worker count or chunk
+    size. ``options`` are passed to ``generate_seeded_receipt``.
+    """
+    workers = workers or os.cpu_count() or 1
+    ranges = ((low, min(low + chunk_size, start + count)) for low in range(start, start + count, chunk_size))
+    if workers == 1:
+        for low, high in ranges:
+            yield from _generate_range(seed, low, high, options)
+        return
+
+    with ProcessPoolExecutor(workers) as pool:
+        # Keep a bounded number of chunks in flight so memory stays flat.
+        pending = deque()
+        for low, high in ranges:
+            pending.append(pool.submit(_generate_range, seed, low, high, options))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("Batch receipt generation requires numpy (pip install numpy)") from None
+    return numpy
+
+
+def _words(count: int, rng) -> list:
+    return [word.capitalize() for word in faker.sample("word", count, rng)]
+
+
+def generate_receipt_batch(
+    count: int,
+    overrides: dict = None,
+    tax_rate: float = 0.1,
+    num_items: int = 3,
+    columnar: bool = False,
+    rng=None
+):
+    """Generate ``count`` receipts at once, drawing every numeric field with NumPy.
+
+    Supports the same three modes as ``generate_receipt_data`` (forced
+    ``items``, forced ``total_ttc``, random items). Returns a list of receipt
+    dicts, or with ``columnar=True`` a dict of columns where item fields are
+    flattened and receipt ``i`` owns items ``item_offsets[i]:item_offsets[i + 1]``.
+    """
+    np = _numpy()
+    rng = rng if rng is not None else np.random.default_rng()
+    overrides = overrides or {}
+    forced_tax_rate = overrides.get("tax_rate", tax_rate)
+    item_tax = None
+
+    if "items" in overrides:
+        forced_items = overrides["items"]
+        num_items = len(forced_items)
+        quantity = np.tile([item["quantity"] for item in forced_items], (count, 1))
+        unit_price = np.tile(np.array([item["unit_price"] for item in forced_items], dtype=float), (count, 1))
+        line_total = np.round(quantity * unit_price, 2)
+        item_tax = np.round(line_total * forced_tax_rate, 2)
+        descriptions = [item["description"] for item in forced_items] * count
+
+    elif "total_ttc" in overrides:
+        # Each price is drawn from what the previous items left, so loop over
+        # item positions and vectorize across receipts.
+        num_items = max(1, num_items)
+        remaining = np.full(count, overrides["total_ttc"] / (1 + forced_tax_rate))
+        unit_price = np.empty((count, num_items))
+        for i in range(num_items - 1):
+            high = remaining - (num_items - i - 1) * 0.01
+            price = np.round(0.01 + (high - 0.01) * rng.random(count), 2)
+            unit_price[:, i] = price
+            remaining = remaining - price
+        unit_price[:, -1] = remaining
+        quantity = np.ones((count, num_items), dtype=np.int64)
+        line_total = unit_price
+        descriptions = _words(count * num_items, rng)
+
+    else:
+        num_items = max(1, num_items)
+        quantity = rng.integers(1, 3, size=(count, num_items))
+        unit_price = np.round(rng.uniform(1, 10, size=(count, num_items)), 2)
+        line_total = np.round(unit_price * quantity, 2)
+        item_tax = np.round(unit_price * quantity * forced_tax_rate, 2)
+        descriptions = _words(count * num_items, rng)
+
+    ht_total = line_total.sum(axis=1)
+    tax_amount = np.round(ht_total * forced_tax_rate, 2)
+    forced_merchant = overrides.get("merchant_name")
+
+    columns = {
+        "transaction_id": [f"{h[:8]}-{h[8:]}" for h in map("{:011x}".format, rng.integers(0, 16 ** 11, count).tolist())],
+        "authorization_code": rng.integers(100000, 1000000, count),
+        "transaction_date_time": overrides.get("transaction_date_time", datetime.now(timezone.utc).isoformat()),
+        "tax_rate": forced_tax_rate,
+        "amount": ht_total,
+        "tax_amount": tax_amount,
+        "amount_tendered": ht_total + tax_amount,
+        "receipt_number": rng.integers(100000, 1000000, count),
+        "merchant_name": [forced_merchant] * count if forced_merchant else faker.sample("company", count, rng),
+        "merchant_id": rng.integers(100000000, 1000000000, count),
+        "vat_id": rng.integers(100000000, 1000000000, count),
+        "registration_id": rng.integers(10000000, 100000000, count),
+        "address_line1": faker.sample("street_address", count, rng),
+        "city": faker.sample("city", count, rng),
+        "state": faker.sample("department", count, rng),
+        "postal_code": faker.sample("postcode", count, rng),
+        "phone": faker.sample("phone_number", count, rng),
+        "website": faker.sample("url", count, rng),
+        "terminal_id": rng.integers(100000000, 1000000000, count),
+        "cardholder_name": faker.sample("name", count, rng),
+        "barcode_data": rng.integers(1000000000, 10000000000, count),
+        "item_offsets": np.arange(0, count * num_items + 1, num_items),
+        "item_description": descriptions,
+        "item_quantity": quantity.ravel(),
+        "item_unit_price": unit_price.ravel(),
+        "item_line_total": line_total.ravel(),
+        "item_tax": item_tax.ravel() if item_tax is not None else None,
+    }
+    return columns if columnar else receipts_from_columns(columns)
+
+
+def receipts_from_columns(columns: dict) -> list:
+    """Expand a ``generate_receipt_batch(columnar=True)`` batch into receipt dicts."""
+    def values(name):
+        column = columns[name]
+        return column.tolist() if hasattr(column, "tolist") else column
+
+    offsets = values("item_offsets")
+    item_columns = [values("item_description"), values("item_quantity"), values("item_unit_price"),
+                    values("item_line_total")]
+    item_tax = columns["item_tax"]
+    if item_tax is not None:
+        item_columns.append(item_tax.tolist())
+    item_keys = ("description", "quantity", "unit_price", "line_total", "tax")
+    items = [dict(zip(item_keys, item)) for item in zip(*item_columns)]
+
+    tax_rate = f"{columns['tax_rate'] * 100:.0f}%"
+    transaction_date_time = columns["transaction_date_time"]
+    receipts = []
+    for i, row in enumerate(zip(
+        columns["transaction_id"], values("authorization_code"), values("amount"), values("tax_amount"),
+        values("amount_tendered"), values("receipt_number"), columns["merchant_name"], values("merchant_id"),
+        values("vat_id"), values("registration_id"), columns["address_line1"], columns["city"],
+        columns["state"], columns["postal_code"], columns["phone"], columns["website"],
+        values("terminal_id"), columns["cardholder_name"], values("barcode_data"),
+    )):
+        (transaction_id, authorization_code, amount, tax_amount, amount_tendered, receipt_number,
+         merchant_name, merchant_id, vat_id, registration_id, line1, city, state, postal_code, phone,
+         website, terminal_id, cardholder_name, barcode_data) = row
+        receipts.append({
+            "transaction_id": transaction_id,
+            "authorization_code": str(authorization_code),
+            "transaction_date_time": transaction_date_time,
+            "status": "APPROVED",
+            "transaction_amount": {
+                "amount": f"{amount:.2f}",
+                "currency": "EUR",
+                "tax_rate": tax_rate,
+                "tax_amount": f"{tax_amount:.2f}",
+                "amount_tendered": f"{amount_tendered:.2f}",
+            },
+            "receipt_number": f"RCPT-{receipt_number}",
+            "merchant": {
+                "name": merchant_name,
+                "merchant_id": f"M{merchant_id}",
+                "vat_id": f"VAT FR{vat_id}",
+                "registration_id": f"CRN {registration_id}",
+                "address": {
+                    "line1": line1,
+                    "city": city,
+                    "state": state,
+                    "postal_code": postal_code,
+                    "country": "FR"
+                },
+                "phone": phone,
+                "website": website,
+                "logo_url": "https://dummyimage.com/400x100",
+                "logo_alt_text": "Logo",
+                "custom_footer_lines": ["Thank you for your visit!"]
+            },
+            "terminal": {
+                "terminal_id": f"T{terminal_id}",
+                "entry_mode": "CHIP"
+            },
+            "card": {
+                "card_number_masked": "************1234",
+                "cardholder_name": cardholder_name,
+                "payment_network": "VISA",
+                "card_type": "DEBIT"
+            },
+            "items": items[offsets[i]:offsets[i + 1]],
+            "barcode": {
+                "barcode_data": f"TXN:{barcode_data}",
+                "barcode_type": "QR"
+            }
+        })
+    return receipts
+
+
 def save_json(data, path):
     with open(path, "w") as f:
         json.dump(data, f, indent=2)
@@ -0,0 +1,146 @@
+"""
+Build image datasets of paired receipt JSON, image prompt and rendered image.
+
+Item ``i`` is receipt ``i`` of the seeded dataset rendered in style
+``styles[i % len(styles)]``, written as ``receipt_<i>.json``,
+``receipt_<i>.txt`` (prompt) and ``receipt_<i>.png``. Images are rendered
+concurrently by a bounded thread pool, and ``checkpoint.json`` is saved after
+every completed item so an interrupted build resumes where it stopped.
+"""
+import json
+import os
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple, Type
+
+from .data_generator import generate_seeded_receipt
+from .prompt_renderer import generate_image_prompt
+
+# Not "manifest.json", which marks a dataset written by dataset_writer.
+CHECKPOINT_NAME = "checkpoint.json"
+STYLE_DIR = Path("src/core/prompts/styles")
+
+
+def load_styles(names, style_dir: Path = STYLE_DIR) -> Dict[str, dict]:
+    styles = {}
+    for name in names:
+        path = Path(style_dir) / f"{name}.json"
+        if not path.exists():
+            raise FileNotFoundError(f"Style not found: {path}")
+        styles[name] = json.loads(path.read_text(encoding="utf-8"))
+    return styles
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    temp = path.with_name(path.name + ".tmp")
+    temp.write_bytes(data)
+    os.replace(temp, path)
+
+
+def load_checkpoint(out_dir) -> Optional[Dict[str, Any]]:
+    try:
+        return json.loads((Path(out_dir) / CHECKPOINT_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def save_checkpoint(out_dir, state: Dict[str, Any]) -> None:
+    _write_atomic(Path(out_dir) / CHECKPOINT_NAME, json.dumps(state, indent=2).encode("utf-8"))
+
+
+def build_item(out_dir: Path, index: int, seed: int, style: dict, render_image: Callable[[str], bytes],
+               overrides: Optional[dict] = None) -> None:
+    receipt = generate_seeded_receipt(seed, index, overrides=overrides)
+    prompt = generate_image_prompt(receipt, style)
+    image = render_image(prompt)
+    base = out_dir / f"receipt_{index:06d}"
+    _write_atomic(base.with_suffix(".json"), json.dumps(receipt, indent=2, ensure_ascii=False).encode("utf-8"))
+    _write_atomic(base.with_suffix(".txt"), prompt.encode("utf-8"))
+    _write_atomic(base.with_suffix(".png"), image)
+
+
+def build_dataset(
+    out_dir,
+    count: int,
+    styles: Dict[str, dict],
+    render_image: Callable[[str], bytes],
+    concurrency: int = 4,
+    seed: int = 0,
+    overrides: Optional[dict] = None,
+    fatal_errors: Tuple[Type[BaseException], ...] = (),
+    on_item: Optional[Callable[[int, Optional[BaseException], Dict[str, Any]], None]] = None
+) -> Dict[str, Any]:
+    """Build items ``0`` to ``count - 1`` in ``out_dir``, skipping those already completed.
+
+    An item whose image call raises is recorded under ``failed`` and retried
+    on the next run. An exception in ``fatal_errors`` (e.g. a quota error)
+    stops the build instead: queued items are cancelled, running ones are
+    finished and checkpointed, and the exception is re-raised. Returns the
+    checkpoint state.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    names = list(styles)
+    state = load_checkpoint(out_dir)
+    if state is not None and (state.get("seed"), state.get("styles")) != (seed, names):
+        built_with = (f"seed {state['seed']} and styles {','.join(state['styles'])}"
+                      if "seed" in state and "styles" in state else "other settings")
+        raise ValueError(f"{out_dir} holds a dataset built with {built_with}; use another output directory")
+    if state is None:
+        state = {"seed": seed, "styles": names, "next_index": 0, "done": []}
+    state.update(count=count, failed={}, complete=False)
+    # Items below next_index are complete; done holds those completed out of order.
+    done = set(state["done"])
+
+    def finish(index, error):
+        if error is not None:
+            state["failed"][str(index)] = str(error)
+        else:
+            done.add(index)
+            while state["next_index"] in done:
+                done.remove(state["next_index"])
+                state["next_index"] += 1
+        state["done"] = sorted(done)
+        state["complete"] = state["next_index"] >= count
+        save_checkpoint(out_dir, state)
+        if on_item is not None:
+            on_item(index, error, state)
+
+    def collect(pending, return_when):
+        completed, _ = wait(pending, return_when=return_when)
+        fatal = None
+        for future in completed:
+            index = pending.pop(future)
+            error = future.exception()
+            if isinstance(error, fatal_errors):
+                fatal = fatal or error
+            else:
+                finish(index, error)
+        return fatal
+
+    todo = (index for index in range(state["next_index"], count) if index not in done)
+    fatal = None
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        pending = {}
+        try:
+            for index in todo:
+                style = styles[names[index % len(names)]]
+                pending[pool.submit(build_item, out_dir, index, seed, style, render_image, overrides)] = index
+                if len(pending) >= 2 * concurrency:
+                    fatal = collect(pending, FIRST_COMPLETED)
+                    if fatal is not None:
+                        break
+            if fatal is not None:
+                for future in pending:
+                    future.cancel()
+                pending = {future: index for future, index in pending.items() if not future.cancelled()}
+            if pending:
+                fatal = collect(pending, ALL_COMPLETED) or fatal
+        finally:
+            for future in pending:
+                future.cancel()
+
+    save_checkpoint(out_dir, state)
+    if fatal is not None:
+        raise fatal
+    return state
@@ -0,0 +1,155 @@
+"""
+Streaming writers for large synthetic receipt datasets.
+
+Receipts are pulled from ``generate_dataset`` and written as they arrive,
+either to one JSON Lines file (optionally gzip-compressed) or to Parquet
+shards of ``rows_per_shard`` receipts, so memory use does not grow with the
+dataset size. A ``manifest.json`` describing the files, counts and seed is
+written last; its presence marks a complete dataset. Writing into a directory
+first removes its manifest, and a failed write removes the files it wrote.
+"""
+import gzip
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from .data_generator import faker, generate_dataset
+
+FORMATS = ("jsonl", "parquet")
+MANIFEST_NAME = "manifest.json"
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("Parquet datasets require pyarrow (pip install pyarrow)") from None
+    return pyarrow
+
+
+class DatasetWriter:
+    """Write receipts to ``out_dir`` one at a time.
+
+    Files are written under a temporary name and renamed once complete.
+    ``close()`` returns the list of ``{"path", "rows"}`` entries written.
+    Any ``manifest.json`` in ``out_dir`` is removed first, as its files are
+    about to be overwritten; leaving the ``with`` block on an exception
+    removes the files written so far.
+    """
+
+    def __init__(self, out_dir, format: str = "jsonl", compress: bool = False, rows_per_shard: int = 100_000):
+        if format not in FORMATS:
+            raise ValueError(f"Unknown dataset format '{format}', expected one of {', '.join(FORMATS)}")
+        if rows_per_shard < 1:
+            raise ValueError("rows_per_shard must be at least 1")
+        self.out_dir = Path(out_dir)
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        (self.out_dir / MANIFEST_NAME).unlink(missing_ok=True)
+        self.format = format
+        self.compress = compress
+        self.rows_per_shard = rows_per_shard
+        self.files: List[Dict[str, Any]] = []
+        self.count = 0
+        self._rows: List[dict] = []
+        self._file = None
+        if format == "jsonl":
+            self._path = self.out_dir / ("receipts.jsonl.gz" if compress else "receipts.jsonl")
+            self._temp = self._path.with_name(self._path.name + ".tmp")
+            if compress:
+                self._file = gzip.open(self._temp, "wt", compresslevel=6, encoding="utf-8")
+            else:
+                self._file = open(self._temp, "w", encoding="utf-8")
+
+    def write(self, receipt: dict) -> None:
+        if self._file is not None:
+            self._file.write(json.dumps(receipt, ensure_ascii=False))
+            self._file.write("\n")
+        else:
+            self._rows.append(receipt)
+            if len(self._rows) >= self.rows_per_shard:
+                self._flush_shard()
+        self.count += 1
+
+    def write_all(self, receipts: Iterable[dict]) -> None:
+        for receipt in receipts:
+            self.write(receipt)
+
+    def _flush_shard(self) -> None:
+        pa = _pyarrow()
+        path = self.out_dir / f"receipts-{len(self.files):05d}.parquet"
+        temp = path.with_name(path.name + ".tmp")
+        pa.parquet.write_table(pa.Table.from_pylist(self._rows), temp, compression="zstd" if self.compress else "snappy")
+        os.replace(temp, path)
+        self.files.append({"path": path.name, "rows": len(self._rows)})
+        self._rows = []
+
+    def close(self) -> List[Dict[str, Any]]:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            os.replace(self._temp, self._path)
+            self.files.append({"path": self._path.name, "rows": self.count})
+        elif self._rows:
+            self._flush_shard()
+        return self.files
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+            return
+        if self._file is not None:
+            self._file.close()
+            os.remove(self._temp)
+        for entry in self.files:
+            (self.out_dir / entry["path"]).unlink(missing_ok=True)
+        for temp in self.out_dir.glob("receipts-*.parquet.tmp"):
+            temp.unlink()
+
+
+def write_manifest(out_dir, manifest: Dict[str, Any]) -> Path:
+    path = Path(out_dir) / MANIFEST_NAME
+    temp = path.with_name(path.name + ".tmp")
+    temp.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    os.replace(temp, path)
+    return path
+
+
+def write_dataset(
+    out_dir,
+    count: int,
+    seed: int,
+    format: str = "jsonl",
+    compress: bool = False,
+    rows_per_shard: int = 100_000,
+    workers: Optional[int] = None,
+    start: int = 0,
+    **options
+) -> Dict[str, Any]:
+    """Generate receipts ``start`` to ``start + count - 1`` of dataset ``seed`` into ``out_dir``.
+
+    ``options`` (``overrides``, ``tax_rate``, ``num_items``) are passed to the
+    generator. Returns the manifest, which is also written to ``manifest.json``.
+    """
+    with DatasetWriter(out_dir, format, compress, rows_per_shard) as writer:
+        writer.write_all(generate_dataset(count, seed, start=start, workers=workers, **options))
+    manifest = {
+        "format": format,
+        "compression": ("zstd" if format == "parquet" else "gzip") if compress else None,
+        "count": writer.count,
+        "seed": seed,
+        "start": start,
+        "options": options,
+        "faker_locale": faker.locale,
+        "faker_pool_size": faker.size,
+        "rows_per_shard": rows_per_shard if format == "parquet" else None,
+        "files": writer.files,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+    }
+    write_manifest(out_dir, manifest)
+    return manifest
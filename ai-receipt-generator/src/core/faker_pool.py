@@ -0,0 +1,166 @@
+"""
+Pre-sampled Faker values for fast receipt generation.
+
+Calling Faker providers dominates the cost of generating a receipt, so
+``FakerPool`` samples a fixed number of values per field once per locale,
+caches them on disk and then draws from them by index. The pool size trades
+diversity for start-up time; the cache makes later runs start instantly.
+"""
+import json
+import os
+import random
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import faker as faker_module
+from faker import Faker
+
+FIELDS = (
+    "company", "street_address", "city", "department", "postcode",
+    "phone_number", "url", "name", "word",
+)
+# Providers missing from some locales, and what to use instead.
+FALLBACKS = {"department": "state", "postcode": "zipcode"}
+POOL_SIZE_ENV = "RECEIPT_FAKER_POOL_SIZE"
+DEFAULT_POOL_SIZE = 1000
+# Pools are sampled from a fixed seed so every machine builds the same values.
+POOL_SEED = 0
+
+
+def default_pool_size() -> int:
+    """``RECEIPT_FAKER_POOL_SIZE``, or ``DEFAULT_POOL_SIZE`` when it is not set."""
+    value = os.environ.get(POOL_SIZE_ENV)
+    if value is None:
+        return DEFAULT_POOL_SIZE
+    try:
+        size = int(value)
+    except ValueError:
+        size = 0
+    if size < 1:
+        raise ValueError(f"{POOL_SIZE_ENV} must be a positive integer, got {value!r}")
+    return size
+
+
+def default_cache_dir() -> Path:
+    return Path(os.environ.get("RECEIPT_FAKER_CACHE_DIR", Path.home() / ".cache" / "receipt-gen-ai"))
+
+
+class FakerPool:
+    """Drop-in replacement for the ``Faker`` methods used by the data generator.
+
+    ``company()``, ``city()``, ``word()``, ... return a random value from the
+    field's pool, drawn with ``rng`` (a ``random.Random``) when one is given;
+    ``sample(field, count, rng)`` draws many at once, using NumPy index
+    sampling when ``rng`` is a NumPy generator. Pools are built lazily on
+    first use; without ``size``, ``RECEIPT_FAKER_POOL_SIZE`` is read then
+    too, so a bad value does not break importing the generators.
+    """
+
+    def __init__(self, locale: str = "fr_FR", size: Optional[int] = None, cache_dir: Optional[Path] = None):
+        if size is not None and size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self.locale = locale
+        self._size = size
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+        self._pools: Optional[Dict[str, list]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        if self._size is None:
+            self._size = default_pool_size()
+        return self._size
+
+    @property
+    def cache_path(self) -> Path:
+        return self.cache_dir / f"faker-{self.locale}-{self.size}-{faker_module.VERSION}.json"
+
+    @property
+    def pools(self) -> Dict[str, list]:
+        if self._pools is None:
+            with self._lock:
+                if self._pools is None:
+                    self._pools = self._load() or self._build()
+        return self._pools
+
+    def _load(self) -> Optional[Dict[str, list]]:
+        try:
+            pools = json.loads(self.cache_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if sorted(pools) != sorted(FIELDS) or any(len(values) != self.size for values in pools.values()):
+            return None
+        # JSON turns tuples (e.g. ``department()``) into lists.
+        return {field: [tuple(v) if isinstance(v, list) else v for v in values] for field, values in pools.items()}
+
+    def _build(self) -> Dict[str, list]:
+        fake = Faker(self.locale)
+        fake.seed_instance(POOL_SEED)
+        pools = {}
+        for field in FIELDS:
+            provider = getattr(fake, field if hasattr(fake, field) else FALLBACKS[field])
+            pools[field] = [provider() for _ in range(self.size)]
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            temp = self.cache_path.with_suffix(f".{os.getpid()}.tmp")
+            temp.write_text(json.dumps(pools, ensure_ascii=False), encoding="utf-8")
+            os.replace(temp, self.cache_path)
+        except OSError:
+            pass  # The cache is only an optimization.
+        return pools
+
+    def draw(self, field: str, rng=None):
+        values = self.pools[field]
+        return values[(rng or random).randrange(len(values))]
+
+    def sample(self, field: str, count: int, rng=None) -> List:
+        values = self.pools[field]
+        if rng is None:
+            return random.choices(values, k=count)
+        if hasattr(rng, "integers"):
+            return [values[i] for i in rng.integers(0, len(values), count).tolist()]
+        return rng.choices(values, k=count)
+
+    def words(self, nb: int = 3) -> List[str]:
+        return self.sample("word", nb)
+
+    def company(self, rng=None) -> str:
+        return self.draw("company", rng)
+
+    def street_address(self, rng=None) -> str:
+        return self.draw("street_address", rng)
+
+    def city(self, rng=None) -> str:
+        return self.draw("city", rng)
+
+    def department(self, rng=None):
+        return self.draw("department", rng)
+
+    def postcode(self, rng=None) -> str:
+        return self.draw("postcode", rng)
+
+    def phone_number(self, rng=None) -> str:
+        return self.draw("phone_number", rng)
+
+    def url(self, rng=None) -> str:
+        return self.draw("url", rng)
+
+    def name(self, rng=None) -> str:
+        return self.draw("name", rng)
+
+    def word(self, rng=None) -> str:
+        return self.draw("word", rng)
+
+
+_shared: Dict[str, FakerPool] = {}
+_shared_lock = threading.Lock()
+
+
+def get_faker_pool(locale: str = "fr_FR") -> FakerPool:
+    """Return the process-wide pool for ``locale``."""
+    with _shared_lock:
+        pool = _shared.get(locale)
+        if pool is None:
+            pool = _shared[locale] = FakerPool(locale)
+        return pool
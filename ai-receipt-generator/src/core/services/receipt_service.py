@@ -7,9 +7,9 @@ import json
 import yaml
 import base64
 from datetime import datetime
-from faker import Faker
 
 from ..data_generator import generate_receipt_data
+from ..faker_pool import get_faker_pool
 from ..prompt_renderer import generate_image_prompt
 from ..config_loader import load_config, validate_config
 from ..generators.base import BaseGenerator
@@ -17,7 +17,7 @@ from ..generators.openai_generator import OpenAIGenerator
 from ..generators.anthropic_generator import AnthropicGenerator
 from ..errors import StyleNotFoundError, GenerationFailedError, ErrorCode, RecoveryStrategy, ReceiptGeneratorError
 
-faker = Faker("fr_FR")
+faker = get_faker_pool("fr_FR")
 
 class ReceiptService:
     """Service layer for receipt generation, parsing, and validation operations"""
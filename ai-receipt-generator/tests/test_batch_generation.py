@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from core.data_generator import generate_receipt_batch, generate_receipt_data, receipts_from_columns
+
+
+def _keys(data):
+    if isinstance(data, dict):
+        return {key: _keys(value) for key, value in data.items() if key != "items"}
+    return type(data)
+
+
+def test_batch_matches_single_receipt_layout():
+    receipts = generate_receipt_batch(20, rng=np.random.default_rng(1))
+    assert len(receipts) == 20
+    single = generate_receipt_data()
+    for receipt in receipts:
+        assert _keys(receipt) == _keys(single)
+        assert [sorted(item) for item in receipt["items"]] == [sorted(item) for item in single["items"]]
+        assert len(receipt["authorization_code"]) == 6
+        assert len(receipt["transaction_id"]) == 12
+
+
+def test_random_mode_totals():
+    for receipt in generate_receipt_batch(200, tax_rate=0.2, num_items=4, rng=np.random.default_rng(2)):
+        amounts = receipt["transaction_amount"]
+        ht = sum(item["line_total"] for item in receipt["items"])
+        assert len(receipt["items"]) == 4
+        assert all(item["quantity"] in (1, 2) and 1 <= item["unit_price"] <= 10 for item in receipt["items"])
+        assert float(amounts["amount"]) == pytest.approx(ht, abs=0.01)
+        assert float(amounts["tax_amount"]) == pytest.approx(ht * 0.2, abs=0.01)
+        assert amounts["tax_rate"] == "20%"
+
+
+def test_forced_total_ttc_mode():
+    receipts = generate_receipt_batch(100, overrides={"total_ttc": 42.0}, num_items=3)
+    for receipt in receipts:
+        assert receipt["transaction_amount"]["amount_tendered"] == "42.00"
+        assert all(item["unit_price"] > 0 and "tax" not in item for item in receipt["items"])
+
+
+def test_forced_items_mode():
+    items = [{"description": "Coffee", "quantity": 2, "unit_price": 2.5},
+             {"description": "Croissant", "quantity": 1, "unit_price": 1.8}]
+    receipts = generate_receipt_batch(3, overrides={"items": items, "merchant_name": "Chez Paul"})
+    single = generate_receipt_data(overrides={"items": items})
+    for receipt in receipts:
+        assert receipt["merchant"]["name"] == "Chez Paul"
+        assert receipt["items"] == single["items"]
+        assert receipt["transaction_amount"]["amount"] == single["transaction_amount"]["amount"]
+
+
+def test_columnar_batch():
+    columns = generate_receipt_batch(10, num_items=2, columnar=True, rng=np.random.default_rng(3))
+    assert columns["item_offsets"].tolist() == list(range(0, 21, 2))
+    assert columns["item_unit_price"].shape == (20,)
+    assert columns["amount"] == pytest.approx(columns["item_line_total"].reshape(10, 2).sum(axis=1))
+    assert len(receipts_from_columns(columns)) == 10
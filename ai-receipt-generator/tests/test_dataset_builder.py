@@ -0,0 +1,126 @@
+import json
+import threading
+
+import pytest
+
+from core.data_generator import generate_seeded_receipt
+from core.dataset_builder import build_dataset, load_styles
+
+
+class QuotaError(Exception):
+    pass
+
+
+@pytest.fixture
+def styles():
+    return load_styles(["table_noire", "ticket_face_lisible"])
+
+
+def _renderer(fail_after=None, fail_prompts=()):
+    calls = []
+    lock = threading.Lock()
+
+    def render(prompt):
+        with lock:
+            calls.append(prompt)
+            if fail_after is not None and len(calls) > fail_after:
+                raise QuotaError("quota exceeded")
+        if prompt in fail_prompts:
+            raise RuntimeError("content policy")
+        return b"PNG" + str(len(calls)).encode()
+    return render, calls
+
+
+def test_build_writes_paired_files(tmp_path, styles):
+    render, calls = _renderer()
+    state = build_dataset(tmp_path, 5, styles, render, concurrency=3, seed=4)
+    assert state["complete"] and state["next_index"] == 5 and len(calls) == 5
+    receipt = json.loads((tmp_path / "receipt_000003.json").read_text(encoding="utf-8"))
+    assert receipt == json.loads(json.dumps(generate_seeded_receipt(4, 3)))
+    assert (tmp_path / "receipt_000003.txt").read_text(encoding="utf-8") in calls
+    assert (tmp_path / "receipt_000003.png").read_bytes().startswith(b"PNG")
+    assert json.loads((tmp_path / "checkpoint.json").read_text())["complete"]
+
+
+def test_resume_after_quota_error(tmp_path, styles):
+    render, calls = _renderer(fail_after=3)
+    with pytest.raises(QuotaError):
+        build_dataset(tmp_path, 8, styles, render, concurrency=1, fatal_errors=(QuotaError,))
+    state = json.loads((tmp_path / "checkpoint.json").read_text())
+    assert state["next_index"] == 3 and not state["complete"]
+    assert not (tmp_path / "receipt_000003.png").exists()
+
+    render, calls = _renderer()
+    state = build_dataset(tmp_path, 8, styles, render, concurrency=2, fatal_errors=(QuotaError,))
+    assert state["complete"] and len(calls) == 5
+    assert len(list(tmp_path.glob("*.png"))) == 8
+
+
+def test_failed_items_are_retried_on_next_run(tmp_path, styles):
+    first, _ = _renderer()
+    build_dataset(tmp_path, 1, styles, first)
+    bad_prompt = (tmp_path / "receipt_000000.txt").read_text(encoding="utf-8")
+    (tmp_path / "checkpoint.json").unlink()
+
+    render, _ = _renderer(fail_prompts=(bad_prompt,))
+    state = build_dataset(tmp_path, 3, styles, render)
+    assert list(state["failed"]) == ["0"] and state["done"] == [1, 2] and not state["complete"]
+
+    render, calls = _renderer()
+    state = build_dataset(tmp_path, 3, styles, render)
+    assert state["complete"] and state["failed"] == {} and len(calls) == 1
+
+
+def test_resume_rejects_different_seed(tmp_path, styles):
+    render, _ = _renderer()
+    build_dataset(tmp_path, 1, styles, render, seed=1)
+    with pytest.raises(ValueError):
+        build_dataset(tmp_path, 2, styles, render, seed=2)
+
+
+def test_build_next_to_written_dataset(tmp_path, styles):
+    from core.dataset_writer import write_dataset
+    manifest = write_dataset(tmp_path, 3, seed=1, workers=1)
+    render, _ = _renderer()
+    assert build_dataset(tmp_path, 2, styles, render)["complete"]
+    assert json.loads((tmp_path / "manifest.json").read_text()) == manifest
+
+    (tmp_path / "checkpoint.json").write_text(json.dumps({"format": "jsonl"}))
+    with pytest.raises(ValueError, match="other settings"):
+        build_dataset(tmp_path, 2, styles, render)
+
+
+def test_build_dataset_command_resumes_after_quota_error(tmp_path, monkeypatch):
+    import base64
+    import httpx
+    from openai import RateLimitError
+    from typer.testing import CliRunner
+
+    from core import cli
+
+    responses = []
+
+    class FakeImages:
+        def generate(self, **kwargs):
+            responses.append(kwargs["prompt"])
+            if len(responses) == 2:
+                request = httpx.Request("POST", "https://api.openai.com/v1/images/generations")
+                raise RateLimitError("insufficient_quota", response=httpx.Response(429, request=request), body=None)
+            image = type("Image", (), {"b64_json": base64.b64encode(b"PNG").decode()})
+            return type("Response", (), {"data": [image]})
+
+    class FakeOpenAI:
+        def __init__(self, api_key):
+            self.images = FakeImages()
+
+    monkeypatch.setattr(cli, "OpenAI", FakeOpenAI)
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    args = ["build-dataset", "--count", "3", "--concurrency", "1", "--out", str(tmp_path)]
+
+    result = CliRunner().invoke(cli.app, args)
+    assert result.exit_code == 1 and "run the same command again to resume" in result.output
+    assert json.loads((tmp_path / "checkpoint.json").read_text())["next_index"] == 1
+
+    result = CliRunner().invoke(cli.app, args)
+    assert result.exit_code == 0 and "Dataset complete" in result.output
+    assert len(list(tmp_path.glob("*.png"))) == 3 and len(responses) == 4
@@ -0,0 +1,60 @@
+import gzip
+import json
+
+import pytest
+
+from core.data_generator import generate_dataset
+from core.dataset_writer import DatasetWriter, write_dataset
+
+
+def test_jsonl_dataset_and_manifest(tmp_path):
+    manifest = write_dataset(tmp_path, 25, seed=5, compress=True, workers=1, num_items=2)
+    assert manifest["count"] == 25 and manifest["seed"] == 5
+    assert manifest["options"] == {"num_items": 2}
+    assert manifest["files"] == [{"path": "receipts.jsonl.gz", "rows": 25}]
+    assert json.loads((tmp_path / "manifest.json").read_text()) == manifest
+
+    lines = gzip.decompress((tmp_path / "receipts.jsonl.gz").read_bytes()).decode("utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == json.loads(json.dumps(list(generate_dataset(25, 5, workers=1, num_items=2))))
+
+
+def test_parquet_shards(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    manifest = write_dataset(tmp_path, 23, seed=1, format="parquet", rows_per_shard=10, workers=1)
+    assert [entry["rows"] for entry in manifest["files"]] == [10, 10, 3]
+    table = pq.read_table(tmp_path / manifest["files"][2]["path"])
+    expected = list(generate_dataset(3, 1, start=20, workers=1))
+    assert table.column("receipt_number").to_pylist() == [receipt["receipt_number"] for receipt in expected]
+    assert table.column("items").to_pylist()[0] == expected[0]["items"]
+
+
+def test_failed_write_leaves_no_partial_file(tmp_path):
+    with pytest.raises(RuntimeError):
+        with DatasetWriter(tmp_path) as writer:
+            writer.write({"a": 1})
+            raise RuntimeError
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_failed_rerun_leaves_no_stale_manifest(tmp_path):
+    pytest.importorskip("pyarrow")
+    write_dataset(tmp_path, 25, seed=1, format="parquet", rows_per_shard=10, workers=1)
+
+    def failing(receipts):
+        for i, receipt in enumerate(receipts):
+            if i == 15:
+                raise RuntimeError
+            yield receipt
+
+    with pytest.raises(RuntimeError):
+        with DatasetWriter(tmp_path, format="parquet", rows_per_shard=10) as writer:
+            writer.write_all(failing(generate_dataset(25, 2, workers=1)))
+    assert not (tmp_path / "manifest.json").exists()
+    # The shard this run wrote is removed; without a manifest the rest is not a dataset.
+    assert not (tmp_path / "receipts-00000.parquet").exists()
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        DatasetWriter(tmp_path, format="csv")
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from core import data_generator
+from core.faker_pool import FIELDS, FakerPool, get_faker_pool
+from core.services import receipt_service
+
+
+def test_pool_sizes_and_draws(tmp_path):
+    pool = FakerPool("fr_FR", size=20, cache_dir=tmp_path)
+    assert all(len(pool.pools[field]) == 20 for field in FIELDS)
+    assert pool.company() in pool.pools["company"]
+    assert isinstance(pool.department(), tuple)
+    assert set(pool.sample("city", 50, np.random.default_rng(0))) <= set(pool.pools["city"])
+    assert len(pool.words(nb=7)) == 7
+
+
+def test_pool_is_cached_on_disk(tmp_path):
+    built = FakerPool("fr_FR", size=10, cache_dir=tmp_path).pools
+    assert FakerPool("fr_FR", size=10, cache_dir=tmp_path).cache_path.exists()
+
+    loaded = FakerPool("fr_FR", size=10, cache_dir=tmp_path)
+    loaded._build = None  # Must not rebuild
+    assert loaded.pools == built
+
+
+def test_corrupt_cache_is_rebuilt(tmp_path):
+    pool = FakerPool("en_US", size=5, cache_dir=tmp_path)
+    pool.cache_dir.mkdir(exist_ok=True)
+    pool.cache_path.write_text("{not json", encoding="utf-8")
+    assert len(pool.pools["name"]) == 5
+
+
+def test_invalid_size():
+    with pytest.raises(ValueError):
+        FakerPool(size=0)
+
+
+@pytest.mark.parametrize("value", ["", "1k", "0"])
+def test_bad_pool_size_variable_is_reported_on_use(tmp_path, monkeypatch, value):
+    monkeypatch.setenv("RECEIPT_FAKER_POOL_SIZE", value)
+    pool = FakerPool("fr_FR", cache_dir=tmp_path)
+    with pytest.raises(ValueError, match="RECEIPT_FAKER_POOL_SIZE"):
+        pool.company()
+
+
+def test_pool_size_variable(tmp_path, monkeypatch):
+    monkeypatch.setenv("RECEIPT_FAKER_POOL_SIZE", "7")
+    assert len(FakerPool("fr_FR", cache_dir=tmp_path).pools["city"]) == 7
+
+
+def test_generators_share_one_pool():
+    assert data_generator.faker is receipt_service.faker is get_faker_pool("fr_FR")
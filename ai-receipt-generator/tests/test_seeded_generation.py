@@ -0,0 +1,27 @@
+import json
+
+from core.data_generator import generate_dataset, generate_seeded_receipt
+
+
+def _dump(receipts):
+    return "\n".join(json.dumps(receipt, sort_keys=True) for receipt in receipts)
+
+
+def test_seeded_receipt_is_a_function_of_seed_and_index():
+    assert generate_seeded_receipt(7, 3) == generate_seeded_receipt(7, 3)
+    assert generate_seeded_receipt(7, 3) != generate_seeded_receipt(7, 4)
+    assert generate_seeded_receipt(7, 3) != generate_seeded_receipt(8, 3)
+    assert generate_seeded_receipt(7, 3)["transaction_date_time"].startswith("2025-")
+
+
+def test_seeded_receipt_keeps_modes():
+    receipt = generate_seeded_receipt(1, 0, overrides={"total_ttc": 30.0}, num_items=2)
+    assert receipt["transaction_amount"]["amount_tendered"] == "30.00"
+    assert len(receipt["items"]) == 2
+
+
+def test_dataset_is_identical_for_any_worker_count_and_chunking():
+    serial = _dump(generate_dataset(40, seed=11, workers=1))
+    assert _dump(generate_dataset(40, seed=11, workers=3, chunk_size=7)) == serial
+    assert _dump(generate_dataset(15, seed=11, start=25, workers=2, chunk_size=4)) == _dump(
+        json.loads(line) for line in serial.splitlines()[25:])